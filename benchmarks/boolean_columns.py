@@ -0,0 +1,74 @@
+"""
+Benchmark for saving and reading data frames with many boolean columns.
+
+Usage: ``python benchmarks/boolean_columns.py [--rows N] [--columns N]``.
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+import h5py
+import numpy
+from biocframe import BiocFrame
+from biocutils import BooleanList
+import dolomite_base as dl
+from dolomite_base._utils_stats import directory_size
+
+
+def _make_frame(nrows: int, ncols: int, seed: int = 42) -> BiocFrame:
+    rng = numpy.random.default_rng(seed)
+    columns = {}
+    for i in range(ncols):
+        flags = rng.random(nrows) < 0.2
+        contents = flags.tolist()
+        if i % 2 == 1:
+            for j in rng.choice(nrows, nrows // 100, replace=False):
+                contents[j] = None
+        columns["flag" + str(i)] = BooleanList(contents)
+    return BiocFrame(columns, number_of_rows=nrows)
+
+
+def _uncompressed_size(path: str) -> int:
+    total = 0
+    with h5py.File(os.path.join(path, "basic_columns.h5"), "r") as handle:
+        for dset in handle["data_frame/data"].values():
+            total += dset.size * dset.dtype.itemsize
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--columns", type=int, default=20)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    df = _make_frame(args.rows, args.columns)
+    tmp = tempfile.mkdtemp()
+    try:
+        save_times = []
+        read_times = []
+        for r in range(args.repeats):
+            path = os.path.join(tmp, str(r))
+            start = time.perf_counter()
+            dl.save_object(df, path)
+            save_times.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            dl.read_object(path)
+            read_times.append(time.perf_counter() - start)
+
+        print("rows:", args.rows, "columns:", args.columns)
+        print("save (s): %.3f" % min(save_times))
+        print("read (s): %.3f" % min(read_times))
+        print("size on disk (MB): %.2f" % (directory_size(path) / 1e6))
+        print("uncompressed size (MB): %.2f" % (_uncompressed_size(path) / 1e6))
+    finally:
+        shutil.rmtree(tmp)
+
+
+if __name__ == "__main__":
+    main()
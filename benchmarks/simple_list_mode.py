@@ -0,0 +1,81 @@
+"""
+Benchmark for saving and reading simple lists in JSON and HDF5 mode, to find
+the crossover between lists with many small elements and lists with long
+vectors. The choice made by ``simple_list_mode="auto"`` is also reported.
+
+Usage: ``python benchmarks/simple_list_mode.py [--nodes N ...] [--elements N ...] [--type TYPE]``.
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+import numpy
+from biocutils import BooleanList, FloatList, IntegerList, StringList
+import dolomite_base as dl
+from dolomite_base._utils_stats import directory_size
+from dolomite_base.save_simple_list import _choose_mode
+
+
+def _make_list(nnodes: int, nelements: int, vectype: str, seed: int = 42) -> dict:
+    rng = numpy.random.default_rng(seed)
+    contents = {}
+    for i in range(nnodes):
+        contents["scalar" + str(i)] = i
+    if nelements:
+        if vectype == "float":
+            contents["vector"] = FloatList(rng.random(nelements).tolist())
+        elif vectype == "integer":
+            contents["vector"] = IntegerList(rng.integers(0, 1000000, nelements).tolist())
+        elif vectype == "string":
+            contents["vector"] = StringList(["gene" + str(i) for i in range(nelements)])
+        else:
+            contents["vector"] = BooleanList((rng.random(nelements) < 0.5).tolist())
+    return contents
+
+
+def _time_mode(x: dict, mode: str, tmp: str, repeats: int) -> tuple:
+    save_times = []
+    read_times = []
+    for r in range(repeats):
+        path = os.path.join(tmp, mode + str(r))
+        start = time.perf_counter()
+        dl.save_object(x, path, simple_list_mode=mode)
+        save_times.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        dl.read_object(path)
+        read_times.append(time.perf_counter() - start)
+    return min(save_times), min(read_times), directory_size(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--nodes", type=int, nargs="+", default=[1, 10, 100, 1000])
+    parser.add_argument("--elements", type=int, nargs="+", default=[0, 1000, 10000, 100000, 1000000])
+    parser.add_argument("--type", choices=["float", "integer", "string", "boolean"], default="float")
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    print("nodes\telements\tjson save/read (s)\thdf5 save/read (s)\tjson/hdf5 size (kB)\tfastest\tauto")
+    tmp = tempfile.mkdtemp()
+    try:
+        for nnodes in args.nodes:
+            for nelements in args.elements:
+                x = _make_list(nnodes, nelements, args.type)
+                js, jr, jsize = _time_mode(x, "json", tmp, args.repeats)
+                hs, hr, hsize = _time_mode(x, "hdf5", tmp, args.repeats)
+                fastest = "json" if js + jr <= hs + hr else "hdf5"
+                print("%d\t%d\t%.4f/%.4f\t%.4f/%.4f\t%.1f/%.1f\t%s\t%s" % (
+                    nnodes, nelements, js, jr, hs, hr, jsize / 1e3, hsize / 1e3, fastest, _choose_mode(x)
+                ))
+                shutil.rmtree(tmp)
+                os.mkdir(tmp)
+    finally:
+        shutil.rmtree(tmp)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,295 @@
+#include "pybind11/pybind11.h"
+#include "byteme/SelfClosingGzFile.hpp"
+#include "byteme/GzipFileWriter.hpp"
+
+#include <string>
+#include <deque>
+#include <thread>
+#include <mutex>
+#include <condition_variable>
+#include <exception>
+#include <stdexcept>
+#include <memory>
+#include <cmath>
+#include <cstring>
+
+/** Output sink that optionally compresses in a separate thread. **/
+
+class JsonGzipSink {
+public:
+    JsonGzipSink(const std::string& path, int level, bool threaded) : writer(path.c_str(), make_options(level)), threaded(threaded) {
+        buffer.reserve(buffer_size);
+        if (threaded) {
+            worker = std::thread([&]() -> void { compress(); });
+        }
+    }
+
+    ~JsonGzipSink() {
+        // Only relevant if an exception was thrown during serialization.
+        if (worker.joinable()) {
+            {
+                std::lock_guard<std::mutex> lck(mut);
+                done = true;
+            }
+            cv.notify_all();
+            worker.join();
+        }
+    }
+
+public:
+    void append(char c) {
+        buffer.push_back(c);
+    }
+
+    void append(const char* ptr, size_t n) {
+        buffer.append(ptr, n);
+    }
+
+    void append(const std::string& x) {
+        buffer.append(x);
+    }
+
+    void flush_if_full() {
+        if (buffer.size() >= buffer_size) {
+            flush();
+        }
+    }
+
+    void finish() {
+        flush();
+        if (threaded) {
+            {
+                pybind11::gil_scoped_release release;
+                {
+                    std::lock_guard<std::mutex> lck(mut);
+                    done = true;
+                }
+                cv.notify_all();
+                worker.join();
+            }
+            if (error) {
+                std::rethrow_exception(error);
+            }
+        }
+        writer.finish();
+    }
+
+private:
+    static byteme::GzipFileWriterOptions make_options(int level) {
+        if (level < 1 || level > 9) {
+            throw std::runtime_error("compression level should be an integer from 1 to 9");
+        }
+        byteme::GzipFileWriterOptions opt;
+        opt.compression_level = level;
+        return opt;
+    }
+
+    void flush() {
+        if (buffer.empty()) {
+            return;
+        }
+
+        if (!threaded) {
+            writer.write(reinterpret_cast<const unsigned char*>(buffer.data()), buffer.size());
+            buffer.clear();
+            return;
+        }
+
+        // Releasing the GIL while waiting for the compression thread to catch up.
+        std::exception_ptr failed;
+        {
+            pybind11::gil_scoped_release release;
+            std::unique_lock<std::mutex> lck(mut);
+            cv.wait(lck, [&]() -> bool { return pending.size() < max_pending || error; });
+            if (error) {
+                failed = error;
+            } else {
+                pending.emplace_back(std::move(buffer));
+            }
+        }
+        cv.notify_all();
+        if (failed) {
+            std::rethrow_exception(failed);
+        }
+
+        buffer = std::string();
+        buffer.reserve(buffer_size);
+    }
+
+    void compress() {
+        while (true) {
+            std::string current;
+            {
+                std::unique_lock<std::mutex> lck(mut);
+                cv.wait(lck, [&]() -> bool { return !pending.empty() || done; });
+                if (pending.empty()) {
+                    return;
+                }
+                current = std::move(pending.front());
+                pending.pop_front();
+            }
+            cv.notify_all();
+
+            try {
+                writer.write(reinterpret_cast<const unsigned char*>(current.data()), current.size());
+            } catch (...) {
+                std::lock_guard<std::mutex> lck(mut);
+                error = std::current_exception();
+                pending.clear();
+                cv.notify_all();
+                return;
+            }
+        }
+    }
+
+private:
+    static constexpr size_t buffer_size = 1048576;
+    static constexpr size_t max_pending = 2;
+
+    byteme::GzipFileWriter writer;
+    bool threaded;
+    std::string buffer;
+
+    std::thread worker;
+    std::mutex mut;
+    std::condition_variable cv;
+    std::deque<std::string> pending;
+    bool done = false;
+    std::exception_ptr error;
+};
+
+/** Serialization of the JSON-compatible Python objects. **/
+
+static void dump_string(PyObject* x, JsonGzipSink& sink) {
+    Py_ssize_t len;
+    const char* ptr = PyUnicode_AsUTF8AndSize(x, &len);
+    if (ptr == NULL) {
+        throw pybind11::error_already_set();
+    }
+
+    sink.append('"');
+    Py_ssize_t last = 0;
+    for (Py_ssize_t i = 0; i < len; ++i) {
+        unsigned char c = ptr[i];
+        if (c >= 0x20 && c != '"' && c != '\\') {
+            continue;
+        }
+
+        sink.append(ptr + last, i - last);
+        last = i + 1;
+        switch (c) {
+            case '"': sink.append("\\\"", 2); break;
+            case '\\': sink.append("\\\\", 2); break;
+            case '\n': sink.append("\\n", 2); break;
+            case '\r': sink.append("\\r", 2); break;
+            case '\t': sink.append("\\t", 2); break;
+            case '\b': sink.append("\\b", 2); break;
+            case '\f': sink.append("\\f", 2); break;
+            default:
+                {
+                    static const char* hex = "0123456789abcdef";
+                    char escaped[6] = { '\\', 'u', '0', '0', hex[c >> 4], hex[c & 0xf] };
+                    sink.append(escaped, 6);
+                }
+        }
+    }
+    sink.append(ptr + last, len - last);
+    sink.append('"');
+}
+
+static void dump_integer(PyObject* x, JsonGzipSink& sink) {
+    int overflow = 0;
+    long long val = PyLong_AsLongLongAndOverflow(x, &overflow);
+    if (val == -1 && PyErr_Occurred()) {
+        throw pybind11::error_already_set();
+    }
+    if (overflow) {
+        sink.append(pybind11::cast<std::string>(pybind11::str(x)));
+    } else {
+        sink.append(std::to_string(val));
+    }
+}
+
+static void dump_float(double val, JsonGzipSink& sink) {
+    if (!std::isfinite(val)) {
+        throw std::runtime_error("non-finite numbers should be replaced with strings before serialization");
+    }
+    char* formatted = PyOS_double_to_string(val, 'r', 0, Py_DTSF_ADD_DOT_0, NULL);
+    if (formatted == NULL) {
+        throw pybind11::error_already_set();
+    }
+    sink.append(formatted, std::strlen(formatted));
+    PyMem_Free(formatted);
+}
+
+static void dump_object(PyObject* x, JsonGzipSink& sink) {
+    if (x == Py_None) {
+        sink.append("null", 4);
+
+    } else if (x == Py_True) {
+        sink.append("true", 4);
+
+    } else if (x == Py_False) {
+        sink.append("false", 5);
+
+    } else if (PyUnicode_Check(x)) {
+        dump_string(x, sink);
+
+    } else if (PyLong_Check(x)) {
+        dump_integer(x, sink);
+
+    } else if (PyFloat_Check(x)) {
+        dump_float(PyFloat_AS_DOUBLE(x), sink);
+
+    } else if (PyList_Check(x)) {
+        sink.append('[');
+        Py_ssize_t n = PyList_GET_SIZE(x);
+        for (Py_ssize_t i = 0; i < n; ++i) {
+            if (i) {
+                sink.append(", ", 2);
+            }
+            dump_object(PyList_GET_ITEM(x, i), sink);
+            sink.flush_if_full();
+        }
+        sink.append(']');
+
+    } else if (PyDict_Check(x)) {
+        sink.append('{');
+        PyObject* key;
+        PyObject* value;
+        Py_ssize_t pos = 0;
+        bool first = true;
+        while (PyDict_Next(x, &pos, &key, &value)) {
+            if (!PyUnicode_Check(key)) {
+                throw std::runtime_error("dictionary keys should be strings");
+            }
+            if (!first) {
+                sink.append(", ", 2);
+            }
+            first = false;
+            dump_string(key, sink);
+            sink.append(": ", 2);
+            dump_object(value, sink);
+        }
+        sink.append('}');
+
+    } else if (PyIndex_Check(x)) {
+        // Integer-like objects, e.g., NumPy integers.
+        pybind11::object converted = pybind11::reinterpret_steal<pybind11::object>(PyNumber_Index(x));
+        if (!converted) {
+            throw pybind11::error_already_set();
+        }
+        dump_integer(converted.ptr(), sink);
+
+    } else {
+        throw std::runtime_error("cannot serialize object of type '" + std::string(Py_TYPE(x)->tp_name) + "' to JSON");
+    }
+}
+
+/** General method. **/
+
+void dump_list_json(std::string path, pybind11::handle contents, int compression_level, bool compression_thread) {
+    JsonGzipSink sink(path, compression_level, compression_thread);
+    dump_object(contents.ptr(), sink);
+    sink.finish();
+}
@@ -3,13 +3,15 @@
 #include <cstdint>
 
 // Declarations:
-pybind11::object load_list_json(std::string, pybind11::list);
-pybind11::object load_list_hdf5(std::string, std::string, pybind11::list);
+pybind11::object load_list_json(std::string, pybind11::list, bool, pybind11::list);
+pybind11::object load_list_hdf5(std::string, std::string, pybind11::list, bool, pybind11::list);
+void dump_list_json(std::string, pybind11::handle, int, bool);
 void validate(std::string, pybind11::handle, pybind11::dict);
 
 // Binding:
 PYBIND11_MODULE(lib_dolomite_base, m) {
     m.def("load_list_json", &load_list_json);
     m.def("load_list_hdf5", &load_list_hdf5);
+    m.def("dump_list_json", &dump_list_json);
     m.def("validate", &validate);
 }
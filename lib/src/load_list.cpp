@@ -6,90 +6,145 @@
 
 #include <cstdint>
 #include <iostream>
+#include <algorithm>
+#include <memory>
+#include <mutex>
+#include <vector>
+#include <type_traits>
+#include <string>
+#include <stdexcept>
 
 /** Defining the various elements. **/
 
-struct PythonBase {
-    virtual ~PythonBase() = default;
-    virtual pybind11::object extract() const = 0;
+// All elements are filled with plain C++ buffers so that parsing can be done
+// without the GIL. The Python objects are only created by extract().
+struct CppBase {
+    virtual ~CppBase() = default;
+    virtual pybind11::object extract(bool numpy_vectors) const = 0;
 };
 
+pybind11::object extract_element(const std::shared_ptr<uzuki2::Base>& x, bool numpy_vectors) {
+    return dynamic_cast<const CppBase*>(x.get())->extract(numpy_vectors);
+}
+
+pybind11::list create_string_list(const std::vector<std::string>& x) {
+    pybind11::list output(x.size());
+    for (size_t i = 0, end = x.size(); i < end; ++i) {
+        output[i] = pybind11::str(x[i]);
+    }
+    return output;
+}
+
+template<typename T>
+pybind11::object create_typed_list(const pybind11::list& storage, const std::vector<std::string>& names) {
+    pybind11::module bu = pybind11::module::import("biocutils");
+    const char* cls;
+    if constexpr(std::is_same<T, int32_t>::value) {
+        cls = "IntegerList";
+    } else if constexpr(std::is_same<T, bool>::value) {
+        cls = "BooleanList";
+    } else {
+        cls = "FloatList";
+    }
+
+    if (names.empty()) {
+        return bu.attr(cls)(storage);
+    } else {
+        using namespace pybind11::literals;
+        return bu.attr(cls)(storage, "names"_a = create_string_list(names));
+    }
+}
+
 template<typename T, class Base>
-struct PythonNumpyVector : public Base, public PythonBase {
-    PythonNumpyVector(size_t l, bool n, bool s) : storage(l), names(n ? l : 0), is_scalar(s) {}
+struct CppNumericVector : public Base, public CppBase {
+    // Avoiding the bit-packed std::vector<bool>.
+    typedef typename std::conditional<std::is_same<T, bool>::value, unsigned char, T>::type Stored;
+
+    CppNumericVector(size_t l, bool n, bool s) : values(l), names(n ? l : 0), is_scalar(s) {}
 
     size_t size() const { 
-        return storage.size();
+        return values.size();
     }
 
     void set(size_t i, T val) {
-        storage[i] = val;
+        values[i] = val;
     }
 
     void set_missing(size_t i) {
-        storage[i] = pybind11::none();
+        values[i] = 0;
+        missing.push_back(i);
     }
 
     void set_name(size_t i, std::string n) {
         names[i] = std::move(n);
     }
 
-    pybind11::object extract() const {
-        if (names.empty()) {
-            if (is_scalar) {
-                return storage[0];
-            } else {
-                pybind11::module bu = pybind11::module::import("biocutils");
-                if constexpr(std::is_same<T, int32_t>::value) {
-                    return bu.attr("IntegerList")(storage);
-                } else if constexpr(std::is_same<T, bool>::value) {
-                    return bu.attr("BooleanList")(storage);
-                } else {
-                    return bu.attr("FloatList")(storage);
-                }
+    pybind11::object extract(bool numpy_vectors) const {
+        if (names.empty() && is_scalar) {
+            if (!missing.empty()) {
+                return pybind11::none();
             }
-        } else {
-            pybind11::module bu = pybind11::module::import("biocutils");
-            using namespace pybind11::literals;
-            if constexpr(std::is_same<T, int32_t>::value) {
-                return bu.attr("IntegerList")(storage, "names"_a = names);
-            } else if constexpr(std::is_same<T, bool>::value) {
-                return bu.attr("BooleanList")(storage, "names"_a = names);
+            return pybind11::cast(static_cast<T>(values[0]));
+        }
+
+        // Named vectors are still returned as typed lists, as NumPy arrays don't have names.
+        if (numpy_vectors && names.empty()) {
+            pybind11::array_t<T> output(values.size());
+            std::copy(values.begin(), values.end(), output.mutable_data());
+            if (missing.empty()) {
+                return output;
             } else {
-                return bu.attr("FloatList")(storage, "names"_a = names);
+                return mask_numpy_array(output, missing);
             }
         }
+
+        pybind11::list storage(values.size());
+        for (size_t i = 0, end = values.size(); i < end; ++i) {
+            storage[i] = static_cast<T>(values[i]);
+        }
+        for (auto m : missing) {
+            storage[m] = pybind11::none();
+        }
+        return create_typed_list<T>(storage, names);
     }
 
-    pybind11::list storage;
-    pybind11::list names;
+    std::vector<Stored> values;
+    std::vector<size_t> missing;
+    std::vector<std::string> names;
     bool is_scalar;
 };
 
-typedef PythonNumpyVector<double, uzuki2::NumberVector> PythonNumberVector;
-typedef PythonNumpyVector<int32_t, uzuki2::IntegerVector> PythonIntegerVector;
-typedef PythonNumpyVector<bool, uzuki2::BooleanVector> PythonBooleanVector;
+typedef CppNumericVector<double, uzuki2::NumberVector> CppNumberVector;
+
+typedef CppNumericVector<int32_t, uzuki2::IntegerVector> CppIntegerVector;
+
+typedef CppNumericVector<bool, uzuki2::BooleanVector> CppBooleanVector;
 
-struct PythonStringVector : public uzuki2::StringVector, public PythonBase {
-    PythonStringVector(size_t l, bool n, bool s, uzuki2::StringVector::Format) : storage(l), names(n ? l : 0), is_scalar(s) {}
+struct CppStringVector : public uzuki2::StringVector, public CppBase {
+    CppStringVector(size_t l, bool n, bool s, uzuki2::StringVector::Format) : values(l), names(n ? l : 0), is_scalar(s) {}
 
     size_t size() const { 
-        return storage.size();
+        return values.size();
     }
 
     void set(size_t i, std::string val) {
-        storage[i] = std::move(val);
+        values[i] = std::move(val);
     }
 
     void set_missing(size_t i) {
-        storage[i] = pybind11::none();
+        missing.push_back(i);
     }
 
     void set_name(size_t i, std::string name) {
         names[i] = std::move(name);
     }
 
-    pybind11::object extract() const {
+    pybind11::object extract(bool) const {
+        pybind11::list storage = create_string_list(values);
+        for (auto m : missing) {
+            storage[m] = pybind11::none();
+        }
+
         if (names.empty()) {
             if (is_scalar) {
                 return storage[0];
@@ -100,28 +155,29 @@ struct PythonStringVector : public uzuki2::StringVector, public PythonBase {
         } else {
             pybind11::module bu = pybind11::module::import("biocutils");
             using namespace pybind11::literals;
-            return bu.attr("StringList")(storage, "names"_a = names);
+            return bu.attr("StringList")(storage, "names"_a = create_string_list(names));
         }
     }
 
-    pybind11::list storage;
-    pybind11::list names;
+    std::vector<std::string> values;
+    std::vector<size_t> missing;
+    std::vector<std::string> names;
     bool is_scalar;
 };
 
-struct PythonFactor : public uzuki2::Factor, public PythonBase {
-    PythonFactor(size_t l, bool n, bool s, size_t ll, bool o) : storage(l), names(n ? l : 0), is_scalar(s), levels(ll), ordered(o) {}
+struct CppFactor : public uzuki2::Factor, public CppBase {
+    CppFactor(size_t l, bool n, bool s, size_t ll, bool o) : codes(l), names(n ? l : 0), is_scalar(s), levels(ll), ordered(o) {}
 
     size_t size() const { 
-        return storage.size(); 
+        return codes.size(); 
     }
 
     void set(size_t i, size_t l) {
-        storage.mutable_at(i) = l;
+        codes[i] = l;
     }
 
     void set_missing(size_t i) {
-        storage.mutable_at(i) = -1;
+        codes[i] = -1;
     }
 
     void set_name(size_t i, std::string name) {
@@ -132,122 +188,307 @@ struct PythonFactor : public uzuki2::Factor, public PythonBase {
         levels[i] = std::move(l);
     }
 
-    pybind11::object extract() const {
+    pybind11::object extract(bool) const {
+        pybind11::array_t<int32_t> storage(codes.size());
+        std::copy(codes.begin(), codes.end(), storage.mutable_data());
+
         pybind11::module bu = pybind11::module::import("biocutils");
         using namespace pybind11::literals;
         if (names.size() == 0) {
-            return bu.attr("Factor")(storage, levels, "ordered"_a = ordered);
+            return bu.attr("Factor")(storage, create_string_list(levels), "ordered"_a = ordered);
         } else {
-            return bu.attr("Factor")(storage, levels, "ordered"_a = ordered, "names"_a = names);
+            return bu.attr("Factor")(storage, create_string_list(levels), "ordered"_a = ordered, "names"_a = create_string_list(names));
         }
     }
 
-    pybind11::array_t<int32_t> storage;
-    pybind11::list names;
+    std::vector<int32_t> codes;
+    std::vector<std::string> names;
     bool is_scalar;
-    pybind11::list levels;
+    std::vector<std::string> levels;
     bool ordered;
 };
 
-struct PythonNothing : public uzuki2::Nothing, public PythonBase {
-    pybind11::object extract() const {
+struct CppNothing : public uzuki2::Nothing, public CppBase {
+    pybind11::object extract(bool) const {
         return pybind11::none();
     }
 };
 
-struct PythonExternal : public uzuki2::External, public PythonBase {
-    PythonExternal(void *p) : ptr(p) {}
+struct CppExternal : public uzuki2::External, public CppBase {
+    CppExternal(void *p) : ptr(p) {}
 
-    pybind11::object extract() const {
+    pybind11::object extract(bool) const {
         return *reinterpret_cast<pybind11::object*>(ptr);
     }
 
     void* ptr;
 };
 
-struct PythonList : public uzuki2::List, public PythonBase {
-    PythonList(size_t l, bool n) : values(l), has_names(n), names(n ? l : 0) {}
+struct CppList : public uzuki2::List, public CppBase {
+    CppList(size_t l, bool n) : values(l), has_names(n), names(n ? l : 0) {}
 
     size_t size() const { 
         return values.size(); 
     }
 
     void set(size_t i, std::shared_ptr<uzuki2::Base> ptr) {
-        values[i] = dynamic_cast<PythonBase*>(ptr.get())->extract();
+        values[i] = std::move(ptr);
     }
 
     void set_name(size_t i, std::string name) {
         names[i] = std::move(name);
     }
 
-    pybind11::object extract() const {
+    pybind11::object extract(bool numpy_vectors) const {
+        pybind11::list storage(values.size());
+        for (size_t i = 0, end = values.size(); i < end; ++i) {
+            storage[i] = extract_element(values[i], numpy_vectors);
+        }
+
         pybind11::module bu = pybind11::module::import("biocutils");
         if (!has_names) {
-            return bu.attr("NamedList")(values);
+            return bu.attr("NamedList")(storage);
         } else {
             using namespace pybind11::literals;
-            return bu.attr("NamedList")(values, "names"_a = names);
+            return bu.attr("NamedList")(storage, "names"_a = create_string_list(names));
         }
     }
 
-    pybind11::list values;
+    std::vector<std::shared_ptr<uzuki2::Base> > values;
     bool has_names = false;
-    pybind11::list names;
+    std::vector<std::string> names;
 };
 
 /** Provisioner. **/
 
-struct PythonProvisioner {
-    static uzuki2::Nothing* new_Nothing() { return (new PythonNothing); }
+struct CppProvisioner {
+    static uzuki2::Nothing* new_Nothing() { return (new CppNothing); }
 
-    static uzuki2::External* new_External(void* p) { return (new PythonExternal(p)); }
+    static uzuki2::External* new_External(void* p) { return (new CppExternal(p)); }
 
     template<class ... Args_>
-    static uzuki2::List* new_List(Args_&& ... args) { return (new PythonList(std::forward<Args_>(args)...)); }
+    static uzuki2::List* new_List(Args_&& ... args) { return (new CppList(std::forward<Args_>(args)...)); }
 
     template<class ... Args_>
-    static uzuki2::IntegerVector* new_Integer(Args_&& ... args) { return (new PythonIntegerVector(std::forward<Args_>(args)...)); }
+    static uzuki2::IntegerVector* new_Integer(Args_&& ... args) { return (new CppIntegerVector(std::forward<Args_>(args)...)); }
 
     template<class ... Args_>
-    static uzuki2::NumberVector* new_Number(Args_&& ... args) { return (new PythonNumberVector(std::forward<Args_>(args)...)); }
+    static uzuki2::NumberVector* new_Number(Args_&& ... args) { return (new CppNumberVector(std::forward<Args_>(args)...)); }
 
     template<class ... Args_>
-    static uzuki2::StringVector* new_String(Args_&& ... args) { return (new PythonStringVector(std::forward<Args_>(args)...)); }
+    static uzuki2::StringVector* new_String(Args_&& ... args) { return (new CppStringVector(std::forward<Args_>(args)...)); }
 
     template<class ... Args_>
-    static uzuki2::BooleanVector* new_Boolean(Args_&& ... args) { return (new PythonBooleanVector(std::forward<Args_>(args)...)); }
+    static uzuki2::BooleanVector* new_Boolean(Args_&& ... args) { return (new CppBooleanVector(std::forward<Args_>(args)...)); }
 
     template<class ... Args_>
-    static uzuki2::Factor* new_Factor(Args_&& ... args) { return (new PythonFactor(std::forward<Args_>(args)...)); }
+    static uzuki2::Factor* new_Factor(Args_&& ... args) { return (new CppFactor(std::forward<Args_>(args)...)); }
 };
 
+// This only holds a pointer to the objects, as it is copied (and destroyed)
+// by the parser while the GIL is released.
 struct PythonExternals {
-    PythonExternals(const pybind11::list& current) {
-        stored.reserve(current.size());
-        for (size_t i = 0, end = current.size(); i < end; ++i) {
-            stored.emplace_back(current[i]);
-        }
-    }
+    PythonExternals(std::vector<pybind11::object>& stored) : stored(&stored) {}
 
     void* get(size_t i) {
-        return reinterpret_cast<void*>(&(stored[i]));
+        return reinterpret_cast<void*>(&((*stored)[i]));
     }
 
     size_t size() const {
-        return stored.size();
+        return stored->size();
     }
 
+    std::vector<pybind11::object>* stored;
+};
+
+std::vector<pybind11::object> collect_externals(const pybind11::list& children) {
     std::vector<pybind11::object> stored;
+    stored.reserve(children.size());
+    for (size_t i = 0, end = children.size(); i < end; ++i) {
+        stored.emplace_back(children[i]);
+    }
+    return stored;
+}
+
+/** Selection of sub-elements. **/
+
+struct Selector {
+    bool by_name = false;
+    std::string name;
+    size_t index = 0;
+};
+
+std::vector<Selector> parse_selection(const pybind11::list& select) {
+    std::vector<Selector> output;
+    output.reserve(select.size());
+    for (auto x : select) {
+        Selector current;
+        if (pybind11::isinstance<pybind11::str>(x)) {
+            current.by_name = true;
+            current.name = x.cast<std::string>();
+        } else {
+            auto val = pybind11::int_(pybind11::reinterpret_borrow<pybind11::object>(x)).cast<long long>();
+            if (val < 0) {
+                throw pybind11::index_error("list selections should be non-negative integers or strings");
+            }
+            current.index = val;
+        }
+        output.push_back(std::move(current));
+    }
+    return output;
+}
+
+size_t resolve_selector(const Selector& sel, size_t len, const std::vector<std::string>& names, const std::string& where) {
+    if (!sel.by_name) {
+        if (sel.index >= len) {
+            throw pybind11::index_error("index " + std::to_string(sel.index) + " out of range for the list at '" + where + "'");
+        }
+        return sel.index;
+    }
+
+    for (size_t i = 0, end = names.size(); i < end; ++i) {
+        if (names[i] == sel.name) {
+            return i;
+        }
+    }
+    throw pybind11::key_error("no element named '" + sel.name + "' in the list at '" + where + "'");
+}
+
+struct NameCollector {
+    NameCollector(size_t n) : names(n) {}
+
+    size_t size() const {
+        return names.size();
+    }
+
+    void set_name(size_t i, std::string n) {
+        names[i] = std::move(n);
+    }
+
+    std::vector<std::string> names;
 };
 
 /** General methods. **/
 
-pybind11::object load_list_json(std::string path, pybind11::list children) {
-    auto parsed = uzuki2::json::parse_file<PythonProvisioner>(path, PythonExternals(children), {});
-    return dynamic_cast<PythonBase*>(parsed.get())->extract();
+std::shared_ptr<uzuki2::Base> parse_json(const std::string& path, PythonExternals ext, const std::vector<Selector>& selection) {
+    if (selection.empty()) {
+        auto parsed = uzuki2::json::parse_file<CppProvisioner>(path, std::move(ext), {});
+        return std::move(parsed.ptr);
+    }
+
+    // The entire document still needs to be parsed into a JSON tree, but we
+    // only create objects for the selected subtree.
+    byteme::SomeFileReader reader(path.c_str(), {});
+    byteme::PerByteSerial<char, byteme::Reader*> pb(&reader);
+    auto contents = millijson::parse(pb);
+
+    uzuki2::Version version;
+    const millijson::Base* current = contents.get();
+    std::string where;
+    for (const auto& sel : selection) {
+        if (current->type() != millijson::OBJECT) {
+            throw std::runtime_error("expected a JSON object at '" + where + "'");
+        }
+        const auto& map = static_cast<const millijson::Object*>(current)->value();
+
+        if (current == contents.get()) {
+            auto vIt = map.find("version");
+            if (vIt != map.end() && vIt->second->type() == millijson::STRING) {
+                const auto& vstr = static_cast<const millijson::String*>(vIt->second.get())->value();
+                auto vraw = ritsuko::parse_version_string(vstr.c_str(), vstr.size(), /* skip_patch = */ true);
+                version.major = vraw.major;
+                version.minor = vraw.minor;
+            }
+        }
+
+        auto tIt = map.find("type");
+        if (tIt == map.end() || tIt->second->type() != millijson::STRING || static_cast<const millijson::String*>(tIt->second.get())->value() != "list") {
+            throw pybind11::value_error("cannot select a sub-element of a non-list object at '" + where + "'");
+        }
+
+        const std::string values_name = "values";
+        const auto& vals = uzuki2::json::extract_array(map, values_name, where);
+        std::vector<std::string> names;
+        if (sel.by_name) {
+            auto names_ptr = uzuki2::json::has_names(map, where);
+            if (names_ptr != NULL) {
+                NameCollector collected(vals.size());
+                uzuki2::json::fill_names(names_ptr, &collected, where);
+                names.swap(collected.names);
+            }
+        }
+
+        size_t i = resolve_selector(sel, vals.size(), names, where);
+        current = vals[i].get();
+        where += ".values[" + std::to_string(i) + "]";
+    }
+
+    return uzuki2::json::parse_object<CppProvisioner>(current, ext, where, version);
+}
+
+pybind11::object load_list_json(std::string path, pybind11::list children, bool numpy_vectors, pybind11::list select) {
+    auto selection = parse_selection(select);
+    auto stored = collect_externals(children);
+
+    std::shared_ptr<uzuki2::Base> parsed;
+    {
+        pybind11::gil_scoped_release release;
+        parsed = parse_json(path, PythonExternals(stored), selection);
+    }
+    return extract_element(parsed, numpy_vectors);
 }
 
-pybind11::object load_list_hdf5(std::string path, std::string name, pybind11::list children) {
-    auto parsed = uzuki2::hdf5::parse<PythonProvisioner>(path, name, PythonExternals(children), {});
-    return dynamic_cast<PythonBase*>(parsed.get())->extract();
+std::shared_ptr<uzuki2::Base> parse_hdf5(const std::string& path, const std::string& name, PythonExternals ext, const std::vector<Selector>& selection) {
+    if (selection.empty()) {
+        auto parsed = uzuki2::hdf5::parse<CppProvisioner>(path, name, std::move(ext), {});
+        return std::move(parsed.ptr);
+    }
+
+    // Only opening the groups along the selected path.
+    H5::H5File handle(path, H5F_ACC_RDONLY);
+    auto current = ritsuko::hdf5::open_group(handle, name.c_str());
+
+    uzuki2::Version version;
+    if (current.attrExists("uzuki_version")) {
+        auto ver_str = ritsuko::hdf5::open_and_load_scalar_string_attribute(current, "uzuki_version");
+        auto vraw = ritsuko::parse_version_string(ver_str.c_str(), ver_str.size(), /* skip_patch = */ true);
+        version.major = vraw.major;
+        version.minor = vraw.minor;
+    }
+
+    uzuki2::hdf5::Options options;
+    for (const auto& sel : selection) {
+        auto where = ritsuko::hdf5::get_name(current);
+        auto object_type = ritsuko::hdf5::open_and_load_scalar_string_attribute(current, "uzuki_object");
+        if (object_type != "list") {
+            throw pybind11::value_error("cannot select a sub-element of a non-list object at '" + where + "'");
+        }
+
+        auto dhandle = ritsuko::hdf5::open_group(current, "data");
+        size_t len = dhandle.getNumObjs();
+        std::vector<std::string> names;
+        if (sel.by_name && current.exists("names")) {
+            NameCollector collected(len);
+            uzuki2::hdf5::extract_names(current, &collected, options.buffer_size);
+            names.swap(collected.names);
+        }
+
+        size_t i = resolve_selector(sel, len, names, where);
+        current = ritsuko::hdf5::open_group(dhandle, std::to_string(i).c_str());
+    }
+
+    return uzuki2::hdf5::parse_inner<CppProvisioner>(current, ext, version, options.buffer_size);
+}
+
+pybind11::object load_list_hdf5(std::string path, std::string name, pybind11::list children, bool numpy_vectors, pybind11::list select) {
+    auto selection = parse_selection(select);
+    auto stored = collect_externals(children);
+
+    std::shared_ptr<uzuki2::Base> parsed;
+    {
+        pybind11::gil_scoped_release release;
+        std::lock_guard<std::recursive_mutex> lck(hdf5_mutex());
+        parsed = parse_hdf5(path, name, PythonExternals(stored), selection);
+    }
+    return extract_element(parsed, numpy_vectors);
 }
@@ -4,6 +4,9 @@
 #include "pybind11/pybind11.h"
 #include "pybind11/numpy.h"
 
+#include <vector>
+#include <mutex>
+
 template<typename T>
 pybind11::object mask_numpy_array(const pybind11::array_t<T>& values, const std::vector<size_t>& missing) {
     size_t n = values.size();
@@ -21,4 +24,11 @@ pybind11::object mask_numpy_array(const pybind11::array_t<T>& values, const std:
     return ma.attr("array")(values, "mask"_a=mask);
 }
 
+// HDF5 is not built to be thread-safe, so any calls into the library need to
+// be serialized once the GIL is released.
+inline std::recursive_mutex& hdf5_mutex() {
+    static std::recursive_mutex mut;
+    return mut;
+}
+
 #endif
@@ -1,5 +1,9 @@
 #include "takane/takane.hpp"
 #include "pybind11/pybind11.h"
+#include "utils.h"
+
+#include <mutex>
+#include <memory>
 
 std::shared_ptr<millijson::Base> convert_to_millijson(const pybind11::handle& x) {
     std::shared_ptr<millijson::Base> output;
@@ -101,16 +105,26 @@ void validate(std::string path, pybind11::handle metadata, pybind11::dict custom
         }
         auto fun = pybind11::reinterpret_borrow<pybind11::function>(it->second);
         options.custom_validate[std::move(objname)] = [fun](const std::filesystem::path& path, const takane::ObjectMetadata& metadata, takane::Options&) {
+             // Validation runs without the GIL, see below.
+             pybind11::gil_scoped_acquire acquire;
              fun(pybind11::str(path.c_str()), convert_to_python(metadata));
              return;
         };
     }
 
-    if (pybind11::isinstance<pybind11::none>(metadata)) {
-        takane::validate(path, options);
-    } else {
+    std::unique_ptr<takane::ObjectMetadata> objmeta;
+    if (!pybind11::isinstance<pybind11::none>(metadata)) {
         auto converted = convert_to_millijson(metadata);
-        auto objmeta = takane::reformat_object_metadata(converted.get());
-        takane::validate(path, objmeta, options);
+        objmeta.reset(new takane::ObjectMetadata(takane::reformat_object_metadata(converted.get())));
+    }
+
+    // Other threads may be reading HDF5 files while holding the lock but not
+    // the GIL, so the GIL must be released before locking to avoid deadlocks.
+    pybind11::gil_scoped_release release;
+    std::lock_guard<std::recursive_mutex> lck(hdf5_mutex());
+    if (objmeta) {
+        takane::validate(path, *objmeta, options);
+    } else {
+        takane::validate(path, options);
     }
 }
@@ -22,7 +22,9 @@ from .save_object_file import save_object_file
 from .save_atomic_vector import save_atomic_vector_from_string_list, save_atomic_vector_from_integer_list, save_atomic_vector_from_float_list, save_atomic_vector_from_boolean_list
 from .save_string_factor import save_string_factor
 from .save_simple_list import save_simple_list_from_list, save_simple_list_from_dict, save_simple_list_from_NamedList
-from .save_data_frame import save_data_frame
+from .save_data_frame import save_data_frame, save_data_frame_from_pandas, save_data_frame_from_structured_array
+from .data_frame_writer import DataFrameWriter
+from .edit_data_frame import set_data_frame_column, remove_data_frame_column
 
 from .read_object import read_object, read_object_registry
 from .alt_read_object import alt_read_object, alt_read_object_function
@@ -32,6 +34,7 @@ from .read_atomic_vector import read_atomic_vector
 from .read_string_factor import read_string_factor
 from .read_simple_list import read_simple_list
 from .read_data_frame import read_data_frame
+from .read_statistics import read_statistics
 
 from .validate_object import validate_object, validate_object_registry
 from .list_objects import list_objects
@@ -40,3 +43,5 @@ from .validate_directory import validate_directory
 from .choose_missing_placeholder import choose_missing_integer_placeholder, choose_missing_float_placeholder, choose_missing_string_placeholder
 from .write_vector_to_hdf5 import write_string_vector_to_hdf5, write_float_vector_to_hdf5, write_integer_vector_to_hdf5, write_boolean_vector_to_hdf5
 from .load_vector_from_hdf5 import load_vector_from_hdf5
+from .compact_string_vector import CompactStringVector
+from .deferred_object import DeferredObject, DeferredColumn
@@ -1,37 +1,60 @@
+from typing import Optional, Sequence, Union
 import numpy
 from biocutils import Factor
 import h5py
 
 from . import _utils_string as strings
+from . import _utils_misc as misc
+
+
+def choose_code_type(nlevels: int, has_missing: bool) -> numpy.dtype:
+    """Choose the smallest unsigned integer type that can store the codes for
+    ``nlevels`` levels, along with the missing placeholder (which is equal to
+    ``nlevels``) if ``has_missing = True``."""
+    largest = nlevels if has_missing else nlevels - 1
+    for dtype in [numpy.uint8, numpy.uint16]:
+        if largest <= numpy.iinfo(dtype).max:
+            return numpy.dtype(dtype)
+    return numpy.dtype(numpy.uint32)
 
 
 def save_factor_to_hdf5(handle: h5py.Group, f: Factor):
     strings.save_fixed_length_strings(handle, "levels", f.get_levels())
 
-    codes = f.get_codes()
-    is_missing = codes == -1
+    codes = numpy.asarray(f.get_codes())
+    is_missing = codes < 0
     has_missing = is_missing.any()
     nlevels = len(f.get_levels())
+    dtype = choose_code_type(nlevels, has_missing)
     if has_missing:
-        codes = codes.astype(numpy.uint32, copy=True)
+        codes = codes.astype(dtype, copy=True)
         codes[is_missing] = nlevels
 
-    dhandle = handle.create_dataset("codes", data=codes, dtype="u4", compression="gzip", chunks=True)
+    dhandle = handle.create_dataset("codes", data=codes, dtype=dtype, compression="gzip", chunks=True)
     if has_missing:
-        dhandle.attrs.create("missing-value-placeholder", data=nlevels, dtype="u4")
+        dhandle.attrs.create("missing-value-placeholder", data=nlevels, dtype=dtype)
 
     if f.get_ordered():
         handle.attrs.create("ordered", data=1, dtype="i1")
 
 
-def load_factor_from_hdf5(handle: h5py.Group):
+def load_factor_from_hdf5(handle: h5py.Group, rows: Optional[Union[slice, Sequence[int]]] = None):
     chandle = handle["codes"]
-    codes = chandle[:]
-    codes = codes.astype(numpy.int32, copy=False)
-
+    placeholder = None
     if "missing-value-placeholder" in chandle.attrs:
         placeholder = chandle.attrs["missing-value-placeholder"]
-        codes[codes == placeholder] = -1
+
+    if rows is None and numpy.can_cast(chandle.dtype, numpy.int32):
+        # Letting HDF5 convert the (possibly narrower) codes during the read,
+        # to avoid a separate copy for the cast.
+        codes = chandle.astype(numpy.int32)[:]
+        if placeholder is not None:
+            codes[codes == placeholder] = -1
+    else:
+        raw = misc.read_dataset(chandle, rows)
+        codes = raw.astype(numpy.int32, copy=False)
+        if placeholder is not None:
+            codes[raw == placeholder] = -1
 
     ordered = False
     if "ordered" in handle.attrs:
@@ -1,3 +1,9 @@
+from typing import Optional, Sequence, Union
+import biocutils
+import numpy
+import h5py
+
+
 LIMIT32 = 2**31
 
 
@@ -6,6 +12,23 @@ def scalar_exceeds_int32(x: int) -> bool:
 
 
 def sequence_exceeds_int32(x: int, check_none: bool = True) -> bool:
+    # Checking the range with NumPy reductions for inputs that are known to be
+    # numeric; None in typed lists is converted to NaN and ignored, as are
+    # masked values. The int32 limits are exactly representable as doubles.
+    values = None
+    if isinstance(x, numpy.ndarray):
+        if numpy.issubdtype(x.dtype, numpy.integer) or numpy.issubdtype(x.dtype, numpy.floating):
+            values = x.compressed() if numpy.ma.isMaskedArray(x) else x
+    elif isinstance(x, (biocutils.IntegerList, biocutils.FloatList)):
+        values = numpy.array(x.as_list(), dtype=numpy.float64)
+
+    if values is not None:
+        if numpy.issubdtype(values.dtype, numpy.floating):
+            values = values[~numpy.isnan(values)]
+        if len(values) == 0:
+            return False
+        return bool(values.min() < -LIMIT32 or values.max() >= LIMIT32)
+
     if check_none:
         for y in x:
             if y is not None and scalar_exceeds_int32(y):
@@ -28,3 +51,102 @@ def translate_type(t: str) -> type:
         return bool
     else:
         raise NotImplementedError("unknown vector type '" + t + "'")
+
+
+# Block size (in elements) for partial reads from contiguous datasets, where
+# there is no chunking to tell us what is cheap to read in a single call.
+CONTIGUOUS_BLOCK_SIZE = 65536
+
+
+def dataset_layout(contiguous: bool) -> dict:
+    if contiguous:
+        # Contiguous layouts without filters can be memory-mapped on read.
+        return {}
+    return { "compression": "gzip", "chunks": True }
+
+
+def memmap_dataset(handle: h5py.Dataset, rows: Optional[Union[slice, Sequence[int], numpy.ndarray]] = None) -> Optional[numpy.ndarray]:
+    if handle.chunks is not None or handle.external is not None:
+        return None
+    if handle.dtype.kind not in "iuf" or len(handle.shape) != 1 or handle.shape[0] == 0:
+        return None
+    if handle.file.driver not in ("sec2", "stdio"):
+        return None
+
+    offset = handle.id.get_offset()
+    if offset is None:
+        return None
+
+    values = numpy.memmap(handle.file.filename, dtype=handle.dtype, mode="r", offset=offset, shape=handle.shape)
+    if rows is not None:
+        values = values[normalize_rows(rows, handle.shape[0])]
+    return values
+
+
+def normalize_rows(rows: Union[slice, Sequence[int], numpy.ndarray], n: int) -> Union[slice, numpy.ndarray]:
+    if isinstance(rows, slice):
+        start, stop, step = rows.indices(n)
+        if step > 0:
+            return slice(start, stop, step)
+        return numpy.arange(start, stop, step)
+
+    rows = numpy.asarray(rows)
+    if rows.dtype == numpy.bool_:
+        if rows.shape != (n,):
+            raise ValueError("boolean 'rows' should have length equal to the number of rows (" + str(n) + ")")
+        return numpy.nonzero(rows)[0]
+
+    if len(rows) == 0:
+        return numpy.zeros(0, dtype=numpy.int64)
+    if not numpy.issubdtype(rows.dtype, numpy.integer):
+        raise TypeError("'rows' should be a slice, a sequence of integers or a boolean mask")
+    if rows.min() < 0 or rows.max() >= n:
+        raise IndexError("'rows' contains out-of-range indices for " + str(n) + " rows")
+    return rows.astype(numpy.int64, copy=False)
+
+
+def count_rows(rows: Optional[Union[slice, Sequence[int], numpy.ndarray]], n: int) -> int:
+    if rows is None:
+        return n
+    rows = normalize_rows(rows, n)
+    if isinstance(rows, slice):
+        return len(range(*rows.indices(n)))
+    return len(rows)
+
+
+def read_dataset(handle: h5py.Dataset, rows: Optional[Union[slice, Sequence[int], numpy.ndarray]] = None) -> numpy.ndarray:
+    if rows is None:
+        return handle[:]
+
+    n = handle.shape[0]
+    rows = normalize_rows(rows, n)
+    if isinstance(rows, slice):
+        return handle[rows]
+    if len(rows) == 0:
+        return handle[0:0]
+
+    # Reading blocks of chunks that contain at least one requested index, so
+    # that each chunk is only decompressed once and untouched chunks are never
+    # read. Runs of adjacent chunks are merged into a single read, up to a cap
+    # to avoid realizing huge temporary buffers.
+    uniq, inverse = numpy.unique(rows, return_inverse=True)
+    block = handle.chunks[0] if handle.chunks is not None else CONTIGUOUS_BLOCK_SIZE
+    max_blocks = max(1, (CONTIGUOUS_BLOCK_SIZE * 16) // block)
+
+    used = numpy.unique(uniq // block)
+    run_id = numpy.concatenate(([0], numpy.cumsum(numpy.diff(used) > 1)))
+    run_start = used[numpy.searchsorted(run_id, run_id, side="left")]
+    group = run_id * (n // block + 1) + (used - run_start) // max_blocks
+    boundaries = numpy.concatenate(([0], numpy.nonzero(numpy.diff(group))[0] + 1, [len(used)]))
+
+    output = numpy.empty(len(uniq), dtype=handle.dtype)
+    for g in range(len(boundaries) - 1):
+        lo = int(used[boundaries[g]]) * block
+        hi = min((int(used[boundaries[g + 1] - 1]) + 1) * block, n)
+        first, last = numpy.searchsorted(uniq, [lo, hi])
+        contents = handle[lo:hi]
+        output[first:last] = contents[uniq[first:last] - lo]
+
+    if len(uniq) != len(rows) or (rows[1:] < rows[:-1]).any():
+        output = output[inverse]
+    return output
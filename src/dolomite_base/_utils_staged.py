@@ -0,0 +1,130 @@
+from typing import Any, Optional
+import zlib
+import numpy
+import h5py
+
+
+# Target size of each chunk, in bytes, when compressing chunks ourselves.
+CHUNK_BYTES = 65536
+
+# Same as h5py's default level for GZIP compression.
+GZIP_LEVEL = 4
+
+
+class StagedAttributes:
+    """Records attributes to be created on a HDF5 object."""
+
+    def __init__(self):
+        self._entries = {}
+
+    def __setitem__(self, name: str, value: Any):
+        self._entries[name] = (value, None)
+
+    def __getitem__(self, name: str) -> Any:
+        return self._entries[name][0]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._entries
+
+    def create(self, name: str, data: Any, shape: Optional[tuple] = None, dtype: Any = None):
+        self._entries[name] = (data, dtype)
+
+    def replay(self, handle):
+        for name, (data, dtype) in self._entries.items():
+            if dtype is None:
+                handle.attrs[name] = data
+            else:
+                handle.attrs.create(name, data=data, dtype=dtype)
+
+
+class StagedDataset:
+    """Records the creation of a HDF5 dataset, possibly with pre-compressed chunks."""
+
+    def __init__(self, name: str, data: Any = None, dtype: Any = None, **kwargs):
+        self.name = name
+        self.attrs = StagedAttributes()
+        if dtype is not None:
+            self._data = numpy.asarray(data, dtype=dtype)
+        else:
+            self._data = numpy.asarray(data)
+        self._kwargs = kwargs
+        self._chunks = None
+
+    @property
+    def dtype(self) -> numpy.dtype:
+        return self._data.dtype
+
+    @property
+    def shape(self) -> tuple:
+        return self._data.shape
+
+    def compress(self):
+        # Compressing each chunk with zlib, which releases the GIL so that
+        # this can be run in parallel across threads. The chunks are then
+        # written directly to file, bypassing HDF5's own (serial) filters.
+        if self._kwargs.get("compression") != "gzip" or self._data.ndim != 1 or len(self._data) == 0:
+            return
+
+        n = len(self._data)
+        chunk = max(1, min(n, CHUNK_BYTES // max(1, self._data.dtype.itemsize)))
+        padded = numpy.zeros(-(-n // chunk) * chunk, dtype=self._data.dtype)
+        padded[:n] = self._data
+
+        compressed = []
+        for start in range(0, n, chunk):
+            compressed.append(zlib.compress(padded[start:start + chunk].tobytes(), GZIP_LEVEL))
+        self._chunks = (chunk, compressed)
+
+    def replay(self, handle: h5py.Group):
+        if self._chunks is None:
+            dset = handle.create_dataset(self.name, data=self._data, dtype=self._data.dtype, **self._kwargs)
+        else:
+            chunk, compressed = self._chunks
+            dset = handle.create_dataset(
+                self.name,
+                shape=self._data.shape,
+                dtype=self._data.dtype,
+                chunks=(chunk,),
+                compression="gzip",
+                compression_opts=GZIP_LEVEL
+            )
+            for i, payload in enumerate(compressed):
+                dset.id.write_direct_chunk((i * chunk,), payload)
+        self.attrs.replay(dset)
+
+
+class StagedGroup:
+    """Mimics the parts of the :py:class:`~h5py.Group` interface used to save
+    vectors, recording all operations so that they can be replayed later."""
+
+    def __init__(self):
+        self.attrs = StagedAttributes()
+        self._children = {}
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._children
+
+    def __getitem__(self, name: str):
+        return self._children[name]
+
+    def create_dataset(self, name: str, **kwargs) -> StagedDataset:
+        output = StagedDataset(name, **kwargs)
+        self._children[name] = output
+        return output
+
+    def create_group(self, name: str) -> "StagedGroup":
+        output = StagedGroup()
+        self._children[name] = output
+        return output
+
+    def compress(self):
+        for child in self._children.values():
+            child.compress()
+
+    def replay(self, handle: h5py.Group):
+        self.attrs.replay(handle)
+        for name, child in self._children.items():
+            if isinstance(child, StagedGroup):
+                child.replay(handle.create_group(name))
+            else:
+                child.replay(handle)
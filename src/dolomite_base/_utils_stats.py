@@ -0,0 +1,235 @@
+from typing import Any, Optional
+from functools import singledispatch
+import os
+import numpy
+import h5py
+from biocutils import Factor, StringList, IntegerList, FloatList, BooleanList
+
+from . import _utils_string as strings
+from .compact_string_vector import CompactStringVector
+
+
+# Number of minimum hash values used for the distinct count estimate. Counts
+# up to this number are exact, and larger counts have a relative standard
+# error of roughly 1/sqrt(KMV_SIZE - 2), i.e., about 3%.
+KMV_SIZE = 1024
+
+ATTR_NULL_COUNT = "statistics-null-count"
+ATTR_DISTINCT = "statistics-distinct"
+ATTR_MIN = "statistics-min"
+ATTR_MAX = "statistics-max"
+
+
+def _mix64(x: numpy.ndarray) -> numpy.ndarray:
+    # The finalizer from splitmix64, to spread out the bits of each value.
+    x = x.astype(numpy.uint64, copy=True)
+    x ^= x >> numpy.uint64(30)
+    x *= numpy.uint64(0xbf58476d1ce4e5b9)
+    x ^= x >> numpy.uint64(27)
+    x *= numpy.uint64(0x94d049bb133111eb)
+    x ^= x >> numpy.uint64(31)
+    return x
+
+
+def estimate_distinct(hashes: numpy.ndarray) -> int:
+    """Estimate the number of distinct values from their 64-bit hashes, using
+    the k-minimum values sketch. This is exact if there are no more than
+    ``KMV_SIZE`` distinct values."""
+    if len(hashes) > KMV_SIZE:
+        smallest = numpy.unique(numpy.partition(hashes, KMV_SIZE)[:KMV_SIZE + 1])
+        if len(smallest) < KMV_SIZE:
+            # Duplicates among the smallest hashes, so we have to do it properly.
+            smallest = numpy.unique(hashes)
+    else:
+        smallest = numpy.unique(hashes)
+
+    if len(smallest) <= KMV_SIZE:
+        return len(smallest)
+    kth = float(smallest[KMV_SIZE - 1]) / 2.0**64
+    return int(round((KMV_SIZE - 1) / kth))
+
+
+def _numeric_statistics(values: numpy.ndarray, mask: numpy.ndarray) -> dict:
+    present = values[~mask]
+    output = { "null_count": int(mask.sum()), "min": None, "max": None, "distinct": 0 }
+    if len(present) == 0:
+        return output
+
+    if numpy.issubdtype(present.dtype, numpy.floating):
+        finite = present[~numpy.isnan(present)]
+        if len(finite):
+            output["min"] = finite.min()
+            output["max"] = finite.max()
+        # Adding zero to collapse -0 and +0, and canonicalizing all NaNs.
+        bits = (present.astype(numpy.float64) + 0.0)
+        bits[numpy.isnan(bits)] = numpy.nan
+        hashes = _mix64(bits.view(numpy.uint64))
+    else:
+        output["min"] = present.min()
+        output["max"] = present.max()
+        hashes = _mix64(present.astype(numpy.int64).view(numpy.uint64))
+
+    output["distinct"] = estimate_distinct(hashes)
+    return output
+
+
+def _string_statistics(x: list) -> dict:
+    present = [y for y in x if y is not None]
+    output = { "null_count": len(x) - len(present), "min": None, "max": None, "distinct": 0 }
+    if len(present) == 0:
+        return output
+    output["min"] = min(present)
+    output["max"] = max(present)
+    hashes = numpy.array([hash(y) for y in present], dtype=numpy.int64).view(numpy.uint64)
+    output["distinct"] = estimate_distinct(_mix64(hashes))
+    return output
+
+
+def list_to_masked(x: list, dtype: Any):
+    mask = numpy.array([y is None or numpy.ma.is_masked(y) for y in x], dtype=numpy.bool_)
+    values = numpy.zeros(len(x), dtype=dtype)
+    for i, y in enumerate(x):
+        if not mask[i]:
+            values[i] = y
+    return values, mask
+
+
+@singledispatch
+def compute_statistics(x: Any) -> Optional[dict]:
+    """Compute statistics for a vector-like object, returning a dictionary
+    with the number of missing values, the minimum and maximum (ignoring
+    missing values and NaNs) and an estimate of the number of distinct values.
+    None is returned for unsupported types."""
+    return None
+
+
+@compute_statistics.register
+def _compute_statistics_list(x: list) -> Optional[dict]:
+    all_types = set()
+    for y in x:
+        if y is None or numpy.ma.is_masked(y):
+            continue
+        if isinstance(y, (bool, numpy.bool_)):
+            all_types.add(bool)
+        elif isinstance(y, (int, numpy.integer)):
+            all_types.add(int)
+        elif isinstance(y, (float, numpy.floating)):
+            all_types.add(float)
+        else:
+            all_types.add(type(y))
+
+    if all_types == set([str]):
+        return _string_statistics(x)
+    if all_types == set([bool]):
+        return _numeric_statistics(*list_to_masked(x, numpy.int8))
+    if all_types == set([int]):
+        return _numeric_statistics(*list_to_masked(x, numpy.int64))
+    if all_types == set([float]) or all_types == set([int, float]):
+        return _numeric_statistics(*list_to_masked(x, numpy.float64))
+    if len(all_types) == 0:
+        return { "null_count": len(x), "min": None, "max": None, "distinct": 0 }
+    return None
+
+
+@compute_statistics.register
+def _compute_statistics_StringList(x: StringList) -> Optional[dict]:
+    return _string_statistics(x.as_list())
+
+
+@compute_statistics.register
+def _compute_statistics_CompactStringVector(x: CompactStringVector) -> Optional[dict]:
+    return _string_statistics(x.as_list())
+
+
+@compute_statistics.register
+def _compute_statistics_IntegerList(x: IntegerList) -> Optional[dict]:
+    return _numeric_statistics(*list_to_masked(x.as_list(), numpy.int64))
+
+
+@compute_statistics.register
+def _compute_statistics_FloatList(x: FloatList) -> Optional[dict]:
+    return _numeric_statistics(*list_to_masked(x.as_list(), numpy.float64))
+
+
+@compute_statistics.register
+def _compute_statistics_BooleanList(x: BooleanList) -> Optional[dict]:
+    return _numeric_statistics(*list_to_masked(x.as_list(), numpy.int8))
+
+
+@compute_statistics.register
+def _compute_statistics_ndarray(x: numpy.ndarray) -> Optional[dict]:
+    if len(x.shape) != 1:
+        return None
+    mask = numpy.ma.getmaskarray(x)
+    values = numpy.ma.getdata(x)
+    if numpy.issubdtype(values.dtype, numpy.str_):
+        return _string_statistics([None if m else str(y) for y, m in zip(values, mask)])
+    if numpy.issubdtype(values.dtype, numpy.bytes_):
+        return _string_statistics([None if m else y.decode("UTF-8") for y, m in zip(values.tolist(), mask)])
+    if values.dtype == numpy.bool_:
+        return _numeric_statistics(values.astype(numpy.int8), mask)
+    if numpy.issubdtype(values.dtype, numpy.integer) or numpy.issubdtype(values.dtype, numpy.floating):
+        return _numeric_statistics(values, mask)
+    return None
+
+
+@compute_statistics.register
+def _compute_statistics_Factor(x: Factor) -> Optional[dict]:
+    codes = numpy.asarray(x.get_codes())
+    present = codes[codes >= 0]
+    return {
+        "null_count": int(len(codes) - len(present)),
+        "min": None,
+        "max": None,
+        "distinct": int((numpy.bincount(present, minlength=len(x.get_levels())) > 0).sum()) if len(present) else 0,
+    }
+
+
+def save_statistics(handle, stats: Optional[dict]):
+    """Save statistics from :py:func:`~compute_statistics` as attributes of
+    ``handle``, which may be a HDF5 dataset or group."""
+    if stats is None:
+        return
+    handle.attrs.create(ATTR_NULL_COUNT, data=stats["null_count"], dtype="u8")
+    handle.attrs.create(ATTR_DISTINCT, data=stats["distinct"], dtype="u8")
+    if stats["min"] is not None:
+        handle.attrs[ATTR_MIN] = stats["min"]
+        handle.attrs[ATTR_MAX] = stats["max"]
+
+
+def load_statistics(handle: h5py.HLObject, boolean: bool = False) -> dict:
+    """Load statistics from the attributes of ``handle``. Statistics that are
+    not available are reported as None."""
+    output = { "null_count": None, "min": None, "max": None, "distinct": None }
+    if ATTR_NULL_COUNT in handle.attrs:
+        output["null_count"] = int(handle.attrs[ATTR_NULL_COUNT])
+    if ATTR_DISTINCT in handle.attrs:
+        output["distinct"] = int(handle.attrs[ATTR_DISTINCT])
+    for key, name in [("min", ATTR_MIN), ("max", ATTR_MAX)]:
+        if name not in handle.attrs:
+            continue
+        val = handle.attrs[name]
+        if isinstance(val, (bytes, numpy.bytes_, str)):
+            val = strings.load_scalar_string_attribute_from_hdf5(handle, name)
+        elif boolean:
+            val = bool(val)
+        else:
+            val = val.item()
+        output[key] = val
+    return output
+
+
+def storage_size(handle: h5py.HLObject) -> int:
+    """Number of bytes used to store a HDF5 dataset or all datasets in a group."""
+    if isinstance(handle, h5py.Dataset):
+        return int(handle.id.get_storage_size())
+    return sum(storage_size(child) for child in handle.values())
+
+
+def directory_size(path: str) -> int:
+    """Total size of all files in a directory."""
+    total = 0
+    for root, dirs, files in os.walk(path):
+        for f in files:
+            total += os.path.getsize(os.path.join(root, f))
+    return total
@@ -1,12 +1,14 @@
-from typing import Optional, Tuple, List, Sequence
+from typing import Optional, Tuple, List, Sequence, Union
 import h5py
 import numpy
 import biocutils
 
 from . import choose_missing_placeholder as ch
+from . import _utils_misc as misc
+from .compact_string_vector import CompactStringVector
 
 
-def save_fixed_length_strings(handle: h5py.Group, name: str, x: List[str]) -> h5py.Dataset:
+def save_fixed_length_strings(handle: h5py.Group, name: str, x: List[str], contiguous: bool = False) -> h5py.Dataset:
     """Save a list of strings into a fixed-length string dataset.
 
     Args:
@@ -19,6 +21,9 @@ def save_fixed_length_strings(handle: h5py.Group, name: str, x: List[str]) -> h5
         x: 
             List of strings to save.
 
+        contiguous:
+            Whether to use an uncompressed contiguous layout.
+
     Returns:
         ``x`` is saved into the group as a fixed-length string dataset,
         and a NumPy dataset handle is returned.
@@ -28,11 +33,17 @@ def save_fixed_length_strings(handle: h5py.Group, name: str, x: List[str]) -> h5
     for b in tmp:
         if len(b) > maxed:
             maxed = len(b)
-    return handle.create_dataset(name, data=tmp, dtype="S" + str(maxed), compression="gzip", chunks=True)
+    return handle.create_dataset(name, data=tmp, dtype="S" + str(maxed), **misc.dataset_layout(contiguous))
 
 
-def load_string_vector_from_hdf5(handle: h5py.Dataset) -> List[str]:
-    output = handle[:]
+def load_string_vector_from_hdf5(
+    handle: h5py.Dataset,
+    rows: Optional[Union[slice, Sequence[int]]] = None,
+    compact: bool = False
+) -> Union[List[str], CompactStringVector]:
+    output = misc.read_dataset(handle, rows)
+    if compact and output.dtype.kind == "S":
+        return CompactStringVector.from_fixed_length(output)
 
     if len(output):
         _output = []
@@ -40,6 +51,8 @@ def load_string_vector_from_hdf5(handle: h5py.Dataset) -> List[str]:
             _out = x.decode("UTF-8") if isinstance(x, (bytes, numpy.bytes_)) else x
             _output.append(_out)
         output = _output
+    if compact:
+        return CompactStringVector.from_list(output)
     return output
 
 
@@ -72,7 +85,13 @@ def encode_strings(x: Sequence, placeholder: Optional[str]) -> list:
     return x_encoded
 
 
-def collect_stats(x_encoded: list) -> Tuple:
+def collect_stats(x_encoded: Union[list, numpy.ndarray]) -> Tuple:
+    if isinstance(x_encoded, numpy.ndarray):
+        lengths = numpy.char.str_len(x_encoded)
+        if len(lengths) == 0:
+            return 1, 0
+        return max(1, int(lengths.max())), int(lengths.sum())
+
     maxed = 1
     total = 0
     for b in x_encoded:
@@ -87,7 +106,7 @@ def use_vls(maxed: int, total: int, nstr: int) -> bool:
     return (maxed * nstr > total + nstr * 16)
 
 
-def dump_vls(ghandle: h5py.Group, pointers: str, heap: str, x_encoded: list, placeholder: Optional[str]):
+def dump_vls(ghandle: h5py.Group, pointers: str, heap: str, x_encoded: list, placeholder: Optional[str], contiguous: bool = False):
     dtype = numpy.dtype([('offset', 'u8'), ('length', 'u8')])
 
     nstr = len(x_encoded)
@@ -98,7 +117,7 @@ def dump_vls(ghandle: h5py.Group, pointers: str, heap: str, x_encoded: list, pla
         x_pointers[i] = (cumulative, bn)
         cumulative += bn
 
-    phandle = ghandle.create_dataset(pointers, data=x_pointers, dtype=dtype, compression="gzip", chunks=True)
+    phandle = ghandle.create_dataset(pointers, data=x_pointers, dtype=dtype, **misc.dataset_layout(contiguous))
     if placeholder is not None:
         phandle.attrs["missing-value-placeholder"] = placeholder
 
@@ -108,22 +127,67 @@ def dump_vls(ghandle: h5py.Group, pointers: str, heap: str, x_encoded: list, pla
         start = cumulative
         cumulative += len(b)
         x_heap[start:cumulative] = list(b)
-    ghandle.create_dataset(heap, data=x_heap, dtype='u1', compression="gzip", chunks=True)
-
-
-def read_vls(ghandle: h5py.Group, pointers: str, heap: str, as_numpy: bool):
+    ghandle.create_dataset(heap, data=x_heap, dtype='u1', **misc.dataset_layout(contiguous))
+
+
+def placeholder_mask(x: CompactStringVector, placeholder: str) -> numpy.ndarray:
+    target = numpy.frombuffer(placeholder.encode("UTF-8"), dtype=numpy.uint8)
+    offsets = x.get_offsets()
+    starts = offsets[:-1]
+    mask = (offsets[1:] - starts) == len(target)
+    candidates = numpy.nonzero(mask)[0]
+    if len(candidates) and len(target):
+        contents = x.get_buffer()[starts[candidates, None] + numpy.arange(len(target))]
+        mask[candidates] = (contents == target).all(axis=1)
+    return mask
+
+
+class UnmaskedStrings:
+    # Membership tests on the unmasked entries of an encoded string array or a
+    # CompactStringVector, so that choose_missing_string_placeholder() can be
+    # used without decoding each string into a Python object.
+    def __init__(self, x: Union[numpy.ndarray, CompactStringVector], mask: Optional[numpy.ndarray]):
+        self._x = x
+        self._mask = mask
+
+    def __contains__(self, value: str) -> bool:
+        if isinstance(self._x, CompactStringVector):
+            found = placeholder_mask(self._x, value)
+        else:
+            found = self._x == value.encode("UTF-8")
+        if self._mask is not None:
+            found = found & ~self._mask
+        return bool(found.any())
+
+
+def read_vls(
+    ghandle: h5py.Group,
+    pointers: str,
+    heap: str,
+    as_numpy: bool,
+    rows: Optional[Union[slice, Sequence[int]]] = None,
+    compact: bool = False
+):
     pset = ghandle[pointers]
     placeholder = None 
     if "missing-value-placeholder" in pset.attrs:
         placeholder = load_scalar_string_attribute_from_hdf5(pset, "missing-value-placeholder")
 
-    heap = ghandle[heap]
-    all_pointers = pset[:]
-    all_heap = heap[:]
+    all_pointers = misc.read_dataset(pset, rows)
+    starts = all_pointers["offset"].astype(numpy.int64)
+    lengths = all_pointers["length"].astype(numpy.int64)
+    all_heap, starts = _read_vls_heap(ghandle[heap], starts, lengths, subset=(rows is not None))
+
+    if compact:
+        output = CompactStringVector.from_heap(all_heap, starts, lengths)
+        if placeholder is not None:
+            output = CompactStringVector(output.get_buffer(), output.get_offsets(), mask=placeholder_mask(output, placeholder))
+        return output
+
+    all_bytes = all_heap.tobytes()
     output = [None] * len(all_pointers)
-    for i, payload in enumerate(all_pointers):
-        start, length = payload
-        output[i] = bytes(all_heap[start:start + length]).decode("UTF-8")
+    for i, (start, length) in enumerate(zip(starts.tolist(), lengths.tolist())):
+        output[i] = all_bytes[start:start + length].decode("UTF-8")
 
     if as_numpy:
         output = numpy.array(output)
@@ -138,3 +202,39 @@ def read_vls(ghandle: h5py.Group, pointers: str, heap: str, as_numpy: bool):
         output = biocutils.StringList(output)
 
     return output
+
+
+def _read_vls_heap(heap: h5py.Dataset, starts: numpy.ndarray, lengths: numpy.ndarray, subset: bool) -> Tuple[numpy.ndarray, numpy.ndarray]:
+    if not subset:
+        return heap[:], starts
+    if len(starts) == 0:
+        return numpy.zeros(0, dtype=numpy.uint8), starts
+
+    # Only reading the parts of the heap that are covered by the selected
+    # pointers. Nearby ranges are merged if they lie within the same chunk,
+    # as HDF5 would need to decompress the entire chunk anyway. The ranges
+    # are then concatenated into a smaller heap with adjusted start positions.
+    ends = starts + lengths
+    order = numpy.argsort(starts, kind="stable")
+    gap = heap.chunks[0] if heap.chunks is not None else 0
+
+    blocks = []
+    new_starts = numpy.empty(len(starts), dtype=numpy.int64)
+    consumed = 0
+    i = 0
+    nptrs = len(order)
+    while i < nptrs:
+        block_start = int(starts[order[i]])
+        block_end = int(ends[order[i]])
+        j = i + 1
+        while j < nptrs and int(starts[order[j]]) <= block_end + gap:
+            block_end = max(block_end, int(ends[order[j]]))
+            j += 1
+
+        blocks.append(heap[block_start:block_end])
+        current = order[i:j]
+        new_starts[current] = starts[current] - block_start + consumed
+        consumed += block_end - block_start
+        i = j
+
+    return numpy.concatenate(blocks), new_starts
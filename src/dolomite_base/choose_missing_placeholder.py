@@ -72,10 +72,14 @@ def choose_missing_float_placeholder(x: Sequence[float], dtype: type = numpy.flo
         dtype = x.dtype.type
 
     can_nan = True
-    for y in x:
-        if y is not None and not numpy.ma.is_masked(y) and numpy.isnan(y):
-            can_nan = False
-            break
+    if isinstance(x, numpy.ndarray):
+        present = numpy.ma.compressed(x) if isinstance(x, numpy.ma.MaskedArray) else x
+        can_nan = not numpy.isnan(present).any()
+    else:
+        for y in x:
+            if y is not None and not numpy.ma.is_masked(y) and numpy.isnan(y):
+                can_nan = False
+                break
     if can_nan:
         return dtype(numpy.nan)
 
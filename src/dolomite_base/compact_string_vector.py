@@ -0,0 +1,242 @@
+from typing import Iterator, List, Optional, Sequence, Union
+import numpy
+
+
+class CompactStringVector:
+    """
+    Vector of UTF-8 strings that is backed by a single byte buffer and an
+    array of offsets, i.e., the same layout as Arrow's ``large_string`` type.
+    This avoids the overhead of creating a Python ``str`` for each element,
+    which is substantial for long vectors of short strings. Individual
+    strings are only decoded when they are accessed.
+    """
+
+    def __init__(self, buffer: numpy.ndarray, offsets: numpy.ndarray, mask: Optional[numpy.ndarray] = None):
+        """
+        Args:
+            buffer:
+                1-dimensional array of unsigned 8-bit integers containing the
+                concatenated UTF-8 bytes of all strings.
+
+            offsets:
+                1-dimensional array of 64-bit integers of length equal to the
+                number of strings plus 1. The bytes for string ``i`` are
+                located at ``buffer[offsets[i]:offsets[i+1]]``.
+
+            mask:
+                1-dimensional boolean array of length equal to the number of
+                strings, indicating whether each string is missing. If None,
+                no strings are missing.
+        """
+        self._buffer = numpy.asarray(buffer, dtype=numpy.uint8)
+        self._offsets = numpy.asarray(offsets, dtype=numpy.int64)
+        if len(self._offsets) == 0 or self._offsets[0] != 0 or self._offsets[-1] != len(self._buffer):
+            raise ValueError("'offsets' should start at zero and end at the length of 'buffer'")
+        if mask is not None:
+            mask = numpy.asarray(mask, dtype=numpy.bool_)
+            if mask.shape != (len(self._offsets) - 1,):
+                raise ValueError("'mask' should have length equal to the number of strings")
+            if not mask.any():
+                mask = None
+        self._mask = mask
+
+    @classmethod
+    def from_fixed_length(cls, x: numpy.ndarray, mask: Optional[numpy.ndarray] = None) -> "CompactStringVector":
+        """
+        Create a compact string vector from a NumPy array of fixed-length
+        byte strings, without creating any per-string Python objects.
+
+        Args:
+            x:
+                1-dimensional NumPy array of ``S`` dtype. Trailing null bytes
+                in each element are ignored.
+
+            mask:
+                Boolean array specifying which strings are missing.
+
+        Returns:
+            A ``CompactStringVector`` containing the contents of ``x``.
+        """
+        x = numpy.ascontiguousarray(x)
+        width = x.dtype.itemsize
+        lengths = numpy.char.str_len(x).astype(numpy.int64) if len(x) else numpy.zeros(0, dtype=numpy.int64)
+        offsets = numpy.zeros(len(x) + 1, dtype=numpy.int64)
+        numpy.cumsum(lengths, out=offsets[1:])
+        if width == 0:
+            return cls(numpy.zeros(0, dtype=numpy.uint8), offsets, mask=mask)
+        raw = x.view(numpy.uint8).reshape(len(x), width)
+        keep = numpy.arange(width) < lengths[:, None]
+        return cls(raw[keep], offsets, mask=mask)
+
+    @classmethod
+    def from_heap(
+        cls,
+        heap: numpy.ndarray,
+        starts: numpy.ndarray,
+        lengths: numpy.ndarray,
+        mask: Optional[numpy.ndarray] = None
+    ) -> "CompactStringVector":
+        """
+        Create a compact string vector from a heap of bytes and the start
+        position and length of each string in the heap. This is typically used
+        to convert the pointers and heap of a VLS array.
+
+        Args:
+            heap:
+                1-dimensional array of unsigned 8-bit integers.
+
+            starts:
+                Start position of each string in ``heap``.
+
+            lengths:
+                Length of each string in bytes.
+
+            mask:
+                Boolean array specifying which strings are missing.
+
+        Returns:
+            A ``CompactStringVector`` containing the specified strings.
+        """
+        heap = numpy.asarray(heap, dtype=numpy.uint8)
+        starts = numpy.asarray(starts, dtype=numpy.int64)
+        lengths = numpy.asarray(lengths, dtype=numpy.int64)
+        offsets = numpy.zeros(len(starts) + 1, dtype=numpy.int64)
+        numpy.cumsum(lengths, out=offsets[1:])
+
+        # If the strings are already packed in order, we can use the heap
+        # directly without copying anything.
+        if len(starts) and (starts == offsets[:-1] + starts[0]).all():
+            return cls(heap[starts[0]:starts[0] + offsets[-1]], offsets, mask=mask)
+        return cls(heap[_gather_indices(starts, lengths, offsets)], offsets, mask=mask)
+
+    @classmethod
+    def from_list(cls, x: Sequence[Optional[str]]) -> "CompactStringVector":
+        """
+        Create a compact string vector from a sequence of strings.
+
+        Args:
+            x: Sequence of strings or None.
+
+        Returns:
+            A ``CompactStringVector`` containing the contents of ``x``.
+        """
+        encoded = []
+        mask = numpy.zeros(len(x), dtype=numpy.bool_)
+        for i, y in enumerate(x):
+            if y is None:
+                mask[i] = True
+                encoded.append(b"")
+            else:
+                encoded.append(y.encode("UTF-8"))
+        offsets = numpy.zeros(len(x) + 1, dtype=numpy.int64)
+        numpy.cumsum([len(y) for y in encoded], out=offsets[1:])
+        buffer = numpy.frombuffer(b"".join(encoded), dtype=numpy.uint8)
+        return cls(buffer, offsets, mask=mask)
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __repr__(self) -> str:
+        preview = [repr(self[i]) for i in range(min(len(self), 5))]
+        if len(self) > 5:
+            preview.append("...")
+        return "CompactStringVector(length=" + str(len(self)) + ", [" + ", ".join(preview) + "])"
+
+    def __iter__(self) -> Iterator[Optional[str]]:
+        for i in range(len(self)):
+            yield self._get_single(i)
+
+    def __getitem__(self, index: Union[int, slice, Sequence[int]]) -> Union[Optional[str], "CompactStringVector"]:
+        """
+        Args:
+            index:
+                Integer index of a single string, or a slice, sequence of
+                integers or boolean mask specifying a subset of strings.
+
+        Returns:
+            The string at ``index`` (or None, if missing) for an integer
+            ``index``. Otherwise, a new ``CompactStringVector`` containing
+            the specified subset.
+        """
+        if isinstance(index, (int, numpy.integer)):
+            n = len(self)
+            if index < 0:
+                index += n
+            if index < 0 or index >= n:
+                raise IndexError("index out of range for a CompactStringVector of length " + str(n))
+            return self._get_single(int(index))
+
+        positions = numpy.arange(len(self))[index]
+        starts = self._offsets[positions]
+        lengths = self._offsets[positions + 1] - starts
+        mask = self._mask[positions] if self._mask is not None else None
+        return CompactStringVector.from_heap(self._buffer, starts, lengths, mask=mask)
+
+    def _get_single(self, i: int) -> Optional[str]:
+        if self._mask is not None and self._mask[i]:
+            return None
+        return self._buffer[self._offsets[i]:self._offsets[i + 1]].tobytes().decode("UTF-8")
+
+    def get_buffer(self) -> numpy.ndarray:
+        """
+        Returns:
+            Array of unsigned 8-bit integers containing the concatenated UTF-8
+            bytes of all strings. Missing strings have zero length.
+        """
+        return self._buffer
+
+    def get_offsets(self) -> numpy.ndarray:
+        """
+        Returns:
+            Array of 64-bit integers of length equal to the number of strings
+            plus 1, containing the offsets of each string in the buffer. This
+            can be used directly as the offsets of an Arrow ``large_string``.
+        """
+        return self._offsets
+
+    def get_mask(self) -> Optional[numpy.ndarray]:
+        """
+        Returns:
+            Boolean array specifying which strings are missing, or None if no
+            strings are missing.
+        """
+        return self._mask
+
+    def as_list(self) -> List[Optional[str]]:
+        """
+        Returns:
+            List of strings, where missing values are represented as None.
+        """
+        return list(self)
+
+    def to_arrow(self):
+        """
+        Returns:
+            A ``pyarrow.LargeStringArray`` that shares the buffer and offsets
+            of this object. This requires the **pyarrow** package.
+        """
+        try:
+            import pyarrow
+        except ImportError:
+            raise ModuleNotFoundError("'pyarrow' is required to convert a CompactStringVector to an Arrow array")
+
+        validity = None
+        null_count = 0
+        if self._mask is not None:
+            validity = pyarrow.py_buffer(numpy.packbits(~self._mask, bitorder="little"))
+            null_count = int(self._mask.sum())
+
+        return pyarrow.LargeStringArray.from_buffers(
+            len(self),
+            pyarrow.py_buffer(self._offsets),
+            pyarrow.py_buffer(self._buffer),
+            validity,
+            null_count
+        )
+
+
+def _gather_indices(starts: numpy.ndarray, lengths: numpy.ndarray, offsets: numpy.ndarray) -> numpy.ndarray:
+    # Vectorized expansion of (start, length) ranges into per-byte indices.
+    total = int(offsets[-1])
+    shift = numpy.repeat(starts - offsets[:-1], lengths)
+    return numpy.arange(total, dtype=numpy.int64) + shift
@@ -0,0 +1,699 @@
+from typing import Any, List, Optional, Sequence, Tuple
+from functools import singledispatch
+import os
+from biocframe import BiocFrame
+from biocutils import Factor, StringList, IntegerList, BooleanList, FloatList
+import numpy
+import h5py
+
+from .save_object_file import save_object_file
+from .alt_save_object import alt_save_object
+from . import _utils_string as strings
+from . import _utils_misc as misc
+from . import _utils_stats as stats
+from . import choose_missing_placeholder as ch
+from .compact_string_vector import CompactStringVector
+from .save_data_frame import _data_frame_version, _infer_list_type
+
+
+class DataFrameWriter:
+    """
+    Write a :py:class:`~biocframe.BiocFrame.BiocFrame` to disk in batches of
+    rows, for data frames that are too large to be held in memory at once.
+    The output is the same as that of
+    :py:func:`~dolomite_base.save_data_frame.save_data_frame` and can be read
+    with :py:func:`~dolomite_base.read_object.read_object`.
+
+    The schema is fixed by the first batch. Each subsequent batch must have
+    the same column names, and each column must have the same type as in the
+    first batch, with the exception that integers can be appended to a
+    floating-point column. Only basic columns are supported, i.e., integer,
+    floating-point, boolean and string vectors (as lists, typed lists, 1D
+    NumPy arrays or
+    :py:class:`~dolomite_base.compact_string_vector.CompactStringVector`
+    objects) and :py:class:`~biocutils.Factor.Factor` objects.
+
+    Each column is stored in a resizable chunked dataset that is extended
+    with each batch. String columns are always saved in the custom VLS
+    layout, as the width of a fixed-length string dataset cannot be changed
+    once created. As in
+    :py:func:`~dolomite_base.save_data_frame.save_data_frame`, integer
+    columns are promoted to floating-point if any value does not fit in a
+    32-bit integer. Missing value placeholders are chosen for each column and
+    are replaced, along with the missing values that were already written, if
+    a later batch contains the placeholder. The levels of factor columns are
+    accumulated across batches. Row names, if present in the first batch, must be present in
+    all batches; they are staged in a temporary file and saved as a
+    fixed-length string dataset when the writer is closed. The column
+    annotations and metadata are taken from the first batch.
+
+    Typical usage is:
+
+    .. code-block:: python
+
+        with DataFrameWriter(path) as writer:
+            for batch in batches:
+                writer.append(batch)
+    """
+
+    def __init__(self, path: str, chunk_size: int = 65536, **kwargs):
+        """
+        Args:
+            path:
+                Path to a directory in which to save the data frame. This
+                should not already exist.
+
+            chunk_size:
+                Number of elements in each chunk of the resizable datasets.
+
+            kwargs:
+                Further arguments, passed to internal
+                :py:func:`~dolomite_base.alt_save_object.alt_save_object` calls
+                when saving the column annotations and metadata.
+        """
+        os.mkdir(path)
+        self._path = path
+        self._chunk_size = chunk_size
+        self._kwargs = kwargs
+
+        self._handle = h5py.File(os.path.join(path, "basic_columns.h5"), "w")
+        self._ghandle = self._handle.create_group("data_frame")
+        self._dhandle = self._ghandle.create_group("data")
+
+        self._num_rows = 0
+        self._column_names = None
+        self._columns = None
+        self._row_names = None
+        self._row_names_handle = None
+        self._row_names_width = 1
+        self._column_data = None
+        self._metadata = None
+        self._closed = False
+
+    def append(self, x: BiocFrame):
+        """
+        Append a batch of rows to the data frame.
+
+        Args:
+            x:
+                Data frame containing the next batch of rows. The first call
+                to this method determines the schema of the output.
+        """
+        if self._closed:
+            raise ValueError("cannot append to a closed DataFrameWriter")
+
+        if self._columns is None:
+            self._initialize(x)
+        elif list(x.get_column_names()) != self._column_names:
+            raise ValueError("column names of each batch should be the same as those of the first batch")
+
+        rn = x.get_row_names()
+        if (rn is None) != (self._row_names is None):
+            raise ValueError("either all or none of the batches should have row names")
+
+        # Converting everything before writing anything, so that a failure
+        # in any column does not leave the datasets with different lengths.
+        prepared = []
+        for i, col in enumerate(self._columns):
+            try:
+                prepared.append(col.prepare(x.get_column(i)))
+            except Exception as e:
+                raise ValueError("failed to append column " + str(i) + " ('" + self._column_names[i] + "'); " + str(e))
+
+        for col, p in zip(self._columns, prepared):
+            col.write(p)
+        if rn is not None:
+            encoded = [y.encode("UTF-8") for y in rn]
+            for y in encoded:
+                if len(y) > self._row_names_width:
+                    self._row_names_width = len(y)
+            _append_to_dataset(self._row_names, numpy.array(encoded, dtype=object))
+        self._num_rows += x.shape[0]
+
+    def _initialize(self, x: BiocFrame):
+        self._column_names = list(x.get_column_names())
+        self._columns = []
+        for i in range(x.shape[1]):
+            kind = _classify_column(x.get_column(i))
+            if kind is None:
+                raise ValueError("cannot determine the type of column " + str(i) + " ('" + self._column_names[i] + "') from the first batch")
+            self._columns.append(_column_streams[kind](self._dhandle, str(i), self._chunk_size, x.get_column(i)))
+
+        if x.get_row_names() is not None:
+            # The width of a fixed-length string dataset is not known until
+            # all batches are seen, so row names are staged in a separate file.
+            self._row_names_handle = h5py.File(os.path.join(self._path, "row_names.tmp.h5"), "w")
+            self._row_names = _create_resizable_dataset(self._row_names_handle, "row_names", h5py.string_dtype(), self._chunk_size)
+
+        self._column_data = x.get_column_data(with_names=False)
+        self._metadata = x.get_metadata()
+
+    def close(self):
+        """
+        Finish writing the data frame. This saves the number of rows, the
+        column names, any column annotations and metadata, and the
+        ``OBJECT`` file. No more batches can be appended after this method
+        is called.
+        """
+        if self._closed:
+            return
+
+        try:
+            self._ghandle.attrs.create("row-count", data=self._num_rows, dtype="u8")
+            uses_vls = False
+            if self._columns is not None:
+                for col in self._columns:
+                    col.finish()
+                    if isinstance(col, _StringColumnStream):
+                        uses_vls = True
+            version = _data_frame_version(uses_vls)
+            self._ghandle.attrs.create("version", data=version)
+
+            names = self._column_names if self._column_names is not None else []
+            strings.save_fixed_length_strings(self._ghandle, "column_names", names)
+            if self._row_names is not None:
+                self._finish_row_names()
+        finally:
+            self._handle.close()
+            self._discard_row_names()
+            self._closed = True
+
+        kwargs = self._kwargs
+        md = self._metadata
+        if md is not None and len(md):
+            alt_save_object(md, os.path.join(self._path, "other_annotations"), **kwargs)
+
+        cd = self._column_data
+        if cd is not None and cd.shape[1] > 0:
+            if cd.get_row_names() is not None:
+                cd = cd.set_row_names(None)
+            alt_save_object(cd, os.path.join(self._path, "column_annotations"), **kwargs)
+
+        save_object_file(self._path, "data_frame", { "data_frame": { "version": version } })
+
+    def _finish_row_names(self):
+        # Same layout as save_fixed_length_strings(), filled one chunk at a time.
+        staged = self._row_names
+        nrows = staged.shape[0]
+        dtype = "S" + str(self._row_names_width)
+        dset = self._ghandle.create_dataset("row_names", shape=(nrows,), dtype=dtype, **misc.dataset_layout(False))
+        for start in range(0, nrows, self._chunk_size):
+            end = min(nrows, start + self._chunk_size)
+            dset[start:end] = numpy.array(staged[start:end], dtype=dtype)
+
+    def _discard_row_names(self):
+        if self._row_names_handle is not None:
+            self._row_names_handle.close()
+            os.remove(os.path.join(self._path, "row_names.tmp.h5"))
+            self._row_names_handle = None
+            self._row_names = None
+
+    def __enter__(self) -> "DataFrameWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        elif not self._closed:
+            # Leaving the directory incomplete (i.e., without an OBJECT file)
+            # so that it is not mistaken for a valid data frame.
+            self._handle.close()
+            self._discard_row_names()
+            self._closed = True
+
+
+########################################################
+
+
+def _create_resizable_dataset(handle: h5py.Group, name: str, dtype: Any, chunk_size: int) -> h5py.Dataset:
+    return handle.create_dataset(
+        name,
+        shape=(0,),
+        maxshape=(None,),
+        dtype=dtype,
+        chunks=(chunk_size,),
+        compression="gzip"
+    )
+
+
+def _append_to_dataset(dset: h5py.Dataset, values: numpy.ndarray):
+    n = len(values)
+    if n == 0:
+        return
+    start = dset.shape[0]
+    dset.resize((start + n,))
+    dset[start:start + n] = values
+
+
+def _to_values_and_mask(x: Sequence, dtype: Any) -> Tuple[numpy.ndarray, numpy.ndarray]:
+    if isinstance(x, numpy.ndarray):
+        return numpy.ma.getdata(x).astype(dtype, copy=False), numpy.ma.getmaskarray(x)
+
+    if isinstance(x, (IntegerList, FloatList, BooleanList)):
+        x = x.as_list()
+    return stats.list_to_masked(x, dtype)
+
+
+def _matches_placeholder(values: numpy.ndarray, placeholder: numpy.generic) -> numpy.ndarray:
+    if numpy.isnan(placeholder):
+        return numpy.isnan(values)
+    return values == placeholder
+
+
+def _read_present_values(dset: h5py.Dataset, chunk_size: int, placeholder: Optional[numpy.generic]) -> numpy.ndarray:
+    # Reading all non-missing values that were already written, one chunk at
+    # a time. This is only used as a last resort when choosing a placeholder.
+    total = dset.shape[0]
+    blocks = [numpy.zeros(0, dtype=dset.dtype)]
+    for start in range(0, total, chunk_size):
+        block = dset[start:min(total, start + chunk_size)]
+        if placeholder is not None:
+            block = block[~_matches_placeholder(block, placeholder)]
+        blocks.append(block)
+    return numpy.concatenate(blocks)
+
+
+def _replace_placeholder_in_dataset(dset: h5py.Dataset, chunk_size: int, old: numpy.generic, new: numpy.generic):
+    total = dset.shape[0]
+    for start in range(0, total, chunk_size):
+        end = min(total, start + chunk_size)
+        block = dset[start:end]
+        replace = _matches_placeholder(block, old)
+        if replace.any():
+            block[replace] = new
+            dset[start:end] = block
+
+
+class _IntegerColumnStream:
+    # The placeholder is chosen when the first missing value is seen. If a
+    # later batch contains the placeholder, a new one is chosen and the missing
+    # values that were already written are updated. As in save_data_frame(),
+    # the column is promoted to floating-point if any value does not fit in a
+    # 32-bit integer or if no placeholder is available.
+    def __init__(self, handle: h5py.Group, name: str, chunk_size: int, first: Any):
+        self._handle = handle
+        self._name = name
+        self._chunk_size = chunk_size
+        self._dset = _create_resizable_dataset(handle, name, "i4", chunk_size)
+        self._dset.attrs["type"] = "integer"
+        self._placeholder = None
+        self._min = None
+        self._max = None
+        self._promoted = None
+
+    def prepare(self, x: Any) -> Tuple[numpy.ndarray, numpy.ndarray]:
+        kind = _classify_column(x)
+        if kind not in (None, "integer"):
+            raise TypeError("expected an integer column, got '" + kind + "'")
+        try:
+            return _to_values_and_mask(x, numpy.int64)
+        except OverflowError:
+            return _to_values_and_mask(x, numpy.float64)
+
+    def write(self, prepared: Tuple[numpy.ndarray, numpy.ndarray]):
+        if self._promoted is None:
+            values, mask = prepared
+            present = values[~mask]
+            limits = numpy.iinfo(numpy.int32)
+            if numpy.issubdtype(values.dtype, numpy.floating) or (len(present) and (present.min() < limits.min or present.max() > limits.max)):
+                self._promote()
+            elif self._write_integers(values, mask, present):
+                return
+            else:
+                self._promote()
+        values, mask = prepared
+        self._promoted.write((values.astype(numpy.float64), mask))
+
+    def _write_integers(self, values: numpy.ndarray, mask: numpy.ndarray, present: numpy.ndarray) -> bool:
+        if len(present):
+            lo = int(present.min())
+            hi = int(present.max())
+            self._min = lo if self._min is None else min(self._min, lo)
+            self._max = hi if self._max is None else max(self._max, hi)
+
+        if self._placeholder is not None and (present == self._placeholder).any():
+            replacement = self._choose_placeholder(present)
+            if replacement is None:
+                return False
+            _replace_placeholder_in_dataset(self._dset, self._chunk_size, self._placeholder, replacement)
+            self._placeholder = replacement
+        elif self._placeholder is None and mask.any():
+            self._placeholder = self._choose_placeholder(present)
+            if self._placeholder is None:
+                return False
+
+        values = values.astype(numpy.int32)
+        if self._placeholder is not None:
+            values[mask] = self._placeholder
+        _append_to_dataset(self._dset, values)
+        return True
+
+    def _choose_placeholder(self, present: numpy.ndarray) -> Optional[numpy.generic]:
+        limits = numpy.iinfo(numpy.int32)
+        if self._min is None or self._min > limits.min:
+            return numpy.int32(limits.min)
+        if self._max < limits.max:
+            return numpy.int32(limits.max)
+        written = _read_present_values(self._dset, self._chunk_size, self._placeholder)
+        observed = set(written.tolist())
+        observed.update(present.tolist())
+        return ch.choose_missing_integer_placeholder(observed)
+
+    def _promote(self):
+        # Copying the existing values into a floating-point dataset, where
+        # missing values are represented by NaNs.
+        staging = self._name + "_promoted"
+        dset = _create_resizable_dataset(self._handle, staging, "f8", self._chunk_size)
+        dset.attrs["type"] = "number"
+        total = self._dset.shape[0]
+        dset.resize((total,))
+        for start in range(0, total, self._chunk_size):
+            end = min(total, start + self._chunk_size)
+            block = self._dset[start:end]
+            converted = block.astype(numpy.float64)
+            if self._placeholder is not None:
+                converted[block == self._placeholder] = numpy.nan
+            dset[start:end] = converted
+
+        del self._handle[self._name]
+        self._handle.move(staging, self._name)
+        self._promoted = _FloatColumnStream.from_dataset(
+            self._handle[self._name],
+            self._chunk_size,
+            None if self._placeholder is None else numpy.float64(numpy.nan)
+        )
+
+    def finish(self):
+        if self._promoted is not None:
+            self._promoted.finish()
+        elif self._placeholder is not None:
+            self._dset.attrs.create("missing-value-placeholder", self._placeholder, dtype="i4")
+
+
+class _FloatColumnStream:
+    # NaN is used as the placeholder unless the column contains NaNs, in which
+    # case another placeholder is chosen. If a later batch contains the
+    # placeholder, a new one is chosen and the missing values that were
+    # already written are updated.
+    def __init__(self, handle: h5py.Group, name: str, chunk_size: int, first: Any):
+        dset = _create_resizable_dataset(handle, name, "f8", chunk_size)
+        dset.attrs["type"] = "number"
+        self._initialize(dset, chunk_size, None)
+
+    @classmethod
+    def from_dataset(cls, dset: h5py.Dataset, chunk_size: int, placeholder: Optional[numpy.generic]) -> "_FloatColumnStream":
+        # Continuing from an existing dataset that does not contain any NaNs,
+        # other than those used as the placeholder.
+        self = cls.__new__(cls)
+        self._initialize(dset, chunk_size, placeholder)
+        return self
+
+    def _initialize(self, dset: h5py.Dataset, chunk_size: int, placeholder: Optional[numpy.generic]):
+        self._dset = dset
+        self._chunk_size = chunk_size
+        self._placeholder = placeholder
+        self._has_nan = False
+
+    def prepare(self, x: Any) -> Tuple[numpy.ndarray, numpy.ndarray]:
+        kind = _classify_column(x)
+        if kind not in (None, "integer", "number"):
+            raise TypeError("expected a floating-point column, got '" + kind + "'")
+        return _to_values_and_mask(x, numpy.float64)
+
+    def write(self, prepared: Tuple[numpy.ndarray, numpy.ndarray]):
+        values, mask = prepared
+        present = values[~mask]
+        self._has_nan = self._has_nan or bool(numpy.isnan(present).any())
+
+        if self._placeholder is not None and _matches_placeholder(present, self._placeholder).any():
+            replacement = self._choose_placeholder(present)
+            _replace_placeholder_in_dataset(self._dset, self._chunk_size, self._placeholder, replacement)
+            self._placeholder = replacement
+        elif self._placeholder is None and mask.any():
+            self._placeholder = self._choose_placeholder(present)
+
+        if self._placeholder is not None:
+            values = values.copy()
+            values[mask] = self._placeholder
+        _append_to_dataset(self._dset, values)
+
+    def _choose_placeholder(self, present: numpy.ndarray) -> numpy.generic:
+        if not self._has_nan:
+            return numpy.float64(numpy.nan)
+        written = _read_present_values(self._dset, self._chunk_size, self._placeholder)
+        placeholder = ch.choose_missing_float_placeholder(numpy.concatenate([written, present]))
+        if placeholder is None:
+            raise ValueError("failed to find a suitable placeholder for missing values")
+        return placeholder
+
+    def finish(self):
+        if self._placeholder is not None:
+            self._dset.attrs.create("missing-value-placeholder", self._placeholder, dtype="f8")
+
+
+class _BooleanColumnStream:
+    placeholder = -1
+
+    def __init__(self, handle: h5py.Group, name: str, chunk_size: int, first: Any):
+        self._dset = _create_resizable_dataset(handle, name, "i1", chunk_size)
+        self._dset.attrs["type"] = "boolean"
+        self._has_missing = False
+
+    def prepare(self, x: Any) -> numpy.ndarray:
+        kind = _classify_column(x)
+        if kind not in (None, "boolean"):
+            raise TypeError("expected a boolean column, got '" + kind + "'")
+
+        values, mask = _to_values_and_mask(x, numpy.int8)
+        self._has_missing = self._has_missing or mask.any()
+        values[mask] = self.placeholder
+        return values
+
+    def write(self, values: numpy.ndarray):
+        _append_to_dataset(self._dset, values)
+
+    def finish(self):
+        if self._has_missing:
+            self._dset.attrs.create("missing-value-placeholder", self.placeholder, dtype="i1")
+
+
+class _StringColumnStream:
+    # Missing values are all represented by a pointer to a single copy of the
+    # placeholder in the heap. If a later batch contains a string equal to the
+    # placeholder, a new placeholder is appended to the heap and the existing
+    # pointers to the old placeholder are updated.
+    pointer_dtype = numpy.dtype([('offset', 'u8'), ('length', 'u8')])
+
+    def __init__(self, handle: h5py.Group, name: str, chunk_size: int, first: Any):
+        ghandle = handle.create_group(name)
+        ghandle.attrs["type"] = "vls"
+        self._pointers = _create_resizable_dataset(ghandle, "pointers", self.pointer_dtype, chunk_size)
+        self._heap = _create_resizable_dataset(ghandle, "heap", "u1", chunk_size)
+        self._chunk_size = chunk_size
+        self._heap_length = 0
+        self._used_suffixes = set()
+        self._placeholder = None
+        self._placeholder_pointer = None
+
+    def _choose_placeholder(self) -> str:
+        suffix = 0
+        while suffix in self._used_suffixes:
+            suffix += 1
+        return "NA" + "_" * suffix
+
+    def prepare(self, x: Any) -> Tuple[List[bytes], numpy.ndarray]:
+        kind = _classify_column(x)
+        if kind not in (None, "string"):
+            raise TypeError("expected a string column, got '" + kind + "'")
+
+        if isinstance(x, CompactStringVector):
+            buffer = x.get_buffer().tobytes()
+            offsets = x.get_offsets().tolist()
+            encoded = [buffer[offsets[i]:offsets[i + 1]] for i in range(len(x))]
+            mask = x.get_mask()
+            if mask is None:
+                mask = numpy.zeros(len(x), dtype=numpy.bool_)
+        else:
+            if isinstance(x, numpy.ndarray):
+                mask = numpy.ma.getmaskarray(x)
+                x = numpy.ma.getdata(x)
+            else:
+                mask = numpy.array([y is None or numpy.ma.is_masked(y) for y in x], dtype=numpy.bool_)
+            encoded = [None if mask[i] else str(y).encode("UTF-8") for i, y in enumerate(x)]
+
+        # Keeping track of all strings that might be used as placeholders.
+        for i, b in enumerate(encoded):
+            if not mask[i] and b.startswith(b"NA") and b.rstrip(b"_") == b"NA":
+                self._used_suffixes.add(len(b) - 2)
+        return encoded, mask
+
+    def write(self, prepared: Tuple[List[bytes], numpy.ndarray]):
+        encoded, mask = prepared
+
+        if self._placeholder is not None and len(self._placeholder) - 2 in self._used_suffixes:
+            self._replace_placeholder()
+        if self._placeholder is None and mask.any():
+            self._placeholder = self._choose_placeholder()
+            self._placeholder_pointer = self._append_to_heap([self._placeholder.encode("UTF-8")])[0]
+
+        present = [b for i, b in enumerate(encoded) if not mask[i]]
+        pointers = numpy.empty(len(encoded), dtype=self.pointer_dtype)
+        pointers[~mask] = self._append_to_heap(present)
+        if self._placeholder is not None:
+            pointers[mask] = self._placeholder_pointer
+        _append_to_dataset(self._pointers, pointers)
+
+    def _append_to_heap(self, encoded: List[bytes]) -> numpy.ndarray:
+        lengths = numpy.array([len(b) for b in encoded], dtype=numpy.uint64)
+        pointers = numpy.empty(len(encoded), dtype=self.pointer_dtype)
+        pointers["length"] = lengths
+        pointers["offset"] = self._heap_length + numpy.cumsum(lengths) - lengths
+        _append_to_dataset(self._heap, numpy.frombuffer(b"".join(encoded), dtype=numpy.uint8))
+        self._heap_length += int(lengths.sum())
+        return pointers
+
+    def _replace_placeholder(self):
+        old = self._placeholder_pointer
+        self._placeholder = self._choose_placeholder()
+        self._placeholder_pointer = self._append_to_heap([self._placeholder.encode("UTF-8")])[0]
+
+        total = self._pointers.shape[0]
+        for start in range(0, total, self._chunk_size):
+            end = min(total, start + self._chunk_size)
+            block = self._pointers[start:end]
+            replace = (block["offset"] == old["offset"]) & (block["length"] == old["length"])
+            if replace.any():
+                block[replace] = self._placeholder_pointer
+                self._pointers[start:end] = block
+
+    def finish(self):
+        if self._placeholder is not None:
+            self._pointers.attrs["missing-value-placeholder"] = self._placeholder
+
+
+class _FactorColumnStream:
+    # Using the largest code as the placeholder, as the number of levels may
+    # increase with later batches.
+    placeholder = numpy.iinfo(numpy.uint32).max
+
+    def __init__(self, handle: h5py.Group, name: str, chunk_size: int, first: Factor):
+        self._ghandle = handle.create_group(name)
+        self._ghandle.attrs.create("type", data="factor")
+        self._codes = _create_resizable_dataset(self._ghandle, "codes", "u4", chunk_size)
+        self._ordered = first.get_ordered()
+        self._levels = []
+        self._level_index = {}
+        self._has_missing = False
+
+    def prepare(self, x: Any) -> numpy.ndarray:
+        if not isinstance(x, Factor):
+            raise TypeError("expected a Factor column")
+        if x.get_ordered() != self._ordered:
+            raise ValueError("factor should have the same ordered status as in the first batch")
+
+        mapping = numpy.empty(len(x.get_levels()), dtype=numpy.uint32)
+        for i, lev in enumerate(x.get_levels()):
+            if lev not in self._level_index:
+                self._level_index[lev] = len(self._levels)
+                self._levels.append(lev)
+            mapping[i] = self._level_index[lev]
+
+        codes = numpy.asarray(x.get_codes())
+        is_missing = codes < 0
+        output = numpy.full(len(codes), self.placeholder, dtype=numpy.uint32)
+        output[~is_missing] = mapping[codes[~is_missing]]
+        self._has_missing = self._has_missing or is_missing.any()
+        return output
+
+    def write(self, codes: numpy.ndarray):
+        _append_to_dataset(self._codes, codes)
+
+    def finish(self):
+        strings.save_fixed_length_strings(self._ghandle, "levels", self._levels)
+        if self._has_missing:
+            self._codes.attrs.create("missing-value-placeholder", data=self.placeholder, dtype="u4")
+        if self._ordered:
+            self._ghandle.attrs.create("ordered", data=1, dtype="i1")
+
+
+_column_streams = {
+    "integer": _IntegerColumnStream,
+    "number": _FloatColumnStream,
+    "boolean": _BooleanColumnStream,
+    "string": _StringColumnStream,
+    "factor": _FactorColumnStream,
+}
+
+
+########################################################
+
+
+@singledispatch
+def _classify_column(x: Any) -> Optional[str]:
+    raise NotImplementedError("cannot stream column of type '" + type(x).__name__ + "'")
+
+
+@_classify_column.register
+def _classify_list_column(x: list) -> Optional[str]:
+    final_type, has_none = _infer_list_type(x)
+    if final_type is None:
+        if all(y is None for y in x):
+            return None
+        raise NotImplementedError("cannot stream list column containing multiple types")
+    if final_type in _list_column_kinds:
+        return _list_column_kinds[final_type]
+    raise NotImplementedError("cannot stream list column of type '" + final_type.__name__ + "'")
+
+
+_list_column_kinds = {
+    str: "string",
+    bool: "boolean",
+    numpy.bool_: "boolean",
+    int: "integer",
+    float: "number",
+}
+
+
+@_classify_column.register
+def _classify_StringList_column(x: StringList) -> Optional[str]:
+    return "string"
+
+
+@_classify_column.register
+def _classify_CompactStringVector_column(x: CompactStringVector) -> Optional[str]:
+    return "string"
+
+
+@_classify_column.register
+def _classify_IntegerList_column(x: IntegerList) -> Optional[str]:
+    return "integer"
+
+
+@_classify_column.register
+def _classify_FloatList_column(x: FloatList) -> Optional[str]:
+    return "number"
+
+
+@_classify_column.register
+def _classify_BooleanList_column(x: BooleanList) -> Optional[str]:
+    return "boolean"
+
+
+@_classify_column.register
+def _classify_ndarray_column(x: numpy.ndarray) -> Optional[str]:
+    if len(x.shape) != 1:
+        raise NotImplementedError("cannot stream column of multi-dimensional NumPy arrays")
+    if x.dtype == numpy.bool_:
+        return "boolean"
+    if numpy.issubdtype(x.dtype, numpy.integer):
+        return "integer"
+    if numpy.issubdtype(x.dtype, numpy.floating):
+        return "number"
+    if numpy.issubdtype(x.dtype, numpy.str_):
+        return "string"
+    raise NotImplementedError("cannot stream column of type '" + x.dtype.name + "'")
+
+
+@_classify_column.register
+def _classify_factor_column(x: Factor) -> Optional[str]:
+    return "factor"
@@ -0,0 +1,205 @@
+from typing import Any, Callable, List, Optional, Sequence
+import os
+import biocutils
+import numpy
+
+from .alt_read_object import alt_read_object
+from .read_object_file import read_object_file
+
+
+class DeferredObject:
+    """
+    Placeholder for an object that is saved on disk but has not yet been
+    read into memory. This is typically used for the children of a simple
+    list when ``simple_list_lazy_externals = True`` in
+    :py:func:`~dolomite_base.read_simple_list.read_simple_list`, so that
+    lists containing many large objects can be opened without reading all
+    of them.
+    """
+
+    def __init__(self, path: str, **kwargs):
+        """
+        Args:
+            path:
+                Path to the directory containing the object.
+
+            kwargs:
+                Further arguments, passed to
+                :py:func:`~dolomite_base.alt_read_object.alt_read_object`
+                when the object is loaded.
+        """
+        self._path = path
+        self._kwargs = kwargs
+        self._metadata = None
+        self._value = None
+        self._loaded = False
+
+    def get_path(self) -> str:
+        """
+        Returns:
+            Path to the directory containing the object.
+        """
+        return self._path
+
+    def get_metadata(self) -> dict:
+        """
+        Returns:
+            Metadata for the object, read from its ``OBJECT`` file.
+        """
+        if self._metadata is None:
+            self._metadata = read_object_file(self._path)
+        return self._metadata
+
+    def get_type(self) -> str:
+        """
+        Returns:
+            Type of the object, e.g., ``"data_frame"``.
+        """
+        return self.get_metadata()["type"]
+
+    def is_loaded(self) -> bool:
+        """
+        Returns:
+            Whether the object has already been loaded.
+        """
+        return self._loaded
+
+    def load(self) -> Any:
+        """Load the object, or return the previously loaded object if this
+        method was already called.
+
+        Returns:
+            The object, as returned by
+            :py:func:`~dolomite_base.alt_read_object.alt_read_object`.
+        """
+        if not self._loaded:
+            self._value = alt_read_object(self._path, metadata=self.get_metadata(), **self._kwargs)
+            self._loaded = True
+        return self._value
+
+    def __repr__(self) -> str:
+        return "<deferred object at '" + self._path + "'>"
+
+
+class DeferredColumn:
+    """
+    Placeholder for a column of a data frame that has not yet been read into
+    memory. This is used for the columns of a ``BiocFrame`` when
+    ``data_frame_lazy = True`` in
+    :py:func:`~dolomite_base.read_data_frame.read_data_frame`.
+
+    The length is known without loading, but indexing, iteration or
+    conversion to a NumPy array loads the column on first use. The
+    **biocutils** generics used by the ``BiocFrame`` (e.g., for slicing,
+    combining and printing) are also supported, so the data frame can be
+    used as if all columns were already loaded. No file handles are held by
+    this object; the file is only opened by :py:meth:`~load`.
+    """
+
+    def __init__(self, loader: Callable, length: int, column_type: str):
+        """
+        Args:
+            loader:
+                Function that accepts no arguments and returns the column.
+
+            length:
+                Length of the column.
+
+            column_type:
+                Type of the column, e.g., ``"integer"`` or ``"string"``, or
+                ``"other"`` for nested objects.
+        """
+        self._loader = loader
+        self._length = length
+        self._column_type = column_type
+        self._value = None
+        self._loaded = False
+
+    def __len__(self) -> int:
+        return self._length
+
+    def get_type(self) -> str:
+        """
+        Returns:
+            Type of the column.
+        """
+        return self._column_type
+
+    def is_loaded(self) -> bool:
+        """
+        Returns:
+            Whether the column has already been loaded.
+        """
+        return self._loaded
+
+    def load(self) -> Any:
+        """Load the column, or return the previously loaded column if this
+        method was already called.
+
+        Returns:
+            The column, as it would be returned by
+            :py:func:`~dolomite_base.read_data_frame.read_data_frame` with
+            ``data_frame_lazy = False``.
+        """
+        if not self._loaded:
+            self._value = self._loader()
+            self._loaded = True
+            self._loader = None
+        return self._value
+
+    def __getitem__(self, index: Any) -> Any:
+        return self.load()[index]
+
+    def __iter__(self):
+        return iter(self.load())
+
+    def __array__(self, dtype: Any = None, copy: Optional[bool] = None) -> numpy.ndarray:
+        return numpy.asarray(self.load(), dtype=dtype)
+
+    def __repr__(self) -> str:
+        return "<deferred " + self._column_type + " column>"
+
+
+def _load_all(x: Sequence) -> list:
+    return [y.load() if isinstance(y, DeferredColumn) else y for y in x]
+
+
+# Basic columns are always vectors, so this only needs to load other columns.
+@biocutils.is_high_dimensional.register
+def _is_high_dimensional_DeferredColumn(x: DeferredColumn) -> bool:
+    return x.get_type() == "other" and biocutils.is_high_dimensional(x.load())
+
+
+@biocutils.get_height.register
+def _get_height_DeferredColumn(x: DeferredColumn) -> int:
+    return len(x)
+
+
+@biocutils.subset_sequence.register
+def _subset_sequence_DeferredColumn(x: DeferredColumn, indices: Sequence[int]) -> Any:
+    return biocutils.subset(x.load(), indices)
+
+
+@biocutils.subset_rows.register
+def _subset_rows_DeferredColumn(x: DeferredColumn, indices: Sequence[int]) -> Any:
+    return biocutils.subset(x.load(), indices)
+
+
+@biocutils.assign_sequence.register
+def _assign_sequence_DeferredColumn(x: DeferredColumn, indices: Sequence[int], other: Any) -> Any:
+    return biocutils.assign(x.load(), indices, *_load_all([other]))
+
+
+@biocutils.combine_sequences.register
+def _combine_sequences_DeferredColumn(x: DeferredColumn, *other: Any) -> Any:
+    return biocutils.combine(*_load_all([x, *other]))
+
+
+@biocutils.combine_rows.register
+def _combine_rows_DeferredColumn(x: DeferredColumn, *other: Any) -> Any:
+    return biocutils.combine(*_load_all([x, *other]))
+
+
+@biocutils.show_as_cell.register
+def _show_as_cell_DeferredColumn(x: DeferredColumn, indices: Sequence[int]) -> List[str]:
+    return biocutils.show_as_cell(x.load(), indices)
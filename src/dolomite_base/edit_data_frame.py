@@ -0,0 +1,403 @@
+from typing import Any, List, Union
+import os
+import shutil
+import tempfile
+import biocutils
+import numpy
+import h5py
+
+from .alt_save_object import alt_save_object
+from .alt_read_object import alt_read_object
+from .read_object_file import read_object_file
+from .save_object_file import save_object_file
+from .validate_object import validate_object
+from . import _utils_string as strings
+from . import _utils_staged as staged_utils
+from .save_data_frame import Hdf5ColumnOutput, _save_column_for_hdf5, _data_frame_version
+from .read_data_frame import _resolve_columns
+
+
+def set_data_frame_column(
+    path: str,
+    column: Union[str, int],
+    value: Any,
+    data_frame_convert_list_to_vector: bool = True,
+    data_frame_convert_1darray_to_vector: bool = True,
+    data_frame_string_list_vls: bool = False,
+    data_frame_contiguous: bool = False,
+    data_frame_statistics: bool = False,
+    **kwargs
+):
+    """Add or replace a single column of a data frame that was previously
+    saved by :py:func:`~dolomite_base.save_data_frame.save_data_frame`,
+    without rewriting the other columns.
+
+    For a basic column, only the corresponding dataset or group in
+    ``basic_columns.h5`` is replaced; for any other column, only the
+    corresponding subdirectory of ``other_columns`` is replaced. The column
+    names (and column annotations, if a column is added) are also updated.
+
+    Only the new column is validated with
+    :py:func:`~dolomite_base.validate_object.validate_object`, before the
+    data frame is modified, so the cost of an edit is proportional to the
+    size of the column rather than that of the data frame. The column names
+    and number of rows are then checked directly; if any step fails, the
+    edit is reverted and the error is re-raised. Note that HDF5 does not
+    reclaim the space used by a replaced column, so the file may need to be
+    repacked after many replacements, e.g., with ``h5repack``.
+
+    Args:
+        path:
+            Path to the directory containing the data frame.
+
+        column:
+            Name or integer index of the column to replace. If this is a
+            name that is not present in the data frame, a new column is
+            added to the end of the data frame.
+
+        value:
+            Contents of the column. This should have length equal to the
+            number of rows in the data frame.
+
+        data_frame_convert_list_to_vector:
+            See :py:func:`~dolomite_base.save_data_frame.save_data_frame`.
+
+        data_frame_convert_1darray_to_vector:
+            See :py:func:`~dolomite_base.save_data_frame.save_data_frame`.
+
+        data_frame_string_list_vls:
+            See :py:func:`~dolomite_base.save_data_frame.save_data_frame`.
+
+        data_frame_contiguous:
+            See :py:func:`~dolomite_base.save_data_frame.save_data_frame`.
+
+        data_frame_statistics:
+            See :py:func:`~dolomite_base.save_data_frame.save_data_frame`.
+
+        kwargs:
+            Further arguments, passed to internal
+            :py:func:`~dolomite_base.alt_save_object.alt_save_object` calls.
+
+    Returns:
+        The column is added or replaced in ``path``.
+    """
+    metadata = _check_data_frame(path)
+    other_dir = os.path.join(path, "other_columns")
+    backup_dir = os.path.join(path, _BACKUP_NAME)
+    mcol_backup_dir = os.path.join(path, _BACKUP_NAME + "_annotations")
+
+    with h5py.File(os.path.join(path, "basic_columns.h5"), "r+") as handle:
+        ghandle = handle["data_frame"]
+        nrows = int(ghandle.attrs["row-count"])
+        _check_column_length(biocutils.get_height(value), nrows)
+
+        names = list(strings.load_string_vector_from_hdf5(ghandle["column_names"]))
+        added = isinstance(column, str) and column not in names
+        if added:
+            index = len(names)
+        else:
+            index = _resolve_columns([column], names)[0]
+
+        # Staging the column in memory first, so that a failure does not
+        # leave the data frame with a missing column.
+        other = []
+        staged = staged_utils.StagedGroup()
+        output = Hdf5ColumnOutput(
+            handle=staged,
+            otherable=other,
+            convert_list_to_vector=data_frame_convert_list_to_vector,
+            convert_1darray_to_vector=data_frame_convert_1darray_to_vector,
+            use_vls=data_frame_string_list_vls,
+            contiguous=data_frame_contiguous,
+            statistics=data_frame_statistics
+        )
+        _save_column_for_hdf5(value, index, output)
+
+        original_version = metadata["data_frame"]["version"]
+        version = original_version
+        if len(other) == 0:
+            child = staged[str(index)]
+            _check_column_length(_staged_column_length(child), nrows)
+            uses_vls = isinstance(child, staged_utils.StagedGroup) and child.attrs["type"] == "vls"
+            if original_version == "1.0":
+                version = _data_frame_version(uses_vls)
+
+        # Only the new column is validated, before the data frame is modified,
+        # so that the cost of an edit depends on the size of the column.
+        if len(other):
+            tmp_dir = os.path.join(other_dir, str(index) + ".tmp")
+            os.makedirs(other_dir, exist_ok=True)
+            try:
+                alt_save_object(value, tmp_dir, data_frame_convert_list_to_vector=data_frame_convert_list_to_vector, **kwargs)
+                validate_object(tmp_dir)
+            except Exception:
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+                _remove_if_empty(other_dir)
+                raise
+        else:
+            _validate_basic_column(staged, index, nrows, version)
+
+        # Keeping the previous column outside of the data frame's layout
+        # until the edit is complete, so that it can be restored on failure.
+        dhandle = ghandle["data"]
+        stashed = False
+        placed = False
+        try:
+            if not added:
+                _stash_column(handle, other_dir, index, backup_dir)
+                stashed = True
+            if len(other):
+                os.rename(tmp_dir, os.path.join(other_dir, str(index)))
+            else:
+                staged.replay(dhandle)
+            placed = True
+            _remove_if_empty(other_dir)
+
+            if added:
+                _rewrite_column_names(ghandle, names + [column])
+                _replace_column_annotations(path, _append_missing_annotation, len(names) + 1, **kwargs)
+            if version != original_version:
+                ghandle.attrs["version"] = version
+                save_object_file(path, "data_frame", { **metadata, "data_frame": { **metadata["data_frame"], "version": version } })
+            _check_data_frame_layout(ghandle, other_dir, nrows)
+
+        except Exception:
+            if len(other) and not placed:
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+            if placed:
+                _delete_column(dhandle, other_dir, index)
+            if stashed:
+                _restore_column(handle, other_dir, index, backup_dir)
+            _remove_if_empty(other_dir)
+            _rewrite_column_names(ghandle, names)
+            _restore_column_annotations(path)
+            if version != original_version:
+                ghandle.attrs["version"] = original_version
+                save_object_file(path, "data_frame", metadata)
+            raise
+
+        _discard_backups(handle, path)
+    return
+
+
+def remove_data_frame_column(path: str, column: Union[str, int], **kwargs):
+    """Remove a single column from a data frame that was previously saved by
+    :py:func:`~dolomite_base.save_data_frame.save_data_frame`, without
+    rewriting the other columns. Subsequent columns are renumbered by
+    renaming their datasets in ``basic_columns.h5`` or their subdirectories
+    in ``other_columns``. The column names and column annotations are also
+    updated and checked for consistency; if any step fails, the edit is
+    reverted and the error is re-raised.
+
+    Args:
+        path:
+            Path to the directory containing the data frame.
+
+        column:
+            Name or integer index of the column to remove.
+
+        kwargs:
+            Further arguments, passed to internal
+            :py:func:`~dolomite_base.alt_save_object.alt_save_object` calls
+            when re-saving the column annotations.
+
+    Returns:
+        The column is removed from ``path``.
+    """
+    _check_data_frame(path)
+    other_dir = os.path.join(path, "other_columns")
+    backup_dir = os.path.join(path, _BACKUP_NAME)
+
+    with h5py.File(os.path.join(path, "basic_columns.h5"), "r+") as handle:
+        ghandle = handle["data_frame"]
+        nrows = int(ghandle.attrs["row-count"])
+        names = list(strings.load_string_vector_from_hdf5(ghandle["column_names"]))
+        index = _resolve_columns([column], names)[0]
+
+        # Keeping the removed column outside of the data frame's layout, and
+        # recording each renumbering, so that the edit can be undone on failure.
+        dhandle = ghandle["data"]
+        stashed = False
+        renumbered = []
+        try:
+            _stash_column(handle, other_dir, index, backup_dir)
+            stashed = True
+            for j in range(index + 1, len(names)):
+                _move_column(dhandle, other_dir, j, j - 1)
+                renumbered.append(j)
+            _remove_if_empty(other_dir)
+
+            remaining = names[:index] + names[index + 1:]
+            _rewrite_column_names(ghandle, remaining)
+            _replace_column_annotations(path, lambda mcols: mcols[[i for i in range(mcols.shape[0]) if i != index], :], len(remaining), **kwargs)
+            _check_data_frame_layout(ghandle, other_dir, nrows)
+
+        except Exception:
+            for j in reversed(renumbered):
+                _move_column(dhandle, other_dir, j - 1, j)
+            if stashed:
+                _restore_column(handle, other_dir, index, backup_dir)
+            _rewrite_column_names(ghandle, names)
+            _restore_column_annotations(path)
+            raise
+
+        _discard_backups(handle, path)
+    return
+
+
+########################################################
+
+
+def _check_data_frame(path: str) -> dict:
+    metadata = read_object_file(path)
+    if metadata["type"] != "data_frame":
+        raise ValueError("expected a 'data_frame' object at '" + path + "', got '" + metadata["type"] + "'")
+    return metadata
+
+
+# Name of the HDF5 object (at the root of 'basic_columns.h5') or the
+# subdirectory holding the previous contents of a column during an edit.
+# These are outside of the data frame's layout, and are only removed once the
+# edit is complete.
+_BACKUP_NAME = "_previous_column"
+
+
+def _check_column_length(vlen: int, nrows: int):
+    if vlen != nrows:
+        raise ValueError("length of 'value' (" + str(vlen) + ") should be equal to the number of rows (" + str(nrows) + ")")
+
+
+def _staged_column_length(staged: Any) -> int:
+    if isinstance(staged, staged_utils.StagedGroup):
+        if "codes" in staged:
+            staged = staged["codes"]
+        else:
+            staged = staged["pointers"]
+    return staged.shape[0]
+
+
+def _stash_column(handle: h5py.File, other_dir: str, index: int, backup_dir: str):
+    dhandle = handle["data_frame"]["data"]
+    name = str(index)
+    if name in dhandle:
+        handle.move(dhandle[name].name, _BACKUP_NAME)
+    else:
+        os.rename(os.path.join(other_dir, name), backup_dir)
+
+
+def _restore_column(handle: h5py.File, other_dir: str, index: int, backup_dir: str):
+    dhandle = handle["data_frame"]["data"]
+    name = str(index)
+    if _BACKUP_NAME in handle:
+        handle.move(_BACKUP_NAME, dhandle.name + "/" + name)
+    elif os.path.exists(backup_dir):
+        os.makedirs(other_dir, exist_ok=True)
+        os.rename(backup_dir, os.path.join(other_dir, name))
+
+
+def _move_column(dhandle: h5py.Group, other_dir: str, old: int, new: int):
+    if str(old) in dhandle:
+        dhandle.move(str(old), str(new))
+    else:
+        os.rename(os.path.join(other_dir, str(old)), os.path.join(other_dir, str(new)))
+
+
+def _discard_backups(handle: h5py.File, path: str):
+    if _BACKUP_NAME in handle:
+        del handle[_BACKUP_NAME]
+    for leftover in [ _BACKUP_NAME, _BACKUP_NAME + "_annotations" ]:
+        full = os.path.join(path, leftover)
+        if os.path.exists(full):
+            shutil.rmtree(full)
+
+
+def _validate_basic_column(staged: staged_utils.StagedGroup, index: int, nrows: int, version: str):
+    # Validating the new column as the only column of a scratch data frame,
+    # so that none of the existing columns need to be checked.
+    scratch = tempfile.mkdtemp()
+    try:
+        with h5py.File(os.path.join(scratch, "basic_columns.h5"), "w") as handle:
+            ghandle = handle.create_group("data_frame")
+            ghandle.attrs.create("row-count", data=nrows, dtype="u8")
+            ghandle.attrs.create("version", data=version)
+            strings.save_fixed_length_strings(ghandle, "column_names", [ "column" ])
+            dhandle = ghandle.create_group("data")
+            staged.replay(dhandle)
+            if index != 0:
+                dhandle.move(str(index), "0")
+        save_object_file(scratch, "data_frame", { "data_frame": { "version": version } })
+        validate_object(scratch)
+    finally:
+        shutil.rmtree(scratch)
+
+
+def _check_data_frame_layout(ghandle: h5py.Group, other_dir: str, nrows: int):
+    # Cheap consistency checks for the parts of the data frame that are
+    # modified by an edit, i.e., everything except the column contents.
+    if int(ghandle.attrs["row-count"]) != nrows:
+        raise ValueError("'row-count' should not change when editing a data frame")
+
+    names = strings.load_string_vector_from_hdf5(ghandle["column_names"])
+    if any(len(n) == 0 for n in names):
+        raise ValueError("column names should not be empty strings")
+    if len(set(names)) != len(names):
+        raise ValueError("column names should be unique")
+
+    dhandle = ghandle["data"]
+    others = set(os.listdir(other_dir)) if os.path.exists(other_dir) else set()
+    for i in range(len(names)):
+        if (str(i) in dhandle) == (str(i) in others):
+            raise ValueError("column " + str(i) + " should be present in exactly one of 'data' or 'other_columns'")
+    if len(dhandle) + len(others) != len(names):
+        raise ValueError("number of columns should be equal to the number of column names")
+
+
+def _delete_column(dhandle: h5py.Group, other_dir: str, index: int):
+    name = str(index)
+    if name in dhandle:
+        del dhandle[name]
+    else:
+        shutil.rmtree(os.path.join(other_dir, name))
+
+
+def _remove_if_empty(other_dir: str):
+    if os.path.exists(other_dir) and len(os.listdir(other_dir)) == 0:
+        os.rmdir(other_dir)
+
+
+def _rewrite_column_names(ghandle: h5py.Group, names: List[str]):
+    del ghandle["column_names"]
+    strings.save_fixed_length_strings(ghandle, "column_names", names)
+
+
+def _replace_column_annotations(path: str, fun, expected: int, **kwargs):
+    # The previous annotations are kept until the edit is complete.
+    mcol_dir = os.path.join(path, "column_annotations")
+    if not os.path.exists(mcol_dir):
+        return
+    backup = os.path.join(path, _BACKUP_NAME + "_annotations")
+    os.rename(mcol_dir, backup)
+    mcols = fun(alt_read_object(backup, **kwargs))
+    if mcols.shape[0] != expected:
+        raise ValueError("number of column annotations should be equal to the number of columns")
+    alt_save_object(mcols, mcol_dir, **kwargs)
+
+
+def _restore_column_annotations(path: str):
+    mcol_dir = os.path.join(path, "column_annotations")
+    backup = os.path.join(path, _BACKUP_NAME + "_annotations")
+    if os.path.exists(backup):
+        shutil.rmtree(mcol_dir, ignore_errors=True)
+        os.rename(backup, mcol_dir)
+
+
+def _append_missing_annotation(mcols):
+    # Filling the annotations for the new column with missing values.
+    extended = {}
+    for k in mcols.get_column_names():
+        col = mcols.get_column(k)
+        if isinstance(col, numpy.ndarray):
+            extended[k] = numpy.ma.concatenate([col, numpy.ma.masked_all(1, dtype=col.dtype)])
+        else:
+            extended[k] = biocutils.combine_sequences(col, [None])
+    return mcols.__class__(extended, number_of_rows=mcols.shape[0] + 1)
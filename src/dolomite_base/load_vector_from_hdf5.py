@@ -1,12 +1,21 @@
-from typing import Sequence, Union
+from typing import Optional, Sequence, Union
 import numpy
 import h5py
 from biocutils import StringList, IntegerList, FloatList, BooleanList
 
 from . import _utils_string as strings
+from . import _utils_misc as misc
+from .compact_string_vector import CompactStringVector
 
 
-def load_vector_from_hdf5(handle: h5py.Dataset, expected_type: type, report_1darray: bool) -> Union[StringList, IntegerList, FloatList, BooleanList, numpy.ndarray]:
+def load_vector_from_hdf5(
+    handle: h5py.Dataset,
+    expected_type: type,
+    report_1darray: bool,
+    rows: Optional[Union[slice, Sequence[int], numpy.ndarray]] = None,
+    memmap: bool = False,
+    compact_strings: bool = False
+) -> Union[StringList, IntegerList, FloatList, BooleanList, numpy.ndarray, CompactStringVector]:
     """
     Load a vector from a 1-dimensional HDF5 dataset, with coercion to the expected type.
     Any missing value placeholders are used to set Nones or to create masks.
@@ -21,18 +30,46 @@ def load_vector_from_hdf5(handle: h5py.Dataset, expected_type: type, report_1dar
         report_1darray:
             Whether to report the output as a 1-dimensional NumPy array.
 
+        rows:
+            Subset of entries to load from the dataset. This may be a slice,
+            a sequence of integer indices or a boolean mask of length equal to
+            the dataset. If None, all entries are loaded. Only the chunks of
+            the dataset containing the requested entries are read.
+
+        memmap:
+            Whether to return a read-only :py:class:`~numpy.memmap` of the
+            dataset's contents. This only has an effect if ``report_1darray =
+            True`` and the dataset is numeric with an uncompressed contiguous
+            layout (e.g., created with ``contiguous=True`` in
+            :py:func:`~dolomite_base.write_vector_to_hdf5.write_integer_vector_to_hdf5`),
+            otherwise the contents are read into memory as usual. Memory-mapped
+            contents are shared via the page cache across processes and remain
+            valid after ``handle`` is closed.
+
+        compact_strings:
+            Whether to return strings as a
+            :py:class:`~dolomite_base.compact_string_vector.CompactStringVector`,
+            which avoids creating a Python object for each string. Only used
+            if ``expected_type = str``, in which case ``report_1darray`` is
+            ignored.
+
     Returns:
         The contents of the dataset as a vector-like object. By default, this
         is a typed :py:class:`~biocutils.biocutils.NamedList` subclass with
         missing values represented by None. If ``keep_as_1darray = True``, a
         1-dimensional NumPy array is returned instead, possibly with masking.
+        If ``compact_strings = True``, strings are returned in a
+        :py:class:`~dolomite_base.compact_string_vector.CompactStringVector`.
     """
     if expected_type == str:
-        values = strings.load_string_vector_from_hdf5(handle)
+        values = strings.load_string_vector_from_hdf5(handle, rows, compact=compact_strings)
         placeholder = None
         if "missing-value-placeholder" in handle.attrs:
             placeholder = strings.load_scalar_string_attribute_from_hdf5(handle, "missing-value-placeholder")
-        if report_1darray:
+        if compact_strings:
+            if placeholder is not None:
+                values = CompactStringVector(values.get_buffer(), values.get_offsets(), mask=strings.placeholder_mask(values, placeholder))
+        elif report_1darray:
             values = numpy.array(values)
             if placeholder is not None:
                 mask = values == placeholder
@@ -45,7 +82,11 @@ def load_vector_from_hdf5(handle: h5py.Dataset, expected_type: type, report_1dar
             values = StringList(values)
         return values
 
-    values = handle[:]
+    values = None
+    if memmap and report_1darray:
+        values = misc.memmap_dataset(handle, rows)
+    if values is None:
+        values = misc.read_dataset(handle, rows)
     if "missing-value-placeholder" in handle.attrs:
         placeholder = handle.attrs["missing-value-placeholder"]
         if numpy.isnan(placeholder):
@@ -1,4 +1,4 @@
-from typing import Union
+from typing import Optional, Sequence, Union
 from biocutils import StringList, IntegerList, FloatList, BooleanList, NamedList
 import numpy
 import h5py
@@ -10,7 +10,13 @@ from . import _utils_string as strings
 from . import _utils_misc as misc
 
 
-def read_atomic_vector(path: str, metadata: dict, atomic_vector_use_numeric_1darray: bool = False, **kwargs) -> Union[StringList, IntegerList, FloatList, BooleanList, numpy.ndarray]:
+def read_atomic_vector(
+    path: str,
+    metadata: dict,
+    atomic_vector_use_numeric_1darray: bool = False,
+    atomic_vector_rows: Optional[Union[slice, Sequence[int], numpy.ndarray]] = None,
+    **kwargs
+) -> Union[StringList, IntegerList, FloatList, BooleanList, numpy.ndarray]:
     """
     Read an atomic vector from its on-disk representation. In general, this
     function should not be called directly but instead via
@@ -30,6 +36,12 @@ def read_atomic_vector(path: str, metadata: dict, atomic_vector_use_numeric_1dar
             We set this to ``False`` by default to ensure that we can load
             names via :py:class:`~biocutils.NamedList.NamedList` subclasses.
 
+        atomic_vector_rows:
+            Subset of entries to read, as a slice, a sequence of integer
+            indices or a boolean mask. If None, the entire vector is read.
+            Otherwise, only the HDF5 chunks (or, for VLS arrays, the heap
+            ranges) containing the requested entries are loaded.
+
         kwargs: 
             Further arguments, passed to nested objects.
 
@@ -46,15 +58,15 @@ def read_atomic_vector(path: str, metadata: dict, atomic_vector_use_numeric_1dar
         vectype = strings.load_scalar_string_attribute_from_hdf5(ghandle, "type")
 
         if vectype == "vls":
-            output = strings.read_vls(ghandle, "pointers", "heap", as_numpy=atomic_vector_use_numeric_1darray)
+            output = strings.read_vls(ghandle, "pointers", "heap", as_numpy=atomic_vector_use_numeric_1darray, rows=atomic_vector_rows)
         else:
             dhandle = ghandle["values"]
             expected_type = misc.translate_type(vectype)
-            output = load_vector_from_hdf5(dhandle, expected_type, atomic_vector_use_numeric_1darray)
+            output = load_vector_from_hdf5(dhandle, expected_type, atomic_vector_use_numeric_1darray, rows=atomic_vector_rows)
 
         if "names" in ghandle:
             if isinstance(output, NamedList):
-                output.set_names(strings.load_string_vector_from_hdf5(ghandle["names"]), in_place=True)
+                output.set_names(strings.load_string_vector_from_hdf5(ghandle["names"], atomic_vector_rows), in_place=True)
             else:
                 warnings.warn("skipping names when reading atomic vectors as 1-dimensional NumPy arrays")
 
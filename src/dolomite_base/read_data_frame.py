@@ -1,16 +1,39 @@
+from typing import Any, List, Optional, Sequence, Tuple, Union
+from functools import partial
+import operator
 from biocframe import BiocFrame
 import biocutils
+import numpy
 import h5py
 import os
 
 from .alt_read_object import alt_read_object
+from .read_object_file import read_object_file
 from . import _utils_string as strings
 from .load_vector_from_hdf5 import load_vector_from_hdf5
 from ._utils_factor import load_factor_from_hdf5 
 from . import _utils_misc as misc
+from . import _utils_stats as stats
+from .compact_string_vector import CompactStringVector
+from .deferred_object import DeferredColumn
 
 
-def read_data_frame(path: str, metadata: dict, data_frame_represent_numeric_column_as_1darray : bool = True, **kwargs) -> BiocFrame:
+def read_data_frame(
+    path: str,
+    metadata: dict,
+    data_frame_represent_numeric_column_as_1darray : bool = True,
+    data_frame_memmap: bool = False,
+    data_frame_compact_strings: bool = False,
+    data_frame_columns: Optional[Sequence[Union[str, int]]] = None,
+    data_frame_skip_row_names: bool = False,
+    data_frame_skip_annotations: bool = False,
+    data_frame_rows: Optional[Union[slice, Sequence[int]]] = None,
+    data_frame_lazy: bool = False,
+    data_frame_filters: Optional[Sequence[Tuple[Union[str, int], str, Any]]] = None,
+    data_frame_decode_dictionary: bool = False,
+    data_frame_as_pandas: bool = False,
+    **kwargs
+) -> BiocFrame:
     """Load a data frame from a HDF5 file. In general, this function should not
     be called directly but instead via :py:meth:`~dolomite_base.read_object.read_object`.
 
@@ -28,11 +51,106 @@ def read_data_frame(path: str, metadata: dict, data_frame_represent_numeric_colu
             this is not an important difference, but nonetheless, users can set
             this flag to ``False`` to load columns as (typed) lists instead.
 
+        data_frame_memmap:
+            Whether to return numeric columns as read-only memory maps of the
+            underlying file. This only applies to columns that were saved with
+            an uncompressed contiguous layout, e.g., via
+            ``data_frame_contiguous = True`` in
+            :py:func:`~dolomite_base.save_data_frame.save_data_frame`; all
+            other columns are read into memory as usual. Only used if
+            ``data_frame_represent_numeric_column_as_1darray = True``.
+
+        data_frame_compact_strings:
+            Whether to return string columns as
+            :py:class:`~dolomite_base.compact_string_vector.CompactStringVector`
+            objects. These store all strings in a single UTF-8 buffer and
+            only decode each string upon access, which is much more
+            memory-efficient than a list of Python strings.
+
+        data_frame_columns:
+            Names or integer indices of the columns to read. If provided, only
+            the datasets and ``other_columns`` subdirectories for the selected
+            columns are read, and the returned data frame contains only those
+            columns in the specified order. If None, all columns are read.
+
+        data_frame_skip_row_names:
+            Whether to skip reading the row names.
+
+        data_frame_skip_annotations:
+            Whether to skip reading the column annotations and the metadata.
+
+        data_frame_rows:
+            Subset of rows to read, as a slice, a sequence of integer indices
+            or a boolean mask. If provided, the selection is applied to each
+            HDF5 dataset (columns, factor codes and row names) so that only
+            the relevant chunks are read. For ``other_columns``, the selection
+            is passed to the reader of the nested object if it supports row
+            selection, otherwise the object is subsetted after reading.
+            If None, all rows are read.
+
+        data_frame_lazy:
+            Whether to defer loading of each column. If ``True``, only the
+            column names, types and number of rows are read when this function
+            is called, and each column of the returned data frame is a
+            :py:class:`~dolomite_base.deferred_object.DeferredColumn`. This
+            is loaded on first access, e.g., when the column is indexed or
+            the data frame is sliced or printed, respecting all of the other
+            options described above. No file handles are held by the
+            returned data frame, as the HDF5 file is re-opened for each load.
+
+        data_frame_filters:
+            Row filters, to only read rows that satisfy all of the filters.
+            Each filter should be a tuple of the form ``(column, op, value)``,
+            where ``column`` is the name or index of a basic column and ``op``
+            is one of ``"=="``, ``"!="``, ``"<"``, ``"<="``, ``">"``,
+            ``">="``, ``"in"`` or ``"not in"``. For ``"in"`` and ``"not
+            in"``, ``value`` should be a sequence. Missing values never
+            satisfy a filter. For factors, ``value`` is compared to the
+            levels.
+
+            The filter columns are read first, each only at the rows that
+            passed the previous filters, and the selected rows are then
+            read from all requested columns as if they were specified in
+            ``data_frame_rows``. If ``data_frame_rows`` is also provided, the
+            filters are only applied to those rows. If column statistics
+            were saved (see ``data_frame_statistics`` in
+            :py:func:`~dolomite_base.save_data_frame.save_data_frame`), a
+            filter that cannot be satisfied by the column's range skips the
+            reading of all filter columns.
+
+        data_frame_decode_dictionary:
+            Whether to return string columns that were saved as factors (via
+            ``data_frame_dictionary_encode`` in
+            :py:func:`~dolomite_base.save_data_frame.save_data_frame`) as
+            strings. Each string is only decoded once per level. If False,
+            such columns are returned as factors.
+
+        data_frame_as_pandas:
+            Whether to return a :py:class:`~pandas.DataFrame` instead of a
+            ``BiocFrame``. Each column is converted directly into a pandas
+            column, i.e., numeric columns are used without copying, columns
+            with missing values become nullable extension arrays and factors
+            become categoricals. The row names are used as the index and the
+            metadata is stored in ``attrs``, while the column annotations are
+            ignored. This requires the **pandas** package. If True,
+            ``data_frame_represent_numeric_column_as_1darray`` and
+            ``data_frame_lazy`` are ignored. An error is raised if any
+            column is a nested object that cannot be represented as a single
+            pandas column, e.g., a nested data frame.
+
         kwargs: Further arguments, passed to nested objects.
 
     Returns:
         A data frame.
     """
+    if data_frame_as_pandas:
+        try:
+            import pandas
+        except ImportError:
+            raise ModuleNotFoundError("'pandas' is required to read a data frame with 'data_frame_as_pandas = True'")
+        data_frame_represent_numeric_column_as_1darray = True
+        data_frame_lazy = False
+
     column_names = []
     contents = {}
     row_names = None
@@ -42,28 +160,43 @@ def read_data_frame(path: str, metadata: dict, data_frame_represent_numeric_colu
         ghandle = handle["data_frame"]
         expected_rows = ghandle.attrs["row-count"][()]
         column_names = strings.load_string_vector_from_hdf5(ghandle["column_names"])
-        if "row_names" in ghandle:
-            row_names = strings.load_string_vector_from_hdf5(ghandle["row_names"])
+        if data_frame_rows is not None:
+            data_frame_rows = misc.normalize_rows(data_frame_rows, expected_rows)
+        if data_frame_filters is not None:
+            data_frame_rows = _apply_filters(ghandle["data"], column_names, data_frame_filters, data_frame_rows, expected_rows)
+        if data_frame_rows is not None:
+            expected_rows = misc.count_rows(data_frame_rows, expected_rows)
 
+        if "row_names" in ghandle and not data_frame_skip_row_names:
+            row_names = strings.load_string_vector_from_hdf5(ghandle["row_names"], data_frame_rows)
+
+        selected = _resolve_columns(data_frame_columns, column_names)
         dhandle = ghandle["data"]
-        for i, col in enumerate(column_names):
-            name = str(i)
-            if name not in dhandle:
-                contents[col] = alt_read_object(os.path.join(path, "other_columns", name), **kwargs)
-            else:
-                xhandle = dhandle[name]
-                curtype = strings.load_scalar_string_attribute_from_hdf5(xhandle, "type")
-                if curtype == "factor":
-                    contents[col] = load_factor_from_hdf5(xhandle)
-                elif curtype == "vls":
-                    contents[col] = strings.read_vls(xhandle, "pointers", "heap", as_numpy=False)
+        column_options = {
+            "represent_1darray": data_frame_represent_numeric_column_as_1darray,
+            "memmap": data_frame_memmap,
+            "compact_strings": data_frame_compact_strings,
+            "rows": data_frame_rows,
+            "decode_dictionary": data_frame_decode_dictionary,
+        }
+
+        for i in selected:
+            if data_frame_lazy:
+                name = str(i)
+                if name in dhandle:
+                    coltype = strings.load_scalar_string_attribute_from_hdf5(dhandle[name], "type")
                 else:
-                    expected_type = misc.translate_type(curtype)
-                    contents[col] = load_vector_from_hdf5(
-                        xhandle,
-                        expected_type,
-                        report_1darray=(expected_type != str and data_frame_represent_numeric_column_as_1darray)
-                    )
+                    coltype = "other"
+                loader = partial(_read_deferred_column, path, i, **column_options, **kwargs)
+                contents[column_names[i]] = DeferredColumn(loader, expected_rows, coltype)
+            else:
+                contents[column_names[i]] = _read_column(path, dhandle, i, **column_options, **kwargs)
+
+        if data_frame_columns is not None:
+            column_names = [column_names[i] for i in selected]
+
+    if data_frame_as_pandas:
+        return _build_pandas_frame(path, contents, column_names, row_names, expected_rows, data_frame_skip_annotations, **kwargs)
 
     df = BiocFrame(
         contents,
@@ -72,12 +205,272 @@ def read_data_frame(path: str, metadata: dict, data_frame_represent_numeric_colu
         column_names=column_names
     )
 
+    if data_frame_skip_annotations:
+        return df
+
     other_dir = os.path.join(path, "other_annotations")
     if os.path.exists(other_dir):
         df.set_metadata(alt_read_object(other_dir, **kwargs).as_dict(), in_place=True)
 
     mcol_dir = os.path.join(path, "column_annotations")
     if os.path.exists(mcol_dir):
-        df.set_column_data(alt_read_object(mcol_dir, **kwargs), in_place=True)
+        mcols = alt_read_object(mcol_dir, **kwargs)
+        if data_frame_columns is not None:
+            mcols = mcols[selected, :]
+        df.set_column_data(mcols, in_place=True)
 
     return df
+
+
+def _resolve_columns(columns: Optional[Sequence[Union[str, int]]], column_names: List[str]) -> List[int]:
+    if columns is None:
+        return list(range(len(column_names)))
+
+    if isinstance(columns, (str, int)):
+        columns = [columns]
+
+    column_names = list(column_names)
+    ncols = len(column_names)
+    selected = []
+    for col in columns:
+        if isinstance(col, str):
+            try:
+                selected.append(column_names.index(col))
+            except ValueError:
+                raise KeyError("no column named '" + col + "' in the data frame")
+        else:
+            col = int(col)
+            if col < 0:
+                col += ncols
+            if col < 0 or col >= ncols:
+                raise IndexError("column index " + str(col) + " is out of range for a data frame with " + str(ncols) + " columns")
+            selected.append(col)
+    return selected
+
+
+_filter_operators = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "in": lambda x, y: numpy.isin(x, list(y)),
+    "not in": lambda x, y: ~numpy.isin(x, list(y)),
+}
+
+
+def _apply_filters(
+    dhandle: h5py.Group,
+    column_names: List[str],
+    filters: Sequence[Tuple[Union[str, int], str, Any]],
+    rows: Optional[Union[slice, numpy.ndarray]],
+    nrows: int
+) -> numpy.ndarray:
+    resolved = []
+    for f in filters:
+        if len(f) != 3:
+            raise ValueError("each filter should be a tuple of the form (column, op, value)")
+        column, op, value = f
+        if op not in _filter_operators:
+            raise ValueError("unknown filter operator '" + str(op) + "'")
+        index = _resolve_columns([column], column_names)[0]
+        if str(index) not in dhandle:
+            raise NotImplementedError("filters are only supported on basic columns, not '" + column_names[index] + "'")
+        resolved.append((dhandle[str(index)], op, value))
+
+    empty = numpy.zeros(0, dtype=numpy.int64)
+    for xhandle, op, value in resolved:
+        if _filter_excludes_range(xhandle, op, value):
+            return empty
+
+    # Each filter only reads the rows that passed the previous filters.
+    current = rows
+    for xhandle, op, value in resolved:
+        keep = _evaluate_filter(xhandle, op, value, current)
+        if current is None:
+            current = numpy.nonzero(keep)[0]
+        else:
+            if isinstance(current, slice):
+                current = numpy.arange(int(nrows), dtype=numpy.int64)[current]
+            current = current[keep]
+        if len(current) == 0:
+            return empty
+    return current
+
+
+def _evaluate_filter(xhandle, op: str, value: Any, rows: Optional[Union[slice, numpy.ndarray]]) -> numpy.ndarray:
+    curtype = strings.load_scalar_string_attribute_from_hdf5(xhandle, "type")
+    fun = _filter_operators[op]
+
+    if curtype == "factor":
+        # Evaluating the filter on the levels, and then looking up each code.
+        codes = misc.read_dataset(xhandle["codes"], rows)
+        levels = numpy.array(strings.load_string_vector_from_hdf5(xhandle["levels"]), dtype=object)
+        level_keep = numpy.append(numpy.asarray(fun(levels, value), dtype=numpy.bool_), False)
+        codes = codes.astype(numpy.int64)
+        codes[(codes < 0) | (codes >= len(levels))] = len(levels)
+        return level_keep[codes]
+
+    if curtype == "vls":
+        values = strings.read_vls(xhandle, "pointers", "heap", as_numpy=True, rows=rows)
+    else:
+        values = load_vector_from_hdf5(xhandle, misc.translate_type(curtype), report_1darray=True, rows=rows)
+
+    keep = numpy.asarray(fun(numpy.ma.getdata(values), value), dtype=numpy.bool_)
+    return keep & ~numpy.ma.getmaskarray(values)
+
+
+def _filter_excludes_range(xhandle, op: str, value: Any) -> bool:
+    # Using the saved statistics to check whether any value can satisfy the filter.
+    if stats.ATTR_MIN not in xhandle.attrs:
+        return False
+    info = stats.load_statistics(xhandle)
+    lower, upper = info["min"], info["max"]
+    try:
+        if op == "==":
+            return value < lower or value > upper
+        if op == "<":
+            return not (lower < value)
+        if op == "<=":
+            return not (lower <= value)
+        if op == ">":
+            return not (upper > value)
+        if op == ">=":
+            return not (upper >= value)
+        if op == "in":
+            return all(v < lower or v > upper for v in value)
+    except TypeError:
+        pass
+    return False
+
+
+def _read_column(
+    path: str,
+    dhandle: h5py.Group,
+    index: int,
+    represent_1darray: bool,
+    memmap: bool,
+    compact_strings: bool,
+    rows: Optional[Union[slice, Sequence[int]]] = None,
+    decode_dictionary: bool = False,
+    **kwargs
+):
+    name = str(index)
+    if name not in dhandle:
+        return _read_other_column(os.path.join(path, "other_columns", name), rows, **kwargs)
+
+    xhandle = dhandle[name]
+    curtype = strings.load_scalar_string_attribute_from_hdf5(xhandle, "type")
+    if curtype == "factor":
+        output = load_factor_from_hdf5(xhandle, rows)
+        if decode_dictionary and "_python_original_type" in xhandle.attrs:
+            return _decode_dictionary(output, compact_strings)
+        return output
+    elif curtype == "vls":
+        return strings.read_vls(xhandle, "pointers", "heap", as_numpy=False, rows=rows, compact=compact_strings)
+    else:
+        expected_type = misc.translate_type(curtype)
+        return load_vector_from_hdf5(
+            xhandle,
+            expected_type,
+            report_1darray=(expected_type != str and represent_1darray),
+            rows=rows,
+            memmap=memmap,
+            compact_strings=compact_strings
+        )
+
+
+def _read_deferred_column(path: str, index: int, **kwargs):
+    with h5py.File(os.path.join(path, "basic_columns.h5"), "r") as handle:
+        return _read_column(path, handle["data_frame"]["data"], index, **kwargs)
+
+
+def _decode_dictionary(x: biocutils.Factor, compact_strings: bool):
+    codes = numpy.asarray(x.get_codes())
+    levels = list(x.get_levels())
+    missing = codes < 0
+    if compact_strings:
+        if len(levels) == 0:
+            return CompactStringVector.from_list([None] * len(codes))
+        output = CompactStringVector.from_list(levels)[numpy.where(missing, 0, codes)]
+        return CompactStringVector(output.get_buffer(), output.get_offsets(), mask=missing)
+
+    return biocutils.StringList([None if c < 0 else levels[c] for c in codes.tolist()])
+
+
+def _build_pandas_frame(path: str, contents: dict, column_names: Sequence[str], row_names: Optional[Sequence[str]], nrows: int, skip_annotations: bool, **kwargs):
+    import pandas
+    if row_names is not None:
+        index = pandas.Index(list(row_names), dtype=object)
+    else:
+        index = pandas.RangeIndex(int(nrows))
+
+    columns = {}
+    for name in column_names:
+        columns[name] = _to_pandas_column(contents[name], name, pandas)
+    df = pandas.DataFrame(columns, index=index, copy=False)
+
+    if not skip_annotations:
+        other_dir = os.path.join(path, "other_annotations")
+        if os.path.exists(other_dir):
+            df.attrs.update(alt_read_object(other_dir, **kwargs).as_dict())
+    return df
+
+
+def _to_pandas_column(x: Any, name: str, pandas):
+    if isinstance(x, biocutils.Factor):
+        return pandas.Categorical.from_codes(numpy.asarray(x.get_codes()), categories=list(x.get_levels()), ordered=x.get_ordered())
+
+    if isinstance(x, numpy.ndarray) and len(x.shape) == 1:
+        mask = numpy.ma.getmaskarray(x)
+        values = numpy.ma.getdata(x)
+        if not mask.any():
+            return values
+        if values.dtype == numpy.bool_:
+            return pandas.arrays.BooleanArray(values, mask)
+        if numpy.issubdtype(values.dtype, numpy.integer):
+            return pandas.arrays.IntegerArray(values, mask)
+        return pandas.arrays.FloatingArray(values.astype(numpy.float64, copy=False), mask)
+
+    if isinstance(x, biocutils.BooleanList):
+        return pandas.array(x.as_list(), dtype="boolean")
+    if isinstance(x, biocutils.IntegerList):
+        return pandas.array(x.as_list(), dtype="Int64")
+    if isinstance(x, biocutils.FloatList):
+        return pandas.array(x.as_list(), dtype="Float64")
+    if isinstance(x, (biocutils.StringList, CompactStringVector, biocutils.NamedList)):
+        x = x.as_list()
+    if isinstance(x, list):
+        output = numpy.empty(len(x), dtype=object)
+        output[:] = x
+        return output
+
+    # Nested data frames, arrays and other objects have no sensible
+    # representation as a single pandas column.
+    raise ValueError("column '" + name + "' of type '" + type(x).__name__ + "' cannot be represented in a pandas DataFrame")
+
+
+# Readers that accept a row selection for their object type, along with the
+# name of the relevant argument.
+_row_selection_arguments = {
+    "atomic_vector": "atomic_vector_rows",
+    "string_factor": "string_factor_rows",
+    "data_frame": "data_frame_rows",
+}
+
+
+def _read_other_column(path: str, rows: Optional[Union[slice, Sequence[int]]], **kwargs):
+    if rows is None:
+        return alt_read_object(path, **kwargs)
+
+    metadata = read_object_file(path)
+    objtype = metadata["type"]
+    if objtype in _row_selection_arguments:
+        kwargs = { **kwargs, _row_selection_arguments[objtype]: rows }
+        return alt_read_object(path, metadata=metadata, **kwargs)
+
+    output = alt_read_object(path, metadata=metadata, **kwargs)
+    if isinstance(rows, slice):
+        rows = range(*rows.indices(len(output)))
+    return biocutils.subset_sequence(output, rows)
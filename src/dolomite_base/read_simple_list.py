@@ -1,11 +1,20 @@
-from typing import Union
+from typing import Any, Optional, Sequence, Union
 import os
+from biocutils import NamedList
 
 from .alt_read_object import alt_read_object
+from .deferred_object import DeferredObject
 from . import lib_dolomite_base as lib
 
 
-def read_simple_list(path: str, metadata: dict, **kwargs) -> Union[dict, list]:
+def read_simple_list(
+    path: str,
+    metadata: dict,
+    simple_list_numpy_vectors: bool = False,
+    simple_list_lazy_externals: bool = False,
+    simple_list_select: Optional[Sequence[Union[str, int]]] = None,
+    **kwargs
+) -> Any:
     """Read an R-style list from its on-disk representation in the **uzuki2**
     format.  In general, this function should not be called directly but
     instead via :py:meth:`~dolomite_base.read_object.read_object`.
@@ -16,13 +25,50 @@ def read_simple_list(path: str, metadata: dict, **kwargs) -> Union[dict, list]:
 
         metadata: 
             Metadata for the object.
+
+        simple_list_numpy_vectors:
+            Whether to return unnamed integer, float and boolean vectors as
+            NumPy arrays. These are filled directly by the parser, avoiding
+            the creation of a Python object for each element. Vectors with
+            missing values are returned as NumPy masked arrays. If False,
+            vectors are returned as
+            :py:class:`~biocutils.IntegerList.IntegerList`,
+            :py:class:`~biocutils.FloatList.FloatList` or
+            :py:class:`~biocutils.BooleanList.BooleanList` objects instead.
+            Named vectors are always returned as the latter.
+
+        simple_list_lazy_externals:
+            Whether to defer reading of external objects in the list, e.g.,
+            data frames or arrays. If True, each external object is
+            represented by a :py:class:`~dolomite_base.deferred_object.DeferredObject`
+            that is only read upon calling its
+            :py:meth:`~dolomite_base.deferred_object.DeferredObject.load`
+            method. If False, all external objects are read immediately.
+
+        simple_list_select:
+            Path to a sub-element of the list, as a sequence of names or
+            0-based integer indices. Each entry is used to select an element
+            of the list at the previous level, e.g., ``["a", 3, "b"]`` is
+            equivalent to ``x["a"][3]["b"]`` on the full list ``x``. Only the
+            selected element is returned. In the HDF5 format, only the groups
+            along the path are opened; in the JSON format, Python objects are
+            only created for the selected element. Only the external objects
+            inside the selected element are read. If None, the entire list
+            is returned.
     
         kwargs: 
-            Further arguments, passed to nested objects.
+            Further arguments, passed to
+            :py:func:`~dolomite_base.alt_read_object.alt_read_object` when
+            reading external objects.
 
     Returns:
-        A list or dictionary.
+        A list or dictionary, or the selected element if
+        ``simple_list_select`` is provided.
     """
+    select = []
+    if simple_list_select is not None:
+        select = list(simple_list_select)
+    load_selected = len(select) > 0 and not simple_list_lazy_externals
 
     other_dir = os.path.join(path, "other_contents")
     children = []
@@ -34,11 +80,28 @@ def read_simple_list(path: str, metadata: dict, **kwargs) -> Union[dict, list]:
                 collected.append(f)
         children = [None] * len(collected)
         for f in collected:
-            children[int(f)] = alt_read_object(os.path.join(other_dir, f))
+            child_path = os.path.join(other_dir, f)
+            if simple_list_lazy_externals or load_selected:
+                children[int(f)] = DeferredObject(child_path, **kwargs)
+            else:
+                children[int(f)] = alt_read_object(child_path, **kwargs)
 
     if metadata["simple_list"]["format"] == "hdf5":
         full_path = os.path.join(path, "list_contents.h5")
-        return lib.load_list_hdf5(full_path, "simple_list", children)
+        output = lib.load_list_hdf5(full_path, "simple_list", children, simple_list_numpy_vectors, select)
     else:
         full_path = os.path.join(path, "list_contents.json.gz")
-        return lib.load_list_json(full_path, children)
+        output = lib.load_list_json(full_path, children, simple_list_numpy_vectors, select)
+
+    if load_selected:
+        # Only the external objects in the selected element are read.
+        output = _load_deferred(output)
+    return output
+
+
+def _load_deferred(x: Any) -> Any:
+    if isinstance(x, DeferredObject):
+        return x.load()
+    if type(x) is NamedList:
+        return NamedList([_load_deferred(y) for y in x.as_list()], names=x.get_names())
+    return x
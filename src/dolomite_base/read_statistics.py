@@ -0,0 +1,94 @@
+from typing import Optional
+import os
+from biocframe import BiocFrame
+import h5py
+
+from .read_object_file import read_object_file
+from . import _utils_string as strings
+from . import _utils_stats as stats
+
+
+_statistics_fields = [ "type", "null_count", "min", "max", "distinct", "bytes" ]
+
+
+def read_statistics(path: str, metadata: Optional[dict] = None) -> BiocFrame:
+    """
+    Read the statistics of an atomic vector or of each column of a data
+    frame, without reading the actual values. Statistics are only available
+    if they were stored at save time, e.g., with ``data_frame_statistics =
+    True`` in :py:func:`~dolomite_base.save_data_frame.save_data_frame` or
+    ``atomic_vector_statistics = True`` in the atomic vector savers.
+
+    Args:
+        path:
+            Path to a directory containing an atomic vector or data frame.
+
+        metadata:
+            Metadata for the object. If None, this is read from the ``OBJECT``
+            file in ``path``.
+
+    Returns:
+        A ``BiocFrame`` with one row per column of the data frame (named
+        after the columns), or a single row for an atomic vector. This
+        contains the columns:
+
+        - ``type``: the type of the column, e.g., ``"integer"`` or
+          ``"factor"``. For non-basic columns of a data frame, this is the
+          type of the nested object.
+        - ``null_count``: the number of missing values.
+        - ``min``, ``max``: the smallest and largest values, ignoring
+          missing values and NaNs. These are not available for factors.
+        - ``distinct``: the number of distinct non-missing values. This is
+          exact for up to 1024 distinct values and is an estimate otherwise.
+        - ``bytes``: the number of bytes used to store the values on disk.
+
+        Statistics that are not available are reported as None.
+    """
+    if metadata is None:
+        metadata = read_object_file(path)
+
+    rows = []
+    names = None
+    if metadata["type"] == "atomic_vector":
+        with h5py.File(os.path.join(path, "contents.h5"), "r") as handle:
+            ghandle = handle["atomic_vector"]
+            nbytes = stats.storage_size(ghandle)
+            if "names" in ghandle:
+                nbytes -= stats.storage_size(ghandle["names"])
+            rows.append(_basic_statistics(ghandle, nbytes))
+
+    elif metadata["type"] == "data_frame":
+        with h5py.File(os.path.join(path, "basic_columns.h5"), "r") as handle:
+            ghandle = handle["data_frame"]
+            names = list(strings.load_string_vector_from_hdf5(ghandle["column_names"]))
+            dhandle = ghandle["data"]
+            for i in range(len(names)):
+                if str(i) in dhandle:
+                    chandle = dhandle[str(i)]
+                    rows.append(_basic_statistics(chandle, stats.storage_size(chandle)))
+                else:
+                    opath = os.path.join(path, "other_columns", str(i))
+                    rows.append({
+                        "type": read_object_file(opath)["type"],
+                        "null_count": None,
+                        "min": None,
+                        "max": None,
+                        "distinct": None,
+                        "bytes": stats.directory_size(opath)
+                    })
+
+    else:
+        raise NotImplementedError("no statistics available for objects of type '" + metadata["type"] + "'")
+
+    columns = {}
+    for field in _statistics_fields:
+        columns[field] = [r[field] for r in rows]
+    return BiocFrame(columns, number_of_rows=len(rows), row_names=names)
+
+
+def _basic_statistics(handle: h5py.HLObject, nbytes: int) -> dict:
+    vectype = strings.load_scalar_string_attribute_from_hdf5(handle, "type")
+    output = stats.load_statistics(handle, boolean=(vectype == "boolean"))
+    output["type"] = vectype
+    output["bytes"] = nbytes
+    return output
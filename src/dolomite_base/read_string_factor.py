@@ -1,3 +1,4 @@
+from typing import Optional, Sequence, Union
 from biocutils import Factor
 import h5py
 import os
@@ -6,7 +7,12 @@ from ._utils_factor import load_factor_from_hdf5
 from . import _utils_string as strings
 
 
-def read_string_factor(path: str, metadata: dict, **kwargs) -> Factor:
+def read_string_factor(
+    path: str,
+    metadata: dict,
+    string_factor_rows: Optional[Union[slice, Sequence[int]]] = None,
+    **kwargs
+) -> Factor:
     """Read a string factor from disk. 
     
     In general, this function should not be called directly 
@@ -20,6 +26,10 @@ def read_string_factor(path: str, metadata: dict, **kwargs) -> Factor:
         metadata: 
             Metadata for the object. 
 
+        string_factor_rows:
+            Subset of entries to read, as a slice, a sequence of integer
+            indices or a boolean mask. If None, the entire factor is read.
+
         kwargs: 
             Further arguments, passed to nested objects.
 
@@ -29,7 +39,7 @@ def read_string_factor(path: str, metadata: dict, **kwargs) -> Factor:
 
     with h5py.File(os.path.join(path, "contents.h5"), "r") as handle:
         ghandle = handle["string_factor"]
-        output = load_factor_from_hdf5(ghandle)
+        output = load_factor_from_hdf5(ghandle, string_factor_rows)
         if "names" in ghandle:
-            output.set_names(strings.load_string_vector_from_hdf5(ghandle["names"]), in_place=True)
+            output.set_names(strings.load_string_vector_from_hdf5(ghandle["names"], string_factor_rows), in_place=True)
         return output
@@ -8,11 +8,12 @@ from .save_object import save_object, validate_saves
 from .save_object_file import save_object_file
 from . import _utils_string as strings
 from . import write_vector_to_hdf5 as write
+from . import _utils_stats as stats
 
 
 @save_object.register
 @validate_saves
-def save_atomic_vector_from_string_list(x: StringList, path: str, string_list_vls: Optional[bool] = False, **kwargs): 
+def save_atomic_vector_from_string_list(x: StringList, path: str, string_list_vls: Optional[bool] = False, atomic_vector_statistics: bool = False, **kwargs): 
     """Method for saving :py:class:`~biocutils.StringList.StringList` objects to their corresponding file representation,
     see :py:meth:`~dolomite_base.save_object.save_object` for details.
 
@@ -27,6 +28,12 @@ def save_atomic_vector_from_string_list(x: StringList, path: str, string_list_vl
             Whether to save variable-length strings into a custom VLS array format.
             If ``None``, this is automatically determined by comparing the required storage with that of fixed-length strings.
 
+        atomic_vector_statistics:
+            Whether to store statistics for the vector, i.e., the number of
+            missing values, the minimum and maximum, and an estimate of the
+            number of distinct values. These can be retrieved without reading
+            the vector via :py:func:`~dolomite_base.read_statistics.read_statistics`.
+
         kwargs: 
             Further arguments, ignored.
 
@@ -58,6 +65,9 @@ def save_atomic_vector_from_string_list(x: StringList, path: str, string_list_vl
             if placeholder is not None:
                 dset.attrs["missing-value-placeholder"] = placeholder
 
+        if atomic_vector_statistics:
+            stats.save_statistics(ghandle, stats.compute_statistics(x))
+
         nms = x.get_names()
         if nms is not None:
             strings.save_fixed_length_strings(ghandle, "names", nms.as_list())
@@ -67,7 +77,7 @@ def save_atomic_vector_from_string_list(x: StringList, path: str, string_list_vl
 
 @save_object.register
 @validate_saves
-def save_atomic_vector_from_integer_list(x: IntegerList, path: str, **kwargs): 
+def save_atomic_vector_from_integer_list(x: IntegerList, path: str, atomic_vector_statistics: bool = False, **kwargs): 
     """Method for saving :py:class:`~biocutils.IntegerList.IntegerList` objects
     to their corresponding file representation, see
     :py:meth:`~dolomite_base.save_object.save_object` for details.
@@ -79,6 +89,12 @@ def save_atomic_vector_from_integer_list(x: IntegerList, path: str, **kwargs):
         path: 
             Path to save the object.
 
+        atomic_vector_statistics:
+            Whether to store statistics for the vector, i.e., the number of
+            missing values, the minimum and maximum, and an estimate of the
+            number of distinct values. These can be retrieved without reading
+            the vector via :py:func:`~dolomite_base.read_statistics.read_statistics`.
+
         kwargs: 
             Further arguments, ignored.
 
@@ -98,6 +114,9 @@ def save_atomic_vector_from_integer_list(x: IntegerList, path: str, **kwargs):
         else:
             ghandle.attrs["type"] = "integer"
 
+        if atomic_vector_statistics:
+            stats.save_statistics(ghandle, stats.compute_statistics(x))
+
         nms = x.get_names()
         if nms is not None:
             strings.save_fixed_length_strings(ghandle, "names", nms.as_list())
@@ -107,7 +126,7 @@ def save_atomic_vector_from_integer_list(x: IntegerList, path: str, **kwargs):
 
 @save_object.register
 @validate_saves
-def save_atomic_vector_from_float_list(x: FloatList, path: str, **kwargs): 
+def save_atomic_vector_from_float_list(x: FloatList, path: str, atomic_vector_statistics: bool = False, **kwargs): 
     """Method for saving :py:class:`~biocutils.FloatList.FloatList` objects
     to their corresponding file representation, see
     :py:meth:`~dolomite_base.save_object.save_object` for details.
@@ -119,6 +138,12 @@ def save_atomic_vector_from_float_list(x: FloatList, path: str, **kwargs):
         path: 
             Path to save the object.
 
+        atomic_vector_statistics:
+            Whether to store statistics for the vector, i.e., the number of
+            missing values, the minimum and maximum, and an estimate of the
+            number of distinct values. These can be retrieved without reading
+            the vector via :py:func:`~dolomite_base.read_statistics.read_statistics`.
+
         kwargs: 
             Further arguments, ignored.
 
@@ -132,6 +157,9 @@ def save_atomic_vector_from_float_list(x: FloatList, path: str, **kwargs):
         ghandle = handle.create_group("atomic_vector")
         ghandle.attrs["type"] = "number"
         write.write_float_vector_to_hdf5(ghandle, "values", x.as_list())
+        if atomic_vector_statistics:
+            stats.save_statistics(ghandle, stats.compute_statistics(x))
+
         nms = x.get_names()
         if nms is not None:
             strings.save_fixed_length_strings(ghandle, "names", nms.as_list())
@@ -141,7 +169,7 @@ def save_atomic_vector_from_float_list(x: FloatList, path: str, **kwargs):
 
 @save_object.register
 @validate_saves
-def save_atomic_vector_from_boolean_list(x: BooleanList, path: str, **kwargs): 
+def save_atomic_vector_from_boolean_list(x: BooleanList, path: str, atomic_vector_statistics: bool = False, **kwargs): 
     """Method for saving :py:class:`~biocutils.BooleanList.BooleanList` objects
     to their corresponding file representation, see
     :py:meth:`~dolomite_base.save_object.save_object` for details.
@@ -153,6 +181,12 @@ def save_atomic_vector_from_boolean_list(x: BooleanList, path: str, **kwargs):
         path: 
             Path to save the object.
 
+        atomic_vector_statistics:
+            Whether to store statistics for the vector, i.e., the number of
+            missing values, the minimum and maximum, and an estimate of the
+            number of distinct values. These can be retrieved without reading
+            the vector via :py:func:`~dolomite_base.read_statistics.read_statistics`.
+
         kwargs: 
             Further arguments, ignored.
 
@@ -166,6 +200,9 @@ def save_atomic_vector_from_boolean_list(x: BooleanList, path: str, **kwargs):
         ghandle = handle.create_group("atomic_vector")
         ghandle.attrs["type"] = "boolean"
         write.write_boolean_vector_to_hdf5(ghandle, "values", x.as_list())
+        if atomic_vector_statistics:
+            stats.save_statistics(ghandle, stats.compute_statistics(x))
+
         nms = x.get_names()
         if nms is not None:
             strings.save_fixed_length_strings(ghandle, "names", nms.as_list())
@@ -1,5 +1,6 @@
-from typing import Any, Dict, Optional
-from collections import namedtuple
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+from collections import namedtuple, deque
+from concurrent.futures import ThreadPoolExecutor
 from functools import singledispatch
 import os
 from biocframe import BiocFrame
@@ -7,13 +8,22 @@ from biocutils import Factor, StringList, IntegerList, BooleanList, FloatList
 import numpy
 import h5py
 
-from .save_object import save_object
+try:
+    import pandas
+except ImportError: # pragma: no cover
+    pandas = None
+
+from .save_object import save_object, _save_object_from_extension
 from .save_object_file import save_object_file
 from .alt_save_object import alt_save_object
 from . import _utils_string as strings
 from . import write_vector_to_hdf5 as write
 from ._utils_factor import save_factor_to_hdf5
 from . import choose_missing_placeholder as ch
+from . import _utils_misc as misc
+from . import _utils_staged as staged_utils
+from . import _utils_stats as stats
+from .compact_string_vector import CompactStringVector
 
 
 @save_object.register
@@ -23,6 +33,11 @@ def save_data_frame(
     data_frame_convert_list_to_vector: bool = True, 
     data_frame_convert_1darray_to_vector: bool = True, 
     data_frame_string_list_vls: bool = False,
+    data_frame_contiguous: bool = False,
+    data_frame_num_threads: int = 1,
+    data_frame_statistics: bool = False,
+    data_frame_column_types: Optional[Dict[str, str]] = None,
+    data_frame_dictionary_encode: Optional[float] = None,
     **kwargs
 ) -> Dict[str, Any]:
     """Method for saving :py:class:`~biocframe.BiocFrame.BiocFrame`
@@ -57,6 +72,48 @@ def save_data_frame(
             Whether to save columns of variable-length strings into a custom VLS array format.
             If ``None``, this is automatically determined by comparing the required storage with that of fixed-length strings.
 
+        data_frame_contiguous:
+            Whether to save basic columns as uncompressed datasets with a
+            contiguous layout. This increases the file size but allows
+            numeric columns to be memory-mapped by
+            :py:func:`~dolomite_base.read_data_frame.read_data_frame`.
+
+        data_frame_num_threads:
+            Number of threads to use for preparing the basic columns. If
+            greater than 1, the type inference, placeholder choice, encoding
+            and GZIP compression of each column are performed in worker
+            threads, while the main thread writes the prepared columns to file
+            in order. The chunk layout may differ from that of the serial
+            writer.
+
+        data_frame_statistics:
+            Whether to store statistics for each basic column, i.e., the
+            number of missing values, the minimum and maximum, and an
+            estimate of the number of distinct values. These are saved as
+            attributes of each column's HDF5 object and can be retrieved
+            without reading the column via
+            :py:func:`~dolomite_base.read_statistics.read_statistics`.
+
+        data_frame_column_types:
+            Dictionary mapping column names to their types, i.e., one of
+            ``"integer"``, ``"number"``, ``"boolean"`` or ``"string"``. This
+            is only used for columns that are regular Python lists, where it
+            skips the inference of the type from the list elements. The
+            hint only determines the storage type, so the values of each
+            list must already be of the specified type or None, except that
+            integers may be saved as ``"number"``; otherwise, an error is
+            raised. Only relevant if ``data_frame_convert_list_to_vector =
+            True``.
+
+        data_frame_dictionary_encode:
+            Maximum ratio of the number of distinct values to the number of
+            rows, for a string column to be saved as a factor. Such columns
+            are marked so that they can be returned as strings via
+            ``data_frame_decode_dictionary = True`` in
+            :py:func:`~dolomite_base.read_data_frame.read_data_frame`. This
+            reduces the file size and the read time for string columns with
+            few distinct values. If None, no string columns are converted.
+
         kwargs: 
             Further arguments, passed to internal :py:func:`~dolomite_base.alt_save_object.alt_save_object` calls.
 
@@ -64,35 +121,22 @@ def save_data_frame(
         `x` is saved to `path`.
     """
     os.mkdir(path)
-
-    other = []
-    full = os.path.join(path, "basic_columns.h5")
-    with h5py.File(full, "w") as handle:
-        ghandle = handle.create_group("data_frame")
-        ghandle.attrs.create("row-count", data=x.shape[0], dtype="u8")
-        ghandle.attrs.create("version", data="1.0")
-
-        dhandle = ghandle.create_group("data")
-        output = Hdf5ColumnOutput(
-            handle=dhandle, 
-            otherable=other, 
-            convert_list_to_vector=data_frame_convert_list_to_vector, 
-            convert_1darray_to_vector=data_frame_convert_1darray_to_vector,
-            use_vls=data_frame_string_list_vls
-        )
-        for i in range(x.shape[1]):
-            _process_column_for_hdf5(x.get_column(i), i, output)
-
-        strings.save_fixed_length_strings(ghandle, "column_names", x.get_column_names())
-        rn = x.get_row_names()
-        if rn is not None:
-            strings.save_fixed_length_strings(ghandle, "row_names", rn)
-
-    if len(other):
-        other_dir = os.path.join(path, "other_columns")
-        os.mkdir(other_dir)
-        for i in other:
-            alt_save_object(x.get_column(i), os.path.join(other_dir, str(i)), data_frame_convert_list_to_vector=data_frame_convert_list_to_vector, **kwargs)
+    other, version = _save_basic_columns(
+        path,
+        x.shape[0],
+        x.get_column_names(),
+        x.get_row_names(),
+        x.get_column,
+        num_threads=data_frame_num_threads,
+        convert_list_to_vector=data_frame_convert_list_to_vector, 
+        convert_1darray_to_vector=data_frame_convert_1darray_to_vector,
+        use_vls=data_frame_string_list_vls,
+        contiguous=data_frame_contiguous,
+        statistics=data_frame_statistics,
+        column_types=_resolve_column_types(x.get_column_names(), data_frame_column_types),
+        dictionary_encode=data_frame_dictionary_encode
+    )
+    _save_other_columns(path, other, x.get_column, data_frame_convert_list_to_vector=data_frame_convert_list_to_vector, **kwargs)
 
     md = x.get_metadata()
     if md is not None and len(md):
@@ -104,7 +148,7 @@ def save_data_frame(
             cd = cd.set_row_names(None)
         alt_save_object(cd, os.path.join(path, "column_annotations"), data_frame_convert_list_to_vector=data_frame_convert_list_to_vector, **kwargs)
 
-    save_object_file(path, "data_frame", { "data_frame": { "version": "1.0" } })
+    save_object_file(path, "data_frame", { "data_frame": { "version": version } })
     return
 
 
@@ -118,49 +162,217 @@ Hdf5ColumnOutput = namedtuple(
         'otherable',
         'convert_list_to_vector',
         'convert_1darray_to_vector',
-        'use_vls'
-    ]
+        'use_vls',
+        'contiguous',
+        'statistics',
+        'column_types',
+        'dictionary_encode'
+    ],
+    defaults=[None, None]
 )
 
 
+def _save_basic_columns(
+    path: str,
+    nrows: int,
+    column_names: Sequence[str],
+    row_names: Optional[Sequence[str]],
+    get_column: Callable[[int], Any],
+    num_threads: int = 1,
+    **options
+) -> Tuple[List[int], str]:
+    # Writes the basic columns to 'basic_columns.h5', returning the indices
+    # of the columns that need to be saved in 'other_columns' and the version
+    # of the data frame specification.
+    other = []
+    full = os.path.join(path, "basic_columns.h5")
+    with h5py.File(full, "w") as handle:
+        ghandle = handle.create_group("data_frame")
+        ghandle.attrs.create("row-count", data=nrows, dtype="u8")
+
+        dhandle = ghandle.create_group("data")
+        output = Hdf5ColumnOutput(handle=dhandle, otherable=other, **options)
+        ncols = len(column_names)
+        if num_threads > 1:
+            _process_columns_in_parallel(get_column, ncols, output, num_threads)
+        else:
+            for i in range(ncols):
+                _save_column_for_hdf5(get_column(i), i, output)
+
+        strings.save_fixed_length_strings(ghandle, "column_names", column_names)
+        if row_names is not None:
+            strings.save_fixed_length_strings(ghandle, "row_names", row_names)
+
+        uses_vls = any(
+            isinstance(child, h5py.Group) and strings.load_scalar_string_attribute_from_hdf5(child, "type") == "vls"
+            for child in dhandle.values()
+        )
+        version = _data_frame_version(uses_vls)
+        ghandle.attrs.create("version", data=version)
+
+    return other, version
+
+
+def _data_frame_version(uses_vls: bool) -> str:
+    # Version 1.1 of the data frame specification adds the 'vls' column type.
+    # Files without VLS columns are still saved as version 1.0 so that they
+    # can be read by tools that only support the older version.
+    if uses_vls:
+        return "1.1"
+    return "1.0"
+
+
+def _save_other_columns(path: str, other: List[int], get_column: Callable[[int], Any], **kwargs):
+    if len(other):
+        other_dir = os.path.join(path, "other_columns")
+        os.mkdir(other_dir)
+        for i in other:
+            alt_save_object(get_column(i), os.path.join(other_dir, str(i)), **kwargs)
+
+
+def _resolve_column_types(column_names: Sequence[str], column_types: Optional[Dict[str, str]]) -> Optional[Dict[int, Tuple[str, str]]]:
+    if column_types is None:
+        return None
+    names = list(column_names)
+    output = {}
+    for name, hint in column_types.items():
+        if name not in names:
+            raise KeyError("no column named '" + name + "' in the data frame")
+        if hint not in _column_type_hints:
+            raise ValueError("unknown column type '" + hint + "'")
+        output[names.index(name)] = (hint, name)
+    return output
+
+
+def _save_column_for_hdf5(x: Any, index: int, output: Hdf5ColumnOutput):
+    _process_column_for_hdf5(x, index, output)
+    if output.statistics and str(index) in output.handle:
+        stats.save_statistics(output.handle[str(index)], stats.compute_statistics(x))
+    return
+
+
+def _process_columns_in_parallel(get_column: Callable[[int], Any], ncols: int, output: Hdf5ColumnOutput, num_threads: int):
+    # Each worker processes a column into a staged group, and the main thread
+    # replays the staged groups into the file in order. We limit the number
+    # of columns in flight to avoid holding too many prepared columns at once.
+    def prepare(i):
+        staged = staged_utils.StagedGroup()
+        _save_column_for_hdf5(get_column(i), i, output._replace(handle=staged))
+        staged.compress()
+        return staged
+
+    pending = deque()
+    with ThreadPoolExecutor(max_workers=num_threads) as executor:
+        for i in range(ncols):
+            pending.append(executor.submit(prepare, i))
+            if len(pending) >= num_threads * 2:
+                pending.popleft().result().replay(output.handle)
+        while len(pending):
+            pending.popleft().result().replay(output.handle)
+
+    output.otherable.sort()
+    return
+
+
 @singledispatch
 def _process_column_for_hdf5(x: Any, index: int, output: Hdf5ColumnOutput):
     output.otherable.append(index)
     return
 
 
+def _infer_list_type(x: list) -> Tuple[Optional[type], bool]:
+    # Only the distinct types need to be inspected, and collecting them is
+    # done in a single pass at C speed.
+    all_types = set()
+    has_none = False
+    for t in set(map(type, x)):
+        if t is type(None):
+            has_none = True
+        elif issubclass(t, numpy.generic):
+            if issubclass(t, numpy.integer):
+                all_types.add(int)
+            elif issubclass(t, numpy.floating):
+                all_types.add(float)
+            else:
+                all_types.add(t)
+        else:
+            all_types.add(t)
+
+    final_type = None
+    if len(all_types) == 1:
+        final_type = list(all_types)[0]
+    elif len(all_types) == 2 and int in all_types and float in all_types:
+        final_type = float
+    return final_type, has_none
+
+
+_column_type_hints = {
+    "integer": int,
+    "number": float,
+    "boolean": bool,
+    "string": str,
+}
+
+
+def _check_column_type_hint(x: list, hint: str, name: str) -> bool:
+    # Hints only choose the storage type, so the values must already be of
+    # that type; the only allowed conversion is from integers to floats.
+    final_type = _column_type_hints[hint]
+    has_none = False
+    for t in set(map(type, x)):
+        if t is type(None):
+            has_none = True
+            continue
+        if issubclass(t, (bool, numpy.bool_)):
+            ok = final_type == bool
+        elif issubclass(t, (int, numpy.integer)):
+            ok = final_type == int or final_type == float
+        elif issubclass(t, (float, numpy.floating)):
+            ok = final_type == float
+        elif issubclass(t, str):
+            ok = final_type == str
+        else:
+            ok = False
+        if not ok:
+            raise ValueError("column '" + name + "' contains values of type '" + t.__name__ + "' that do not fit the '" + hint + "' type")
+    return has_none
+
+
+def _list_to_array(x: list, dtype: type, has_none: bool) -> numpy.ndarray:
+    if not has_none:
+        return numpy.array(x, dtype=dtype)
+    mask = numpy.fromiter((y is None for y in x), dtype=numpy.bool_, count=len(x))
+    values = numpy.array([0 if y is None else y for y in x], dtype=dtype)
+    return numpy.ma.MaskedArray(values, mask=mask)
+
+
 @_process_column_for_hdf5.register
 def _process_list_column_for_hdf5(x: list, index: int, output: Hdf5ColumnOutput):
     if output.convert_list_to_vector:
-        all_types = set()
-        has_none = False
-        for y in x:
-            if isinstance(y, numpy.generic):
-                if numpy.issubdtype(y.dtype.type, numpy.integer):
-                    all_types.add(int)
-                elif numpy.issubdtype(y.dtype.type, numpy.floating):
-                    all_types.add(float)
-                else:
-                    all_types.add(type(y))
-            elif y is None:
-                has_none = True
-            else:
-                all_types.add(type(y))
-
-        final_type = None
-        if len(all_types) == 1:
-            final_type = list(all_types)[0]
-        elif len(all_types) == 2 and int in all_types and float in all_types:
-            final_type = float
-        elif len(all_types) == 0:
-            final_type = None
+        hint = None
+        if output.column_types is not None:
+            hint = output.column_types.get(index)
+
+        if hint is not None:
+            hint, name = hint
+            final_type = _column_type_hints[hint]
+            has_none = _check_column_type_hint(x, hint, name)
+        else:
+            final_type, has_none = _infer_list_type(x)
 
         if final_type == str:
-            _process_column_for_hdf5.registry[StringList](x, index, output)
+            _process_string_list_for_hdf5(x, has_none, index, output)
             return
 
         elif final_type == int:
-            dhandle = write.write_integer_vector_to_hdf5(output.handle, str(index), x, allow_float_promotion=True)
+            # Converting to an array so that the writer doesn't have to scan
+            # the list again. Integers that don't fit in 64 bits are left to
+            # the writer, which will promote them to floats.
+            try:
+                values = _list_to_array(x, numpy.int64, has_none)
+            except OverflowError:
+                values = x
+            dhandle = write.write_integer_vector_to_hdf5(output.handle, str(index), values, allow_float_promotion=True, contiguous=output.contiguous)
             if numpy.issubdtype(dhandle.dtype, numpy.floating):
                 dhandle.attrs["type"] = "number"
             else:
@@ -168,12 +380,14 @@ def _process_list_column_for_hdf5(x: list, index: int, output: Hdf5ColumnOutput)
             return
 
         elif final_type == float:
-            dhandle = write.write_float_vector_to_hdf5(output.handle, str(index), x)
+            values = _list_to_array(x, numpy.float64, has_none)
+            dhandle = write.write_float_vector_to_hdf5(output.handle, str(index), values, contiguous=output.contiguous)
             dhandle.attrs["type"] = "number"
             return
 
         elif final_type == bool:
-            dhandle = write.write_boolean_vector_to_hdf5(output.handle, str(index), x)
+            values = _list_to_array(x, numpy.bool_, has_none)
+            dhandle = write.write_boolean_vector_to_hdf5(output.handle, str(index), values, contiguous=output.contiguous)
             dhandle.attrs["type"] = "boolean"
             return
 
@@ -181,7 +395,53 @@ def _process_list_column_for_hdf5(x: list, index: int, output: Hdf5ColumnOutput)
     return
 
 
-def _process_string_column_for_hdf5(x_encoded: list, index: int, placeholder: Optional[str], output: Hdf5ColumnOutput):
+def _dictionary_encode_strings(x_encoded: list, index: int, placeholder: Optional[str], output: Hdf5ColumnOutput) -> bool:
+    # Building the dictionary while scanning, giving up as soon as there are
+    # too many distinct values so that high-cardinality columns are cheap.
+    n = len(x_encoded)
+    if n == 0:
+        return False
+    limit = output.dictionary_encode * n
+    placeholder_encoded = placeholder.encode("UTF-8") if placeholder is not None else None
+
+    mapping = {}
+    codes = numpy.empty(n, dtype=numpy.int32)
+    for i, b in enumerate(x_encoded):
+        if b == placeholder_encoded:
+            codes[i] = -1
+            continue
+        code = mapping.get(b)
+        if code is None:
+            code = len(mapping)
+            if code + 1 > limit:
+                return False
+            mapping[b] = code
+        codes[i] = code
+
+    # Sorting the levels for easier reading.
+    encoded_levels = list(mapping.keys())
+    order = sorted(range(len(encoded_levels)), key=encoded_levels.__getitem__)
+    remap = numpy.empty(len(order), dtype=numpy.int32)
+    remap[order] = numpy.arange(len(order), dtype=numpy.int32)
+    present = codes >= 0
+    codes[present] = remap[codes[present]]
+    levels = [encoded_levels[j].decode("UTF-8") for j in order]
+
+    ghandle = output.handle.create_group(str(index))
+    ghandle.attrs.create("type", data="factor")
+    ghandle.attrs["_python_original_type"] = "biocutils.StringList"
+    save_factor_to_hdf5(ghandle, Factor(codes, levels))
+    return True
+
+
+def _process_string_column_for_hdf5(x_encoded: Union[list, numpy.ndarray], index: int, placeholder: Optional[str], output: Hdf5ColumnOutput):
+    # 'x_encoded' may also be a NumPy array of byte strings, which is written
+    # directly if it doesn't need to be converted to a VLS array or factor.
+    if output.dictionary_encode is not None:
+        listed = x_encoded.tolist() if isinstance(x_encoded, numpy.ndarray) else x_encoded
+        if _dictionary_encode_strings(listed, index, placeholder, output):
+            return
+
     # Deciding whether to use the custom VLS layout. Note that we use 2
     # uint64's to store the pointer for each string, hence the 16.
     maxed, total = strings.collect_stats(x_encoded)
@@ -190,8 +450,10 @@ def _process_string_column_for_hdf5(x_encoded: list, index: int, placeholder: Op
         use_vls = strings.use_vls(maxed, total, len(x_encoded))
 
     if use_vls:
+        if isinstance(x_encoded, numpy.ndarray):
+            x_encoded = x_encoded.tolist()
         ghandle = output.handle.create_group(str(index))
-        strings.dump_vls(ghandle, "pointers", "heap", x_encoded, placeholder)
+        strings.dump_vls(ghandle, "pointers", "heap", x_encoded, placeholder, contiguous=output.contiguous)
         ghandle.attrs["type"] = "vls"
 
     else:
@@ -200,8 +462,7 @@ def _process_string_column_for_hdf5(x_encoded: list, index: int, placeholder: Op
             str(index),
             data=x_encoded,
             dtype="S" + str(maxed),
-            compression="gzip",
-            chunks=True
+            **misc.dataset_layout(output.contiguous)
         )
         dhandle.attrs["type"] = "string"
         if placeholder is not None:
@@ -210,17 +471,69 @@ def _process_string_column_for_hdf5(x_encoded: list, index: int, placeholder: Op
     return
 
 
+def _process_string_list_for_hdf5(x: Sequence, has_none: bool, index: int, output: Hdf5ColumnOutput):
+    placeholder = None
+    if has_none:
+        placeholder = ch.choose_missing_string_placeholder(x)
+    x_encoded = strings.encode_strings(x, placeholder)
+    _process_string_column_for_hdf5(x_encoded, index, placeholder, output)
+    return
+
+
+def _process_string_array_for_hdf5(x: numpy.ndarray, index: int, output: Hdf5ColumnOutput):
+    # Encoding and choosing the placeholder with vectorized operations, so
+    # that no Python object is created for each string.
+    mask = numpy.ma.getmaskarray(x)
+    values = numpy.ma.getdata(x)
+    if numpy.issubdtype(values.dtype, numpy.str_):
+        # ASCII strings can be converted by narrowing each UTF-32 code unit
+        # to a single byte, which is much faster than encoding.
+        width = values.dtype.itemsize // 4
+        units = numpy.ascontiguousarray(values).view(numpy.uint32).reshape(len(values), width)
+        if width > 0 and (units < 128).all():
+            values = units.astype(numpy.uint8).view("S" + str(width)).reshape(len(values))
+        else:
+            values = numpy.char.encode(values, "UTF-8")
+
+    placeholder = None
+    if mask.any():
+        placeholder = ch.choose_missing_string_placeholder(strings.UnmaskedStrings(values, mask))
+        placeholder_encoded = placeholder.encode("UTF-8")
+        values = values.astype("S" + str(max(values.dtype.itemsize, len(placeholder_encoded))))
+        values[mask] = placeholder_encoded
+
+    _process_string_column_for_hdf5(values, index, placeholder, output)
+    return
+
+
 @_process_column_for_hdf5.register
 def _process_StringList_column_for_hdf5(x: StringList, index: int, output: Hdf5ColumnOutput):
-    placeholder = strings.choose_missing_placeholder(x)
-    x_encoded = strings.encode_strings(x, placeholder)
+    _process_string_list_for_hdf5(x, any(y is None for y in x), index, output)
+    return
+
+
+@_process_column_for_hdf5.register
+def _process_CompactStringVector_column_for_hdf5(x: CompactStringVector, index: int, output: Hdf5ColumnOutput):
+    mask = x.get_mask()
+    placeholder = None
+    if mask is not None:
+        placeholder = ch.choose_missing_string_placeholder(strings.UnmaskedStrings(x, mask))
+
+    buffer = x.get_buffer().tobytes()
+    offsets = x.get_offsets().tolist()
+    x_encoded = [buffer[offsets[i]:offsets[i + 1]] for i in range(len(x))]
+    if placeholder is not None:
+        placeholder_encoded = placeholder.encode("UTF-8")
+        for i in numpy.nonzero(mask)[0]:
+            x_encoded[i] = placeholder_encoded
+
     _process_string_column_for_hdf5(x_encoded, index, placeholder, output)
     return
 
 
 @_process_column_for_hdf5.register
 def _process_IntegerList_column_for_hdf5(x: IntegerList, index: int, output: Hdf5ColumnOutput):
-    dhandle = write.write_integer_vector_to_hdf5(output.handle, str(index), x.as_list(), allow_float_promotion=True)
+    dhandle = write.write_integer_vector_to_hdf5(output.handle, str(index), x.as_list(), allow_float_promotion=True, contiguous=output.contiguous)
     if numpy.issubdtype(dhandle.dtype, numpy.floating):
         dhandle.attrs["type"] = "number"
     else:
@@ -230,54 +543,40 @@ def _process_IntegerList_column_for_hdf5(x: IntegerList, index: int, output: Hdf
 
 @_process_column_for_hdf5.register
 def _process_FloatList_column_for_hdf5(x: FloatList, index: int, output: Hdf5ColumnOutput):
-    dhandle = write.write_float_vector_to_hdf5(output.handle, str(index), x.as_list())
+    dhandle = write.write_float_vector_to_hdf5(output.handle, str(index), x.as_list(), contiguous=output.contiguous)
     dhandle.attrs["type"] = "number"
     return
 
 
 @_process_column_for_hdf5.register
 def _process_BooleanList_column_for_hdf5(x: BooleanList, index: int, output: Hdf5ColumnOutput):
-    dhandle = write.write_float_vector_to_hdf5(output.handle, str(index), x.as_list())
+    contents = x.as_list()
+    values = _list_to_array(contents, numpy.bool_, any(y is None for y in contents))
+    dhandle = write.write_boolean_vector_to_hdf5(output.handle, str(index), values, contiguous=output.contiguous)
     dhandle.attrs["type"] = "boolean"
     return
 
 
 @_process_column_for_hdf5.register
 def _process_ndarray_column_for_hdf5(x: numpy.ndarray, index: int, output: Hdf5ColumnOutput):
-    if output.convert_1darray_to_vector and len(x.shape) == 1:
+    if output.convert_1darray_to_vector and len(x.shape) == 1 and x.dtype.names is None:
         if numpy.issubdtype(x.dtype, numpy.floating):
-            dhandle = write.write_float_vector_to_hdf5(output.handle, str(index), x)
+            dhandle = write.write_float_vector_to_hdf5(output.handle, str(index), x, contiguous=output.contiguous)
             dhandle.attrs["type"] = "number"
 
         elif x.dtype == numpy.bool_:
-            dhandle = write.write_boolean_vector_to_hdf5(output.handle, str(index), x)
+            dhandle = write.write_boolean_vector_to_hdf5(output.handle, str(index), x, contiguous=output.contiguous)
             dhandle.attrs["type"] = "boolean"
 
         elif numpy.issubdtype(x.dtype, numpy.integer):
-            dhandle = write.write_integer_vector_to_hdf5(output.handle, str(index), x, allow_float_promotion=True)
+            dhandle = write.write_integer_vector_to_hdf5(output.handle, str(index), x, allow_float_promotion=True, contiguous=output.contiguous)
             if numpy.issubdtype(dhandle.dtype, numpy.floating):
                 dhandle.attrs["type"] = "number"
             else:
                 dhandle.attrs["type"] = "integer"
 
-        elif numpy.issubdtype(x.dtype, numpy.str_):
-            placeholder = None
-            if numpy.ma.is_masked(x) and x.mask.any():
-                placeholder = ch.choose_missing_string_placeholder(x)
-
-            x_encoded = [None] * len(x)
-            if placeholder is not None:
-                placeholder_encoded = placeholder.encode("UTF-8")
-                for i, val in enumerate(x):
-                    if x.mask[i]:
-                        x_encoded[i] = placeholder_encoded
-                    else:
-                        x_encoded[i] = val.encode("UTF-8")
-            else:
-                for i, val in enumerate(x):
-                    x_encoded[i] = val.encode("UTF-8")
-
-            _process_string_column_for_hdf5(x_encoded, index, placeholder, output)
+        elif numpy.issubdtype(x.dtype, numpy.str_) or numpy.issubdtype(x.dtype, numpy.bytes_):
+            _process_string_array_for_hdf5(x, index, output)
 
         else:
             raise NotImplementedError("cannot save column of type '" + x.dtype.name + "'")
@@ -294,3 +593,221 @@ def _process_factor_column_for_hdf5(x: Factor, index: int, output: Hdf5ColumnOut
     ghandle.attrs.create("type", data="factor")
     save_factor_to_hdf5(ghandle, x)
     return
+
+
+########################################################
+
+
+def save_data_frame_from_pandas(
+    x: "pandas.DataFrame",
+    path: str,
+    data_frame_string_list_vls: bool = False,
+    data_frame_contiguous: bool = False,
+    data_frame_num_threads: int = 1,
+    data_frame_statistics: bool = False,
+    data_frame_dictionary_encode: Optional[float] = None,
+    **kwargs
+) -> Dict[str, Any]:
+    """Method for saving a :py:class:`~pandas.DataFrame` to the data frame
+    representation, without converting it into a
+    :py:class:`~biocframe.BiocFrame.BiocFrame` first. This requires the
+    **pandas** package; this method is only registered to
+    :py:func:`~dolomite_base.save_object.save_object` if **pandas** is
+    installed.
+
+    - NumPy-backed numeric and boolean columns are written directly from the
+      column's underlying array.
+    - Nullable extension arrays (e.g., ``Int32``, ``Float64``, ``boolean``)
+      are written with their missing values replaced by a placeholder.
+    - Categorical columns are saved as factors.
+    - String and object columns are saved as strings if all non-missing
+      values are strings, otherwise they are treated like a regular Python
+      list in :py:func:`~save_data_frame`.
+
+    The index is saved as the row names, unless it is the default range
+    index. Column names and row names are converted to strings. Any
+    ``attrs`` are saved as the metadata of the data frame.
+
+    Args:
+        x:
+            Object to be saved.
+
+        path:
+            Path to a directory in which to save ``x``.
+
+        data_frame_string_list_vls:
+            See :py:func:`~save_data_frame`.
+
+        data_frame_contiguous:
+            See :py:func:`~save_data_frame`.
+
+        data_frame_num_threads:
+            See :py:func:`~save_data_frame`.
+
+        data_frame_statistics:
+            See :py:func:`~save_data_frame`.
+
+        data_frame_dictionary_encode:
+            See :py:func:`~save_data_frame`.
+
+        kwargs:
+            Further arguments, passed to internal :py:func:`~dolomite_base.alt_save_object.alt_save_object` calls.
+
+    Returns:
+        `x` is saved to `path`.
+    """
+    os.mkdir(path)
+    nrows = x.shape[0]
+    row_names = None
+    if not x.index.equals(pandas.RangeIndex(nrows)):
+        row_names = [str(y) for y in x.index]
+
+    get_column = lambda i : _convert_pandas_column(x.iloc[:, i])
+    other, version = _save_basic_columns(
+        path,
+        nrows,
+        [str(y) for y in x.columns],
+        row_names,
+        get_column,
+        num_threads=data_frame_num_threads,
+        convert_list_to_vector=True,
+        convert_1darray_to_vector=True,
+        use_vls=data_frame_string_list_vls,
+        contiguous=data_frame_contiguous,
+        statistics=data_frame_statistics,
+        dictionary_encode=data_frame_dictionary_encode
+    )
+    _save_other_columns(path, other, get_column, **kwargs)
+
+    if len(x.attrs):
+        alt_save_object(dict(x.attrs), os.path.join(path, "other_annotations"), **kwargs)
+
+    save_object_file(path, "data_frame", { "data_frame": { "version": version } })
+    return
+
+
+def _convert_pandas_column(x: "pandas.Series") -> Any:
+    # Converting each column into a type that can be handled by
+    # _process_column_for_hdf5, avoiding copies where possible.
+    dtype = x.dtype
+    if isinstance(dtype, pandas.CategoricalDtype):
+        return Factor(x.cat.codes.to_numpy(), [str(y) for y in dtype.categories], ordered=dtype.ordered)
+
+    if isinstance(dtype, numpy.dtype):
+        if dtype == numpy.object_:
+            return x.to_numpy(dtype=object, na_value=None).tolist()
+        return x.to_numpy()
+
+    if isinstance(dtype, pandas.StringDtype):
+        return x.to_numpy(dtype=object, na_value=None).tolist()
+
+    if pandas.api.types.is_bool_dtype(dtype) or pandas.api.types.is_numeric_dtype(dtype):
+        # Nullable extension arrays, where missing values are masked.
+        target = getattr(dtype, "numpy_dtype", None)
+        if target is None:
+            target = numpy.float64
+        mask = x.isna().to_numpy()
+        values = x.to_numpy(dtype=target, na_value=False if target == numpy.bool_ else 0)
+        if mask.any():
+            return numpy.ma.MaskedArray(values, mask=mask)
+        return values
+
+    return x.to_numpy()
+
+
+def save_data_frame_from_structured_array(
+    x: numpy.ndarray,
+    path: str,
+    data_frame_string_list_vls: bool = False,
+    data_frame_contiguous: bool = False,
+    data_frame_num_threads: int = 1,
+    data_frame_statistics: bool = False,
+    data_frame_dictionary_encode: Optional[float] = None,
+    **kwargs
+) -> Dict[str, Any]:
+    """Method for saving a 1-dimensional NumPy structured array or record
+    array to the data frame representation, where each field is saved as a
+    column. Each column is written from a view of the field in the record
+    buffer, so the array is not copied into separate columns. Unicode and
+    byte string fields are encoded with vectorized operations. Masked
+    structured arrays are also supported, in which case masked values are
+    saved as missing.
+
+    Record arrays are always dispatched to this method by
+    :py:func:`~dolomite_base.save_object.save_object`, as are plain
+    structured arrays unless another package (e.g., **dolomite-matrix**)
+    has registered a method for all NumPy arrays. In the latter case, this
+    function can be called directly or the array can be viewed as a
+    :py:class:`~numpy.recarray` without copying.
+
+    Args:
+        x:
+            Object to be saved.
+
+        path:
+            Path to a directory in which to save ``x``.
+
+        data_frame_string_list_vls:
+            See :py:func:`~save_data_frame`.
+
+        data_frame_contiguous:
+            See :py:func:`~save_data_frame`.
+
+        data_frame_num_threads:
+            See :py:func:`~save_data_frame`.
+
+        data_frame_statistics:
+            See :py:func:`~save_data_frame`.
+
+        data_frame_dictionary_encode:
+            See :py:func:`~save_data_frame`.
+
+        kwargs:
+            Further arguments, passed to internal :py:func:`~dolomite_base.alt_save_object.alt_save_object` calls.
+
+    Returns:
+        `x` is saved to `path`.
+    """
+    if x.dtype.names is None:
+        raise ValueError("expected a NumPy array with a structured data type")
+    if len(x.shape) != 1:
+        raise ValueError("expected a 1-dimensional structured array")
+
+    os.mkdir(path)
+    if not numpy.ma.isMaskedArray(x):
+        x = x.view(numpy.ndarray)
+    names = list(x.dtype.names)
+    get_column = lambda i : x[names[i]]
+    other, version = _save_basic_columns(
+        path,
+        x.shape[0],
+        names,
+        None,
+        get_column,
+        num_threads=data_frame_num_threads,
+        convert_list_to_vector=True,
+        convert_1darray_to_vector=True,
+        use_vls=data_frame_string_list_vls,
+        contiguous=data_frame_contiguous,
+        statistics=data_frame_statistics,
+        dictionary_encode=data_frame_dictionary_encode
+    )
+    _save_other_columns(path, other, get_column, **kwargs)
+
+    save_object_file(path, "data_frame", { "data_frame": { "version": version } })
+    return
+
+
+save_object.register(numpy.recarray, save_data_frame_from_structured_array)
+
+
+@save_object.register
+def _save_object_from_ndarray(x: numpy.ndarray, path: str, **kwargs):
+    # Structured arrays are saved as data frames, while all other NumPy
+    # arrays are sent to dolomite_matrix.
+    if x.dtype.names is not None:
+        return save_data_frame_from_structured_array(x, path, **kwargs)
+    return _save_object_from_extension(x, path, **kwargs)
+
+if pandas is not None:
+    save_object.register(pandas.DataFrame, save_data_frame_from_pandas)
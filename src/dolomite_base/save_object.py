@@ -50,8 +50,11 @@ def save_object(x: Any, path: str, **kwargs):
         `x` is saved to `path`.
     """
 
+    return _save_object_from_extension(x, path, **kwargs)
+
+
+def _save_object_from_extension(x: Any, path: str, **kwargs):
     if hasattr(type(x), "mro"):
-        import sys
         hierarchy = type(x).mro()
         for y in hierarchy:
             nm = y.__name__
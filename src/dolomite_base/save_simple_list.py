@@ -1,11 +1,9 @@
-from typing import Any, Union, Literal
+from typing import Any, Optional, Union, Literal
 import numpy as np
 from warnings import warn
 from functools import singledispatch
 from biocutils import Factor, StringList, NamedList, IntegerList, BooleanList, FloatList
 import os
-import json
-import gzip
 import h5py
 
 from .save_object import save_object, validate_saves
@@ -13,12 +11,23 @@ from .save_object_file import save_object_file
 from .alt_save_object import alt_save_object
 from . import _utils_misc as misc
 from . import _utils_string as strings
+from . import _utils_factor as factors
 from . import write_vector_to_hdf5 as write
+from . import lib_dolomite_base as lib
+from .save_data_frame import _infer_list_type
 
 
 @save_object.register
 @validate_saves
-def save_simple_list_from_dict(x: dict, path: str, simple_list_mode: Literal["hdf5", "json"] = "json", simple_list_string_list_vls: bool = False, **kwargs):
+def save_simple_list_from_dict(x: dict,
+    path: str,
+    simple_list_mode: Literal["hdf5", "json", "auto"] = "json",
+    simple_list_string_list_vls: bool = False,
+    simple_list_compression_level: int = 6,
+    simple_list_compression_thread: bool = True,
+    simple_list_pack_scalars: bool = False,
+    **kwargs
+):
     """Method for saving dictionaries (Python analogues to R-style named lists)
     to the corresponding file representations, see
     :py:meth:`~dolomite_base.save_object.save_object` for details.
@@ -31,7 +40,34 @@ def save_simple_list_from_dict(x: dict, path: str, simple_list_mode: Literal["hd
             Path to a directory in which to save the object.
 
         simple_list_mode: 
-            Whether to save in HDF5 or JSON mode.
+            Whether to save in HDF5 or JSON mode. If ``"auto"``, the mode
+            is chosen based on the contents of ``x``. HDF5 is used for
+            lists that are dominated by long vectors (especially of
+            floats), while JSON is used for lists that are dominated by
+            many small elements.
+
+        simple_list_compression_level:
+            Gzip compression level for the JSON file, from 1 to 9. Only
+            relevant if ``simple_list_mode = "json"``.
+
+        simple_list_compression_thread:
+            Whether to perform the Gzip compression in a separate thread
+            while the list is being serialized. Only relevant if
+            ``simple_list_mode = "json"``.
+
+        simple_list_pack_scalars:
+            Whether to save nested lists and dictionaries where all values
+            are scalars of the same type (integer, float, boolean or string,
+            possibly with None) as a single typed vector. The top-level
+            object is always saved as a list. This avoids
+            creating a separate HDF5 object or JSON entry for each scalar,
+            but such lists are read back as
+            :py:class:`~biocutils.IntegerList.IntegerList`,
+            :py:class:`~biocutils.FloatList.FloatList`,
+            :py:class:`~biocutils.BooleanList.BooleanList` or
+            :py:class:`~biocutils.StringList.StringList` objects, named
+            after the keys for dictionaries. A mixture of integers and
+            floats is saved as floats.
 
         kwargs: 
             Further arguments, ignored.
@@ -39,13 +75,30 @@ def save_simple_list_from_dict(x: dict, path: str, simple_list_mode: Literal["hd
     Returns:
         ``x`` is saved to ``path``.
     """
-    _save_simple_list_internal(x, path, simple_list_mode, simple_list_string_list_vls=simple_list_string_list_vls, **kwargs)
+    _save_simple_list_internal(
+        x,
+        path,
+        simple_list_mode,
+        simple_list_string_list_vls=simple_list_string_list_vls,
+        simple_list_compression_level=simple_list_compression_level,
+        simple_list_compression_thread=simple_list_compression_thread,
+        simple_list_pack_scalars=simple_list_pack_scalars,
+        **kwargs
+    )
     return
 
 
 @save_object.register
 @validate_saves
-def save_simple_list_from_list(x: list, path: str, simple_list_mode: Literal["hdf5", "json"] = "json", simple_list_string_list_vls: bool = False, **kwargs):
+def save_simple_list_from_list(x: list,
+    path: str,
+    simple_list_mode: Literal["hdf5", "json", "auto"] = "json",
+    simple_list_string_list_vls: bool = False,
+    simple_list_compression_level: int = 6,
+    simple_list_compression_thread: bool = True,
+    simple_list_pack_scalars: bool = False,
+    **kwargs
+):
     """Method for saving lists (Python analogues to R-style unnamed lists) to
     the corresponding file representations, see
     :py:meth:`~dolomite_base.save_object.save_object` for details.
@@ -58,7 +111,34 @@ def save_simple_list_from_list(x: list, path: str, simple_list_mode: Literal["hd
             Path to a directory in which to save the object.
 
         simple_list_mode: 
-            Whether to save in HDF5 or JSON mode.
+            Whether to save in HDF5 or JSON mode. If ``"auto"``, the mode
+            is chosen based on the contents of ``x``. HDF5 is used for
+            lists that are dominated by long vectors (especially of
+            floats), while JSON is used for lists that are dominated by
+            many small elements.
+
+        simple_list_compression_level:
+            Gzip compression level for the JSON file, from 1 to 9. Only
+            relevant if ``simple_list_mode = "json"``.
+
+        simple_list_compression_thread:
+            Whether to perform the Gzip compression in a separate thread
+            while the list is being serialized. Only relevant if
+            ``simple_list_mode = "json"``.
+
+        simple_list_pack_scalars:
+            Whether to save nested lists and dictionaries where all values
+            are scalars of the same type (integer, float, boolean or string,
+            possibly with None) as a single typed vector. The top-level
+            object is always saved as a list. This avoids
+            creating a separate HDF5 object or JSON entry for each scalar,
+            but such lists are read back as
+            :py:class:`~biocutils.IntegerList.IntegerList`,
+            :py:class:`~biocutils.FloatList.FloatList`,
+            :py:class:`~biocutils.BooleanList.BooleanList` or
+            :py:class:`~biocutils.StringList.StringList` objects, named
+            after the keys for dictionaries. A mixture of integers and
+            floats is saved as floats.
 
         kwargs: 
             Further arguments, ignored.
@@ -66,13 +146,30 @@ def save_simple_list_from_list(x: list, path: str, simple_list_mode: Literal["hd
     Returns:
         ``x`` is saved to ``path``.
     """
-    _save_simple_list_internal(x, path, simple_list_mode, simple_list_string_list_vls=simple_list_string_list_vls, **kwargs)
+    _save_simple_list_internal(
+        x,
+        path,
+        simple_list_mode,
+        simple_list_string_list_vls=simple_list_string_list_vls,
+        simple_list_compression_level=simple_list_compression_level,
+        simple_list_compression_thread=simple_list_compression_thread,
+        simple_list_pack_scalars=simple_list_pack_scalars,
+        **kwargs
+    )
     return
 
 
 @save_object.register
 @validate_saves
-def save_simple_list_from_NamedList(x: NamedList, path: str, simple_list_mode: Literal["hdf5", "json"] = "json", simple_list_string_list_vls: bool = False, **kwargs):
+def save_simple_list_from_NamedList(x: NamedList,
+    path: str,
+    simple_list_mode: Literal["hdf5", "json", "auto"] = "json",
+    simple_list_string_list_vls: bool = False,
+    simple_list_compression_level: int = 6,
+    simple_list_compression_thread: bool = True,
+    simple_list_pack_scalars: bool = False,
+    **kwargs
+):
     """Method for saving a NamedList to its corresponding file representation,
     see :py:meth:`~dolomite_base.save_object.save_object` for details.
 
@@ -84,20 +181,56 @@ def save_simple_list_from_NamedList(x: NamedList, path: str, simple_list_mode: L
             Path to a directory in which to save the object.
 
         simple_list_mode: 
-            Whether to save in HDF5 or JSON mode.
+            Whether to save in HDF5 or JSON mode. If ``"auto"``, the mode
+            is chosen based on the contents of ``x``. HDF5 is used for
+            lists that are dominated by long vectors (especially of
+            floats), while JSON is used for lists that are dominated by
+            many small elements.
 
         simple_list_string_list_vls:
             Whether to save :py:class:`~biocutils.StringList.StringList` objects of variable-length strings into a custom VLS array format for HDF5.
             If ``None``, this is automatically determined by comparing the required storage with that of fixed-length strings.
             Only relevant if ``simple_list_mode = "hdf5"``.
 
+        simple_list_compression_level:
+            Gzip compression level for the JSON file, from 1 to 9. Only
+            relevant if ``simple_list_mode = "json"``.
+
+        simple_list_compression_thread:
+            Whether to perform the Gzip compression in a separate thread
+            while the list is being serialized. Only relevant if
+            ``simple_list_mode = "json"``.
+
+        simple_list_pack_scalars:
+            Whether to save nested lists and dictionaries where all values
+            are scalars of the same type (integer, float, boolean or string,
+            possibly with None) as a single typed vector. The top-level
+            object is always saved as a list. This avoids
+            creating a separate HDF5 object or JSON entry for each scalar,
+            but such lists are read back as
+            :py:class:`~biocutils.IntegerList.IntegerList`,
+            :py:class:`~biocutils.FloatList.FloatList`,
+            :py:class:`~biocutils.BooleanList.BooleanList` or
+            :py:class:`~biocutils.StringList.StringList` objects, named
+            after the keys for dictionaries. A mixture of integers and
+            floats is saved as floats.
+
         kwargs: 
             Further arguments, ignored.
 
     Returns:
         ``x`` is saved to ``path``.
     """
-    _save_simple_list_internal(x, path, simple_list_mode, simple_list_string_list_vls=simple_list_string_list_vls, **kwargs)
+    _save_simple_list_internal(
+        x,
+        path,
+        simple_list_mode,
+        simple_list_string_list_vls=simple_list_string_list_vls,
+        simple_list_compression_level=simple_list_compression_level,
+        simple_list_compression_thread=simple_list_compression_thread,
+        simple_list_pack_scalars=simple_list_pack_scalars,
+        **kwargs
+    )
     return
 
 
@@ -107,9 +240,16 @@ def save_simple_list_from_NamedList(x: NamedList, path: str, simple_list_mode: L
 def _save_simple_list_internal(
     x: Union[dict, list, NamedList],
     path: str,
-    simple_list_mode: Literal["hdf5", "json"] = None,
+    simple_list_mode: Literal["hdf5", "json", "auto"] = None,
+    simple_list_compression_level: int = 6,
+    simple_list_compression_thread: bool = True,
     **kwargs
 ):
+    # Packing once, so that the same packed lists are used to choose the mode
+    # and to save the list.
+    x = _pack_all_nested(x, **kwargs)
+    if simple_list_mode == "auto":
+        simple_list_mode = _choose_mode(x)
     os.mkdir(path)
 
     format2 = simple_list_mode 
@@ -123,8 +263,7 @@ def _save_simple_list_internal(
         transformed = _save_simple_list_recursive(x, externals, None, **kwargs)
         transformed["version"] = "1.2"
         opath = os.path.join(path, "list_contents.json.gz")
-        with gzip.open(opath, "wt") as handle:
-            json.dump(transformed, handle)
+        lib.dump_list_json(opath, transformed, simple_list_compression_level, simple_list_compression_thread)
 
     else:
         opath = os.path.join(path, "list_contents.h5")
@@ -137,7 +276,73 @@ def _save_simple_list_internal(
         exdir = os.path.join(path, "other_contents")
         os.mkdir(exdir)
         for i, ex in enumerate(externals):
-            alt_save_object(ex, os.path.join(exdir, str(i)), **kwargs)
+            alt_save_object(
+                ex,
+                os.path.join(exdir, str(i)),
+                simple_list_compression_level=simple_list_compression_level,
+                simple_list_compression_thread=simple_list_compression_thread,
+                **kwargs
+            )
+    return
+
+
+# Approximate costs (in microseconds) of saving and reading each node or each
+# vector element in each mode. These were obtained from the save + read times
+# reported by benchmarks/simple_list_mode.py: the node costs are the slopes
+# with respect to --nodes at --elements 0, the element costs are the slopes
+# with respect to --elements for each --type at --nodes 1, and the fixed cost
+# is the difference between the HDF5 and JSON intercepts. Only the ratios
+# between the two modes matter, so the constants should be re-fitted together
+# if either implementation changes. HDF5 has a high per-node cost from
+# creating a group and its attributes, while JSON has a higher per-element
+# cost, mostly from formatting and compressing floats.
+_JSON_NODE_COST = 5
+_HDF5_NODE_COST = 340
+_HDF5_FIXED_COST = 1500
+
+_JSON_ELEMENT_COST = { "number": 2.7, "integer": 1.2, "string": 0.7, "boolean": 0.45, "factor": 0.7 }
+_HDF5_ELEMENT_COST = { "number": 0.6, "integer": 0.9, "string": 0.45, "boolean": 0.35, "factor": 0.2 }
+
+
+def _choose_mode(x: Any) -> str:
+    costs = { "json": 0, "hdf5": _HDF5_FIXED_COST }
+    _estimate_mode_costs(x, costs)
+    if costs["hdf5"] < costs["json"]:
+        return "hdf5"
+    return "json"
+
+
+def _estimate_mode_costs(x: Any, costs: dict):
+    vectype = None
+    if isinstance(x, Factor):
+        vectype = "factor"
+    elif isinstance(x, FloatList):
+        vectype = "number"
+    elif isinstance(x, IntegerList):
+        vectype = "integer"
+    elif isinstance(x, StringList):
+        vectype = "string"
+    elif isinstance(x, BooleanList):
+        vectype = "boolean"
+
+    costs["json"] += _JSON_NODE_COST
+    costs["hdf5"] += _HDF5_NODE_COST
+    if vectype is not None:
+        costs["json"] += _JSON_ELEMENT_COST[vectype] * len(x)
+        costs["hdf5"] += _HDF5_ELEMENT_COST[vectype] * len(x)
+        return
+
+    if isinstance(x, dict):
+        children = x.values()
+    elif isinstance(x, list):
+        children = x
+    elif isinstance(x, NamedList):
+        children = x.as_list()
+    else:
+        return
+
+    for y in children:
+        _estimate_mode_costs(y, costs)
     return
 
 
@@ -195,10 +400,11 @@ def _save_simple_list_recursive_IntegerList(x: IntegerList, externals: list, han
     nms = x.get_names()
 
     if handle is None:
+        values = x.as_list()
         final_type = "integer"
         if misc.sequence_exceeds_int32(x):
             final_type = "number"
-        output = { "type": final_type, "values": x.as_list() }
+        output = { "type": final_type, "values": values }
         if nms is not None:
             output["names"] = nms.as_list()
         return output
@@ -219,8 +425,7 @@ def _save_simple_list_recursive_FloatList(x: FloatList, externals: list, handle,
     nms = x.get_names()
 
     if handle is None:
-        xcopy = [ _sanitize_masked_float_json(y) for y in x.as_list() ]
-        output = { "type": "number", "values": xcopy }
+        output = { "type": "number", "values": _sanitize_float_list_json(x.as_list()) }
         if nms is not None:
             output["names"] = nms.as_list()
         return output
@@ -251,6 +456,49 @@ def _save_simple_list_recursive_BooleanList(x: BooleanList, externals: list, han
     return
 
 
+def _pack_all_nested(x: Any, simple_list_pack_scalars: bool = False, **kwargs) -> Any:
+    # Returns a copy of the list where each nested list is packed, if
+    # possible. Only nested lists are packed, as the top-level object must be
+    # a list.
+    if not simple_list_pack_scalars:
+        return x
+    if isinstance(x, dict):
+        return { k: _pack_nested(v) for k, v in x.items() }
+    if isinstance(x, list):
+        return [ _pack_nested(y) for y in x ]
+    if isinstance(x, NamedList) and not isinstance(x, (StringList, IntegerList, FloatList, BooleanList)):
+        return NamedList([ _pack_nested(y) for y in x.as_list() ], names=x.get_names())
+    return x
+
+
+def _pack_nested(x: Any) -> Any:
+    packed = None
+    if isinstance(x, list):
+        packed = _pack_scalars(x, None)
+    elif isinstance(x, dict):
+        packed = _pack_scalars(list(x.values()), _stringify_keys(x.keys()))
+    elif isinstance(x, NamedList) and not isinstance(x, (StringList, IntegerList, FloatList, BooleanList)):
+        names = x.get_names()
+        packed = _pack_scalars(x.as_list(), None if names is None else names.as_list())
+    if packed is None:
+        return _pack_all_nested(x, simple_list_pack_scalars=True)
+    return packed
+
+
+def _pack_scalars(values: list, names: Optional[list]) -> Optional[Any]:
+    # Returns a typed vector if all values are scalars of the same type.
+    final_type, has_none = _infer_list_type(values)
+    if final_type == int:
+        return IntegerList(values, names=names)
+    elif final_type == float:
+        return FloatList(values, names=names)
+    elif final_type == bool:
+        return BooleanList(values, names=names)
+    elif final_type == str:
+        return StringList(values, names=names)
+    return None
+
+
 @_save_simple_list_recursive.register
 def _save_simple_list_recursive_list(x: list, externals: list, handle, **kwargs):
     if handle is None:
@@ -294,10 +542,19 @@ def _save_simple_list_recursive_dict(x: dict, externals: list, handle, **kwargs)
         return
 
 
+def _stringify_keys(keys) -> list:
+    names = []
+    for k in keys:
+        if not isinstance(k, str):
+            warn("converting non-string key with value " + str(k) + " to a string", UserWarning)
+        names.append(str(k))
+    return names
+
+
 @_save_simple_list_recursive.register
 def _save_simple_list_recursive_NamedList(x: NamedList, externals: list, handle, **kwargs):
     if x.get_names() is None:
-        return _save_simple_list_recursive_list(x.as_list(), externals, handle)
+        return _save_simple_list_recursive_list(x.as_list(), externals, handle, **kwargs)
 
     if handle is None:
         vals = []
@@ -429,9 +686,18 @@ def _save_simple_list_recursive_factor(x: Factor, externals: list, handle, **kwa
         handle.attrs["uzuki_object"] = "vector"
         handle.attrs["uzuki_type"] = "factor"
 
-        dhandle = handle.create_dataset("data", data=x.get_codes(), dtype="i4", compression="gzip", chunks=True)
-        if (x.get_codes() == -1).any():
-            dhandle.attrs.create("missing-value-placeholder", data=-1, dtype="i4")
+        codes = np.asarray(x.get_codes())
+        is_missing = codes < 0
+        has_missing = is_missing.any()
+        nlevels = len(x.get_levels())
+        dtype = factors.choose_code_type(nlevels, has_missing)
+        if has_missing:
+            codes = codes.astype(dtype, copy=True)
+            codes[is_missing] = nlevels
+
+        dhandle = handle.create_dataset("data", data=codes, dtype=dtype, compression="gzip", chunks=True)
+        if has_missing:
+            dhandle.attrs.create("missing-value-placeholder", data=nlevels, dtype=dtype)
 
         strings.save_fixed_length_strings(handle, "levels", x.get_levels().as_list())
         if x.get_ordered():
@@ -470,6 +736,19 @@ def _sanitize_masked_float_json(x):
     return _sanitize_float_json(x)
 
 
+def _sanitize_float_list_json(x: list) -> list:
+    # Converting all values at once, where None becomes NaN; only the
+    # non-finite values need to be revisited.
+    try:
+        values = np.array(x, dtype=np.float64)
+    except (TypeError, ValueError):
+        return [ _sanitize_masked_float_json(y) for y in x ]
+    output = values.tolist()
+    for i in np.nonzero(~np.isfinite(values))[0].tolist():
+        output[i] = _sanitize_masked_float_json(x[i])
+    return output
+
+
 ##########################################################################
 
 
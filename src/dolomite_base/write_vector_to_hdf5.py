@@ -20,6 +20,9 @@ def _has_missing(x: Sequence):
 
 
 def _fill_with_placeholder(x, dtype, placeholder):
+    if isinstance(x, numpy.ndarray):
+        return numpy.ma.filled(numpy.ma.asarray(x).astype(dtype), placeholder)
+
     copy = numpy.ndarray(len(x), dtype=dtype)
     for i, y in enumerate(x):
         if _is_missing_scalar(y):
@@ -37,7 +40,8 @@ def write_string_vector_to_hdf5(
     handle: h5py.Group, 
     name: str, 
     x: Sequence[str], 
-    placeholder_name: str = "missing-value-placeholder"
+    placeholder_name: str = "missing-value-placeholder",
+    contiguous: bool = False
 ) -> h5py.Dataset:
     """
     Write a string vector to a HDF5 file as a 1-dimensional dataset with a
@@ -58,6 +62,12 @@ def write_string_vector_to_hdf5(
             Name of the attribute in which to store the missing value
             placeholder, if ``x`` contains None or masked values.
 
+        contiguous:
+            Whether to create the dataset with an uncompressed contiguous
+            layout, instead of the default chunked layout with GZIP
+            compression. Contiguous datasets are larger but can be
+            memory-mapped by :py:func:`~dolomite_base.load_vector_from_hdf5.load_vector_from_hdf5`.
+
     Returns:
         Handle for the newly created dataset.
     """
@@ -70,7 +80,7 @@ def write_string_vector_to_hdf5(
             if _is_missing_scalar(y):
                 x[i] = placeholder
 
-    dset = strings.save_fixed_length_strings(handle, name, x)
+    dset = strings.save_fixed_length_strings(handle, name, x, contiguous=contiguous)
     if missed:
         dset.attrs[placeholder_name] = placeholder
     return dset
@@ -86,7 +96,8 @@ def write_integer_vector_to_hdf5(
     x: Sequence[int], 
     h5type: str = "i4",
     placeholder_name: str = "missing-value-placeholder", 
-    allow_float_promotion: bool = False 
+    allow_float_promotion: bool = False,
+    contiguous: bool = False
 ) -> h5py.Dataset:
     """
     Write an integer vector to a HDF5 file as a 1-dimensional dataset. If
@@ -115,6 +126,12 @@ def write_integer_vector_to_hdf5(
             within the acceptable range of integer values. If ``False``, an
             error is raised if ``x`` cannot be saved without promotion.
 
+        contiguous:
+            Whether to create the dataset with an uncompressed contiguous
+            layout, instead of the default chunked layout with GZIP
+            compression. Contiguous datasets are larger but can be
+            memory-mapped by :py:func:`~dolomite_base.load_vector_from_hdf5.load_vector_from_hdf5`.
+
     Returns:
         Handle for the newly created dataset.
     """
@@ -123,11 +140,16 @@ def write_integer_vector_to_hdf5(
     max_dtype = numpy.dtype(h5type).type
     limits = numpy.iinfo(max_dtype)
     exceeds = False
-    for y in x:
-        if not _is_missing_scalar(y):
-            if y < limits.min or y > limits.max:
-                exceeds = True
-                break
+    if isinstance(x, numpy.ndarray):
+        present = numpy.ma.compressed(x) if isinstance(x, numpy.ma.MaskedArray) else x
+        if len(present):
+            exceeds = present.min() < limits.min or present.max() > limits.max
+    else:
+        for y in x:
+            if not _is_missing_scalar(y):
+                if y < limits.min or y > limits.max:
+                    exceeds = True
+                    break
 
     if exceeds:
         if not allow_float_promotion:
@@ -150,7 +172,7 @@ def write_integer_vector_to_hdf5(
     if exceeds:
         h5type = "f8"
 
-    dset = handle.create_dataset(name, data=x, dtype=h5type, compression="gzip", chunks=True)
+    dset = handle.create_dataset(name, data=x, dtype=h5type, **misc.dataset_layout(contiguous))
     if missed:
        dset.attrs.create(placeholder_name, placeholder, dtype=h5type)
     return dset
@@ -165,7 +187,8 @@ def write_float_vector_to_hdf5(
     name: str, 
     x: Sequence[float], 
     h5type: str = "f8",
-    placeholder_name: str = "missing-value-placeholder"
+    placeholder_name: str = "missing-value-placeholder",
+    contiguous: bool = False
 ) -> h5py.Dataset:
     """
     Write a floating-point vector to a HDF5 file as a 1-dimensional dataset.
@@ -187,6 +210,12 @@ def write_float_vector_to_hdf5(
             Name of the attribute in which to store the missing value
             placeholder, if ``x`` contains None or masked values.
 
+        contiguous:
+            Whether to create the dataset with an uncompressed contiguous
+            layout, instead of the default chunked layout with GZIP
+            compression. Contiguous datasets are larger but can be
+            memory-mapped by :py:func:`~dolomite_base.load_vector_from_hdf5.load_vector_from_hdf5`.
+
     Returns:
         Handle for the newly created dataset.
     """
@@ -196,7 +225,7 @@ def write_float_vector_to_hdf5(
         placeholder = ch.choose_missing_float_placeholder(x, dtype=dtype)
         x = _fill_with_placeholder(x, dtype, placeholder)
 
-    dset = handle.create_dataset(name, data=x, dtype=h5type, compression="gzip", chunks=True)
+    dset = handle.create_dataset(name, data=x, dtype=h5type, **misc.dataset_layout(contiguous))
     if missed:
        dset.attrs.create(placeholder_name, placeholder, dtype=h5type)
     return dset
@@ -210,7 +239,8 @@ def write_boolean_vector_to_hdf5(
     handle: h5py.Group, 
     name: str, 
     x: Sequence[bool],
-    placeholder_name: str = "missing-value-placeholder"
+    placeholder_name: str = "missing-value-placeholder",
+    contiguous: bool = False
 ) -> h5py.Dataset:
     """
     Write a boolean vector to a HDF5 file as a 1-dimensional dataset with
@@ -228,6 +258,12 @@ def write_boolean_vector_to_hdf5(
             Name of the attribute in which to store the missing value
             placeholder, if ``x`` contains None or masked values.
 
+        contiguous:
+            Whether to create the dataset with an uncompressed contiguous
+            layout, instead of the default chunked layout with GZIP
+            compression. Contiguous datasets are larger but can be
+            memory-mapped by :py:func:`~dolomite_base.load_vector_from_hdf5.load_vector_from_hdf5`.
+
     Returns:
         Handle for the newly created dataset.
     """
@@ -238,7 +274,7 @@ def write_boolean_vector_to_hdf5(
         x = _fill_with_placeholder(x, numpy.int8, placeholder)
 
     h5type = "i1"
-    dset = handle.create_dataset(name, data=x, dtype=h5type, compression="gzip", chunks=True)
+    dset = handle.create_dataset(name, data=x, dtype=h5type, **misc.dataset_layout(contiguous))
     if missed:
        dset.attrs.create(placeholder_name, placeholder, dtype=h5type)
     return dset
@@ -216,3 +216,38 @@ def test_string_list_vls():
     roundtrip = dl.read_object(dir, atomic_vector_use_numeric_1darray=True)
     assert isinstance(roundtrip, numpy.ndarray)
     assert StringList(roundtrip) == sl
+
+
+def test_atomic_vector_rows():
+    sl = IntegerList(list(range(100)))
+    sl = sl.set_names(["X" + str(i) for i in range(100)])
+    dir = os.path.join(mkdtemp(), "temp")
+    dl.save_object(sl, dir)
+    roundtrip = dl.read_object(dir, atomic_vector_rows=[5, 50, 95])
+    assert roundtrip.as_list() == [5, 50, 95]
+    assert roundtrip.get_names().as_list() == ["X5", "X50", "X95"]
+
+    with pytest.warns(UserWarning, match="skipping names"):
+        roundtrip = dl.read_object(dir, atomic_vector_rows=slice(10, 20), atomic_vector_use_numeric_1darray=True)
+    assert list(roundtrip) == list(range(10, 20))
+
+    # Works for VLS arrays.
+    contents = [str(i) * (i % 7 + 1) for i in range(1000)]
+    contents[500] = None
+    sl = StringList(contents)
+    dir = os.path.join(mkdtemp(), "temp")
+    dl.save_object(sl, dir, string_list_vls = True)
+
+    idx = [999, 0, 500, 501, 250, 250]
+    roundtrip = dl.read_object(dir, atomic_vector_rows=idx)
+    assert roundtrip.as_list() == [contents[i] for i in idx]
+
+    mask = [i % 3 == 0 for i in range(1000)]
+    roundtrip = dl.read_object(dir, atomic_vector_rows=mask)
+    assert roundtrip.as_list() == contents[::3]
+
+    roundtrip = dl.read_object(dir, atomic_vector_rows=slice(495, 505), atomic_vector_use_numeric_1darray=True)
+    assert list(numpy.where(roundtrip.mask)[0]) == [5]
+
+    roundtrip = dl.read_object(dir, atomic_vector_rows=[])
+    assert len(roundtrip) == 0
@@ -0,0 +1,124 @@
+import dolomite_base as dl
+from dolomite_base import _utils_string as strings
+from biocframe import BiocFrame
+from biocutils import StringList
+from tempfile import mkdtemp
+import numpy
+import os
+import h5py
+import pytest
+
+
+def test_compact_string_vector_basic():
+    x = dl.CompactStringVector.from_list(["akari", None, "", "アリス"])
+    assert len(x) == 4
+    assert x[0] == "akari"
+    assert x[1] is None
+    assert x[2] == ""
+    assert x[-1] == "アリス"
+    assert x.as_list() == ["akari", None, "", "アリス"]
+    assert list(x.get_offsets()) == [0, 5, 5, 5, 14]
+    assert list(x.get_mask()) == [False, True, False, False]
+
+    sub = x[[3, 0]]
+    assert isinstance(sub, dl.CompactStringVector)
+    assert sub.as_list() == ["アリス", "akari"]
+    assert sub.get_mask() is None
+    assert x[1:3].as_list() == [None, ""]
+
+    with pytest.raises(IndexError):
+        x[4]
+    with pytest.raises(ValueError, match="offsets"):
+        dl.CompactStringVector(numpy.zeros(2, dtype=numpy.uint8), [0, 1])
+
+
+def test_compact_string_vector_from_fixed_length():
+    x = dl.CompactStringVector.from_fixed_length(numpy.array([b"foo", b"", b"whee"]))
+    assert x.as_list() == ["foo", "", "whee"]
+    assert len(x.get_buffer()) == 7
+
+
+def test_compact_string_vector_to_arrow():
+    pa = pytest.importorskip("pyarrow")
+    x = dl.CompactStringVector.from_list(["akari", None, "aika"])
+    arr = x.to_arrow()
+    assert isinstance(arr, pa.LargeStringArray)
+    assert arr.to_pylist() == ["akari", None, "aika"]
+
+
+def test_compact_string_vector_hdf5():
+    path = os.path.join(mkdtemp(), "foo.h5")
+    with h5py.File(path, "w") as handle:
+        dl.write_string_vector_to_hdf5(handle, "FOO", ["A", "BB", None, "NA_", "DDD"])
+        ghandle = handle.create_group("VLS")
+        contents = ["akari", "NA", "aika", "alice"]
+        strings.dump_vls(ghandle, "pointers", "heap", strings.encode_strings(contents, None), None)
+
+    with h5py.File(path, "r") as handle:
+        foo = dl.load_vector_from_hdf5(handle["FOO"], str, report_1darray=False, compact_strings=True)
+        assert isinstance(foo, dl.CompactStringVector)
+        assert foo.as_list() == ["A", "BB", None, "NA_", "DDD"]
+
+        sub = dl.load_vector_from_hdf5(handle["FOO"], str, report_1darray=False, rows=[4, 2], compact_strings=True)
+        assert sub.as_list() == ["DDD", None]
+
+        vls = strings.read_vls(handle["VLS"], "pointers", "heap", as_numpy=False, compact=True)
+        assert vls.as_list() == contents
+        vls = strings.read_vls(handle["VLS"], "pointers", "heap", as_numpy=False, rows=[3, 1], compact=True)
+        assert vls.as_list() == ["alice", "NA"]
+
+
+
+def test_compact_string_vector_hdf5_variable_length():
+    path = os.path.join(mkdtemp(), "foo.h5")
+    with h5py.File(path, "w") as handle:
+        dhandle = handle.create_dataset("FOO", data=["A", "BB", "NA_", "", "DDD"], dtype=h5py.string_dtype())
+        dhandle.attrs.create("missing-value-placeholder", data="NA_", dtype=h5py.string_dtype(encoding="utf-8"))
+
+    with h5py.File(path, "r") as handle:
+        foo = dl.load_vector_from_hdf5(handle["FOO"], str, report_1darray=False, compact_strings=True)
+        assert isinstance(foo, dl.CompactStringVector)
+        assert foo.as_list() == ["A", "BB", None, "", "DDD"]
+
+        sub = dl.load_vector_from_hdf5(handle["FOO"], str, report_1darray=False, rows=[4, 2], compact_strings=True)
+        assert sub.as_list() == ["DDD", None]
+
+    # Same for a variable-length string column in a data frame.
+    df = BiocFrame({ "aika": [ "sydney", "melbourne", "", "perth", "adelaide" ] })
+    dir = os.path.join(mkdtemp(), "hdf5")
+    dl.save_object(df, dir)
+    with h5py.File(os.path.join(dir, "basic_columns.h5"), "r+") as handle:
+        dhandle = handle["data_frame/data"]
+        del dhandle["0"]
+        col = dhandle.create_dataset("0", data=df.get_column("aika"), dtype=h5py.string_dtype())
+        col.attrs["type"] = "string"
+    dl.validate_object(dir)
+
+    roundtrip = dl.read_object(dir, data_frame_compact_strings=True)
+    assert isinstance(roundtrip.get_column("aika"), dl.CompactStringVector)
+    assert roundtrip.get_column("aika").as_list() == df.get_column("aika")
+
+def test_compact_string_vector_data_frame():
+    df = BiocFrame({
+        "akira": StringList(["A", None, "C", "D", "E"]),
+        "aika": [ "sydney", "melbourne", "", "perth", "adelaide" ],
+        "akari": [ 1, 2, 3, 4, 5 ],
+    })
+
+    for vls in [False, True]:
+        dir = os.path.join(mkdtemp(), "hdf5")
+        dl.save_object(df, dir, data_frame_string_list_vls=vls)
+        roundtrip = dl.read_object(dir, data_frame_compact_strings=True)
+        assert isinstance(roundtrip.get_column("akira"), dl.CompactStringVector)
+        assert roundtrip.get_column("akira").as_list() == df.get_column("akira").as_list()
+        assert roundtrip.get_column("aika").as_list() == df.get_column("aika")
+
+        # Compact vectors can be saved again.
+        dir2 = os.path.join(mkdtemp(), "hdf5")
+        dl.save_object(roundtrip, dir2)
+        again = dl.read_object(dir2)
+        assert again.get_column("akira") == df.get_column("akira")
+        assert again.get_column("aika").as_list() == df.get_column("aika")
+
+        sub = roundtrip[1:3, :]
+        assert sub.get_column("akira").as_list() == [None, "C"]
@@ -1,10 +1,13 @@
 from biocframe import BiocFrame
 from biocutils import Factor, StringList, IntegerList, BooleanList, FloatList
+import biocutils
 import dolomite_base as dl
 import numpy as np
 import os
+import shutil
 import h5py
 from tempfile import mkdtemp
+import pytest
 
 
 def test_data_frame_list():
@@ -214,6 +217,17 @@ def test_data_frame_NamedList():
     assert roundtrip.get_column("akira") == df.get_column("akira")
     assert roundtrip.get_column("athena") == df.get_column("athena")
 
+    # Booleans are stored compactly, even with missing values.
+    df = BiocFrame({ "akira": BooleanList([ True, None, False, False, True ]) })
+    dir = os.path.join(mkdtemp(), "foo")
+    dl.save_object(df, dir)
+    with h5py.File(os.path.join(dir, "basic_columns.h5"), "r") as handle:
+        dset = handle["data_frame/data/0"]
+        assert dset.dtype == np.int8
+        assert dset.attrs["missing-value-placeholder"] == -1
+    roundtrip = dl.read_object(dir, data_frame_represent_numeric_column_as_1darray=False)
+    assert roundtrip.get_column("akira") == df.get_column("akira")
+
 
 def test_data_frame_large_integers():
     df = BiocFrame({
@@ -406,3 +420,394 @@ def test_data_frame_string_vls():
     dl.save_object(df, dir, data_frame_string_list_vls = None)
     roundtrip = dl.read_object(dir)
     assert roundtrip.get_column("A") == df.get_column("A")
+
+
+def test_data_frame_version():
+    # Version 1.1 is only used when VLS columns are present.
+    df = BiocFrame({ "A": StringList([ "a", "b", None ]), "B": [ 1, 2, 3 ] })
+    dir = os.path.join(mkdtemp(), "temp")
+    dl.save_object(df, dir, data_frame_string_list_vls = False)
+    assert dl.read_object_file(dir)["data_frame"]["version"] == "1.0"
+    with h5py.File(os.path.join(dir, "basic_columns.h5"), "r") as handle:
+        assert handle["data_frame"].attrs["version"] == "1.0"
+
+    dir = os.path.join(mkdtemp(), "temp")
+    dl.save_object(df, dir, data_frame_string_list_vls = True)
+    assert dl.read_object_file(dir)["data_frame"]["version"] == "1.1"
+    with h5py.File(os.path.join(dir, "basic_columns.h5"), "r") as handle:
+        assert handle["data_frame"].attrs["version"] == "1.1"
+    dl.validate_object(dir)
+
+
+def test_data_frame_memmap():
+    df = BiocFrame({
+        "alicia": np.array([ 1, 2, 3, 4, 5 ], dtype=np.int32),
+        "athena": np.ma.array(np.array([ 2.3, -12.8, 5.2, 32, -1.2 ]), mask=[0, 0, 0, 1, 1]),
+        "aika": [ "sydney", "melbourne", "", "perth", "adelaide" ],
+    })
+
+    dir = os.path.join(mkdtemp(), "foo")
+    dl.save_object(df, dir, data_frame_contiguous=True)
+    with h5py.File(os.path.join(dir, "basic_columns.h5"), "r") as handle:
+        assert handle["data_frame"]["data"]["0"].chunks is None
+
+    roundtrip = dl.read_object(dir, data_frame_memmap=True)
+    assert isinstance(roundtrip.get_column("alicia"), np.memmap)
+    assert (roundtrip.get_column("alicia") == df.get_column("alicia")).all()
+    assert isinstance(roundtrip.get_column("athena").data, np.memmap)
+    assert (roundtrip.get_column("athena").mask == df.get_column("athena").mask).all()
+    assert roundtrip.get_column("aika").as_list() == df.get_column("aika")
+
+    # Default reads are still in-memory.
+    roundtrip = dl.read_object(dir)
+    assert not isinstance(roundtrip.get_column("alicia"), np.memmap)
+
+
+def test_data_frame_columns():
+    df = BiocFrame(
+        {
+            "akari": [ 1, 2, 3, 4, 5 ],
+            "aika": [ "sydney", "melbourne", "", "perth", "adelaide" ],
+            "liella": BiocFrame({ "first": [ "kanon", "keke", "chisato", "sumire", "ren" ] }),
+            "ai": [ 2.3, 1.2, 5.2, 3.1, -1.2 ],
+        },
+        row_names = [ "kaori", "chihaya", "fuyuki", "azusa", "iori" ],
+        column_data = BiocFrame({ "args": [ 1, 2, 3, 4 ] }),
+        metadata = { "a": 2 }
+    )
+
+    dir = os.path.join(mkdtemp(), "hdf5")
+    dl.save_object(df, dir)
+
+    roundtrip = dl.read_object(dir, data_frame_columns=["ai", 0])
+    assert roundtrip.shape == (5, 2)
+    assert roundtrip.get_column_names().as_list() == ["ai", "akari"]
+    assert list(roundtrip.get_column("ai")) == df.get_column("ai")
+    assert list(roundtrip.get_column("akari")) == df.get_column("akari")
+    assert roundtrip.get_row_names() == df.get_row_names()
+    assert list(roundtrip.get_column_data().get_column("args")) == [4, 1]
+    assert roundtrip.get_metadata()["a"] == 2
+
+    # Other columns are only read if requested.
+    roundtrip = dl.read_object(dir, data_frame_columns=[-2])
+    assert roundtrip.get_column_names().as_list() == ["liella"]
+    assert roundtrip.get_column("liella").get_column("first").as_list() == df.get_column("liella").get_column("first")
+
+    # Skipping everything else.
+    roundtrip = dl.read_object(dir, data_frame_columns=[], data_frame_skip_row_names=True, data_frame_skip_annotations=True)
+    assert roundtrip.shape == (5, 0)
+    assert roundtrip.get_row_names() is None
+    assert roundtrip.get_column_data(with_names=False) is None
+    assert len(roundtrip.get_metadata()) == 0
+
+    with pytest.raises(KeyError, match="no column named"):
+        dl.read_object(dir, data_frame_columns=["foo"])
+    with pytest.raises(IndexError, match="out of range"):
+        dl.read_object(dir, data_frame_columns=[4])
+
+
+def test_data_frame_rows():
+    df = BiocFrame(
+        {
+            "akari": [ 1, 2, None, 4, 5 ],
+            "aika": [ "sydney", "melbourne", "", "perth", "adelaide" ],
+            "alice": Factor.from_sequence([ "sydney", None, "", "perth", "adelaide" ]),
+            "akira": StringList(["A" * 100, "B", None, "D", "E"]),
+            "liella": BiocFrame({ "first": [ "kanon", "keke", "chisato", "sumire", "ren" ] }),
+            "other": [ 1, "b", 3, "d", 5 ], # saved as an external list.
+        },
+        row_names = [ "kaori", "chihaya", "fuyuki", "azusa", "iori" ],
+        column_data = BiocFrame({ "args": [ 1, 2, 3, 4, 5, 6 ] }),
+    )
+
+    dir = os.path.join(mkdtemp(), "hdf5")
+    dl.save_object(df, dir, data_frame_string_list_vls=None)
+
+    def check(rows, expected):
+        roundtrip = dl.read_object(dir, data_frame_rows=rows)
+        assert roundtrip.shape == (len(expected), 6)
+        assert list(roundtrip.get_row_names()) == [df.get_row_names()[i] for i in expected]
+        assert [None if np.ma.is_masked(y) else y for y in roundtrip.get_column("akari")] == [df.get_column("akari")[i] for i in expected]
+        assert roundtrip.get_column("aika").as_list() == [df.get_column("aika")[i] for i in expected]
+        assert list(roundtrip.get_column("alice")) == [df.get_column("alice")[i] for i in expected]
+        assert roundtrip.get_column("akira").as_list() == [df.get_column("akira")[i] for i in expected]
+        assert roundtrip.get_column("liella").get_column("first").as_list() == [df.get_column("liella").get_column("first")[i] for i in expected]
+        assert list(roundtrip.get_column("other")) == [df.get_column("other")[i] for i in expected]
+        assert roundtrip.get_column_data().shape == (6, 1)
+
+    check(slice(1, 4), [1, 2, 3])
+    check([4, 0, 2], [4, 0, 2])
+    check([True, False, False, True, True], [0, 3, 4])
+    check([], [])
+
+    # Works together with column projection.
+    roundtrip = dl.read_object(dir, data_frame_rows=slice(3, None), data_frame_columns=["aika"])
+    assert roundtrip.shape == (2, 1)
+    assert roundtrip.get_column("aika").as_list() == [ "perth", "adelaide" ]
+
+
+def test_data_frame_lazy():
+    df = BiocFrame(
+        {
+            "akari": [ 1, 2, None, 4, 5 ],
+            "aika": [ "sydney", "melbourne", "", "perth", "adelaide" ],
+            "liella": BiocFrame({ "first": [ "kanon", "keke", "chisato", "sumire", "ren" ] }),
+        },
+        row_names = [ "kaori", "chihaya", "fuyuki", "azusa", "iori" ],
+    )
+
+    dir = os.path.join(mkdtemp(), "hdf5")
+    dl.save_object(df, dir)
+
+    loaded = []
+    old = dl.alt_read_object_function()
+    def tracker(path, metadata=None, **kwargs):
+        loaded.append(os.path.basename(path))
+        return old(path, metadata=metadata, **kwargs)
+
+    dl.alt_read_object_function(tracker)
+    try:
+        roundtrip = dl.read_object(dir, data_frame_lazy=True)
+        assert roundtrip.shape == (5, 3)
+        assert roundtrip.get_column_names().as_list() == ["akari", "aika", "liella"]
+        assert loaded == []
+
+        aika = roundtrip.get_column("aika")
+        assert isinstance(aika, dl.DeferredColumn)
+        assert aika.get_type() == "string"
+        assert not aika.is_loaded()
+        assert aika.load().as_list() == df.get_column("aika")
+        assert aika.is_loaded()
+        assert loaded == []
+
+        liella = roundtrip.get_column("liella")
+        assert liella.get_type() == "other"
+        assert liella.load().get_column("first").as_list() == df.get_column("liella").get_column("first")
+        assert loaded == ["2"]
+    finally:
+        dl.alt_read_object_function(old)
+
+    assert [None if np.ma.is_masked(y) else y for y in roundtrip.get_column("akari").load()] == df.get_column("akari")
+
+    # Columns are loaded on demand by indexing, iteration, slicing and printing.
+    roundtrip = dl.read_object(dir, data_frame_lazy=True)
+    assert roundtrip.get_column("aika")[1] == "melbourne"
+    assert list(roundtrip.get_column("aika"))[3] == "perth"
+    sub = roundtrip[0:2, :]
+    assert sub.shape == (2, 3)
+    assert sub.get_column("aika").as_list() == [ "sydney", "melbourne" ]
+    assert sub.get_column("liella").get_column("first").as_list() == [ "kanon", "keke" ]
+    assert list(sub.get_row_names()) == [ "kaori", "chihaya" ]
+
+    roundtrip = dl.read_object(dir, data_frame_lazy=True)
+    printed = str(roundtrip)
+    assert "melbourne" in printed
+    assert "chisato" in printed
+    assert roundtrip.get_column("akari").is_loaded()
+
+    combined = biocutils.combine_rows(dl.read_object(dir, data_frame_lazy=True), df)
+    assert combined.shape == (10, 3)
+    assert combined.get_column("aika").as_list() == df.get_column("aika") * 2
+
+    # No file handles are held between loads, so the file can be replaced.
+    roundtrip = dl.read_object(dir, data_frame_lazy=True, data_frame_rows=[4, 0])
+    sub = roundtrip[:, ["aika"]]
+    shutil.rmtree(dir)
+    dl.save_object(df.set_column("aika", [ "a", "b", "c", "d", "e" ]), dir)
+    assert sub.get_column("aika").load().as_list() == ["e", "a"]
+    assert list(roundtrip.get_column("akari").load()) == [5, 1]
+    assert roundtrip.get_row_names().as_list() == ["iori", "kaori"]
+
+
+def test_data_frame_parallel():
+    df = BiocFrame({
+        "akari": [ 1, 2, None, 4, 5 ] * 5000,
+        "aika": [ "sydney", "melbourne", "", "perth", None ] * 5000,
+        "alice": Factor.from_sequence([ "sydney", None, "", "perth", "adelaide" ] * 5000),
+        "akira": StringList(["A" * 100, "B", None, "D", "E"] * 5000),
+        "liella": BiocFrame({ "first": [ "kanon", "keke", "chisato", "sumire", "ren" ] * 5000 }),
+        "ai": np.ma.array(np.array([ 2.3, -12.8, 5.2, 32, -1.2 ] * 5000), mask=[0, 0, 0, 1, 1] * 5000),
+        "alicia": np.array([ True, False, True, True, False ] * 5000),
+    })
+
+    serial_dir = os.path.join(mkdtemp(), "serial")
+    dl.save_object(df, serial_dir, data_frame_string_list_vls=None)
+    parallel_dir = os.path.join(mkdtemp(), "parallel")
+    dl.save_object(df, parallel_dir, data_frame_string_list_vls=None, data_frame_num_threads=3)
+    assert os.path.exists(os.path.join(parallel_dir, "other_columns", "4"))
+
+    serial = dl.read_object(serial_dir)
+    parallel = dl.read_object(parallel_dir)
+    assert serial.get_column_names() == parallel.get_column_names()
+    for col in ["akari", "ai", "alicia"]:
+        assert (serial.get_column(col) == parallel.get_column(col)).all()
+        assert (np.ma.getmaskarray(serial.get_column(col)) == np.ma.getmaskarray(parallel.get_column(col))).all()
+    for col in ["aika", "akira"]:
+        assert serial.get_column(col) == parallel.get_column(col)
+    assert list(serial.get_column("alice")) == list(parallel.get_column("alice"))
+    assert serial.get_column("liella").get_column("first") == parallel.get_column("liella").get_column("first")
+
+
+def test_data_frame_filters():
+    n = 1000
+    ids = np.arange(n)
+    df = BiocFrame({
+        "akari": ids,
+        "aika": StringList([ None if i % 17 == 0 else "s" + str(i % 10) for i in ids ]),
+        "alice": np.ma.array(ids * 0.5, mask=(ids % 13 == 0)),
+        "ai": Factor.from_sequence([ ["sun", "moon", "star"][i % 3] for i in ids ]),
+        "aria": BiocFrame({ "x": ids * 2 }),
+    }, row_names=[ "r" + str(i) for i in ids ])
+
+    for vls in [ False, True ]:
+        dir = os.path.join(mkdtemp(), "temp")
+        dl.save_object(df, dir, data_frame_string_list_vls=vls)
+
+        roundtrip = dl.read_object(dir, data_frame_filters=[ ("akari", ">=", 100), ("akari", "<", 200), ("ai", "==", "moon") ])
+        expected = [ i for i in range(100, 200) if i % 3 == 1 ]
+        assert roundtrip.shape[0] == len(expected)
+        assert list(roundtrip.get_column("akari")) == expected
+        assert list(roundtrip.get_row_names()) == [ "r" + str(i) for i in expected ]
+        assert list(roundtrip.get_column("ai")) == [ "moon" ] * len(expected)
+        assert list(roundtrip.get_column("aria").get_column("x")) == [ i * 2 for i in expected ]
+
+        # Missing values never match.
+        roundtrip = dl.read_object(dir, data_frame_filters=[ ("aika", "in", [ "s1", "s2" ]), (2, "<", 50) ])
+        expected = [ i for i in range(100) if i % 10 in (1, 2) and i % 17 != 0 and i % 13 != 0 ]
+        assert list(roundtrip.get_column("akari")) == expected
+
+        roundtrip = dl.read_object(dir, data_frame_filters=[ ("aika", "!=", "s1") ])
+        expected = [ i for i in ids if i % 10 != 1 and i % 17 != 0 ]
+        assert list(roundtrip.get_column("akari")) == expected
+
+        # Combined with row selection.
+        roundtrip = dl.read_object(dir, data_frame_rows=slice(500, 600), data_frame_filters=[ ("ai", "not in", [ "sun", "star" ]) ])
+        assert list(roundtrip.get_column("akari")) == [ i for i in range(500, 600) if i % 3 == 1 ]
+
+        # No matches.
+        roundtrip = dl.read_object(dir, data_frame_filters=[ ("akari", ">", 5000) ])
+        assert roundtrip.shape == (0, 5)
+
+    with pytest.raises(NotImplementedError, match="basic columns"):
+        dl.read_object(dir, data_frame_filters=[ ("aria", "==", 1) ])
+    with pytest.raises(ValueError, match="unknown filter operator"):
+        dl.read_object(dir, data_frame_filters=[ ("akari", "~", 1) ])
+    with pytest.raises(KeyError):
+        dl.read_object(dir, data_frame_filters=[ ("foo", "==", 1) ])
+
+
+def test_data_frame_filters_statistics(monkeypatch):
+    df = BiocFrame({ "akari": np.arange(100), "aika": np.arange(100) * 2.0 })
+    dir = os.path.join(mkdtemp(), "temp")
+    dl.save_object(df, dir, data_frame_statistics=True)
+
+    # Unsatisfiable filters are detected from the statistics without reading the columns.
+    import importlib
+    rdf = importlib.import_module("dolomite_base.read_data_frame")
+    calls = []
+    original = rdf._evaluate_filter
+    monkeypatch.setattr(rdf, "_evaluate_filter", lambda *args: calls.append(1) or original(*args))
+
+    roundtrip = dl.read_object(dir, data_frame_filters=[ ("aika", ">", 20), ("akari", "==", 200) ])
+    assert roundtrip.shape[0] == 0
+    assert len(calls) == 0
+
+    roundtrip = dl.read_object(dir, data_frame_filters=[ ("aika", ">", 190), ("akari", "in", [ 98, 500 ]) ])
+    assert list(roundtrip.get_column("akari")) == [ 98 ]
+    assert len(calls) == 2
+
+
+def test_data_frame_list_inference():
+    df = BiocFrame({
+        "akari": [ 1, np.int16(2), None, 4 ],
+        "aika": [ 1.5, np.float32(2), None, 4 ],
+        "alice": [ True, None, False, True ],
+        "ai": [ 2**70, 1, None, 2 ], # promoted to float
+        "alicia": [ "a", None, "NA", "b" ],
+        "aria": [ np.bool_(True), False, True, True ], # treated as other
+    })
+
+    dir = os.path.join(mkdtemp(), "temp")
+    dl.save_object(df, dir)
+    roundtrip = dl.read_object(dir, data_frame_represent_numeric_column_as_1darray=False)
+    assert roundtrip.get_column("akari").as_list() == [ 1, 2, None, 4 ]
+    assert roundtrip.get_column("aika").as_list() == [ 1.5, 2, None, 4 ]
+    assert roundtrip.get_column("alice").as_list() == [ True, None, False, True ]
+    assert roundtrip.get_column("ai").as_list() == [ 2.0**70, 1, None, 2 ]
+    assert roundtrip.get_column("alicia").as_list() == [ "a", None, "NA", "b" ]
+    assert os.path.exists(os.path.join(dir, "other_columns", "5"))
+
+
+def test_data_frame_column_types():
+    df = BiocFrame({
+        "akari": [ 1, 2, None, 4 ],
+        "aika": [ "a", "b", None, "c" ],
+        "alice": [ None, None, None, None ],
+    })
+
+    dir = os.path.join(mkdtemp(), "temp")
+    dl.save_object(df, dir, data_frame_column_types={ "akari": "number", "aika": "string", "alice": "boolean" })
+    roundtrip = dl.read_object(dir, data_frame_represent_numeric_column_as_1darray=False)
+    assert roundtrip.get_column("akari").as_list() == [ 1.0, 2.0, None, 4.0 ]
+    assert isinstance(roundtrip.get_column("akari"), FloatList)
+    assert roundtrip.get_column("aika").as_list() == [ "a", "b", None, "c" ]
+    assert roundtrip.get_column("alice").as_list() == [ None ] * 4
+
+    with pytest.raises(KeyError, match="no column"):
+        dl.save_object(df, os.path.join(mkdtemp(), "temp"), data_frame_column_types={ "foo": "integer" })
+    with pytest.raises(ValueError, match="unknown column type"):
+        dl.save_object(df, os.path.join(mkdtemp(), "temp"), data_frame_column_types={ "akari": "foo" })
+
+    # Hints never change the values.
+    mismatched = BiocFrame({
+        "floats": [ 1.5, 2.7, None ],
+        "ints": [ 0, 5, None ],
+        "mixed": [ 1, "b", None ],
+    })
+    with pytest.raises(ValueError, match="column 'floats'.*'integer'"):
+        dl.save_object(mismatched, os.path.join(mkdtemp(), "temp"), data_frame_column_types={ "floats": "integer" })
+    with pytest.raises(ValueError, match="column 'ints'.*'boolean'"):
+        dl.save_object(mismatched, os.path.join(mkdtemp(), "temp"), data_frame_column_types={ "ints": "boolean" })
+    with pytest.raises(ValueError, match="column 'mixed'.*'string'"):
+        dl.save_object(mismatched, os.path.join(mkdtemp(), "temp"), data_frame_column_types={ "mixed": "string" })
+
+
+def test_data_frame_dictionary_encode():
+    n = 1000
+    df = BiocFrame({
+        "akari": StringList([ None if i % 11 == 0 else ["tokyo", "osaka", "kyoto"][i % 3] for i in range(n) ]),
+        "aika": [ "id" + str(i) for i in range(n) ],
+        "alice": np.array([ "x", "y" ] * (n // 2)),
+    })
+
+    dir = os.path.join(mkdtemp(), "temp")
+    dl.save_object(df, dir, data_frame_dictionary_encode=0.1)
+    dl.validate_object(dir)
+    with h5py.File(os.path.join(dir, "basic_columns.h5"), "r") as handle:
+        dhandle = handle["data_frame/data"]
+        assert dhandle["0"].attrs["type"] == "factor"
+        assert dhandle["1"].attrs["type"] == "string"
+        assert dhandle["2"].attrs["type"] == "factor"
+
+    roundtrip = dl.read_object(dir)
+    fac = roundtrip.get_column("akari")
+    assert isinstance(fac, Factor)
+    assert list(fac.get_levels()) == [ "kyoto", "osaka", "tokyo" ]
+    assert list(fac) == df.get_column("akari").as_list()
+    assert roundtrip.get_column("aika").as_list() == df.get_column("aika")
+
+    roundtrip = dl.read_object(dir, data_frame_decode_dictionary=True)
+    assert isinstance(roundtrip.get_column("akari"), StringList)
+    assert roundtrip.get_column("akari") == df.get_column("akari")
+    assert roundtrip.get_column("alice").as_list() == list(df.get_column("alice"))
+
+    roundtrip = dl.read_object(dir, data_frame_decode_dictionary=True, data_frame_compact_strings=True, data_frame_rows=[ 0, 1, 2 ])
+    assert isinstance(roundtrip.get_column("akari"), dl.CompactStringVector)
+    assert roundtrip.get_column("akari").as_list() == [ None, "osaka", "kyoto" ]
+
+    # Explicit factors are left alone.
+    df = BiocFrame({ "akari": Factor([ 0, 1, 0 ], [ "A", "B" ]) })
+    dir = os.path.join(mkdtemp(), "temp")
+    dl.save_object(df, dir, data_frame_dictionary_encode=0.5)
+    roundtrip = dl.read_object(dir, data_frame_decode_dictionary=True)
+    assert isinstance(roundtrip.get_column("akari"), Factor)
@@ -0,0 +1,124 @@
+from biocutils import Factor
+import dolomite_base as dl
+import numpy as np
+import os
+from tempfile import mkdtemp
+import pytest
+
+pd = pytest.importorskip("pandas")
+
+
+def test_data_frame_pandas_registered():
+    assert dl.save_object.dispatch(pd.DataFrame) is dl.save_data_frame_from_pandas
+
+
+def test_data_frame_pandas_basic():
+    df = pd.DataFrame({
+        "akari": np.arange(10, dtype=np.int32),
+        "aika": np.random.rand(10),
+        "alice": np.arange(10) % 2 == 0,
+        "ai": [ "x" + str(i) for i in range(10) ],
+        "aria": pd.Categorical([ "sun", "moon" ] * 5, categories=[ "sun", "moon", "star" ], ordered=True),
+    })
+
+    dir = os.path.join(mkdtemp(), "temp")
+    dl.save_object(df, dir)
+    dl.validate_object(dir)
+
+    # Reading back as a BiocFrame.
+    roundtrip = dl.read_object(dir)
+    assert list(roundtrip.get_column_names()) == list(df.columns)
+    assert roundtrip.get_row_names() is None
+    assert (roundtrip.get_column("akari") == df["akari"].to_numpy()).all()
+    assert (roundtrip.get_column("aika") == df["aika"].to_numpy()).all()
+    assert roundtrip.get_column("alice").dtype == np.bool_
+    assert roundtrip.get_column("ai").as_list() == list(df["ai"])
+    fac = roundtrip.get_column("aria")
+    assert isinstance(fac, Factor)
+    assert list(fac.get_levels()) == [ "sun", "moon", "star" ]
+    assert fac.get_ordered()
+
+    # Reading back as a pandas frame.
+    roundtrip = dl.read_object(dir, data_frame_as_pandas=True)
+    assert isinstance(roundtrip, pd.DataFrame)
+    assert isinstance(roundtrip.index, pd.RangeIndex)
+    assert roundtrip["akari"].dtype == np.int32
+    assert roundtrip["alice"].dtype == np.bool_
+    assert list(roundtrip["aria"].cat.categories) == [ "sun", "moon", "star" ]
+    assert roundtrip["aria"].cat.ordered
+    pd.testing.assert_frame_equal(roundtrip, df, check_dtype=False)
+
+
+def test_data_frame_pandas_missing():
+    df = pd.DataFrame({
+        "int": pd.array([ 1, None, 3 ], dtype="Int32"),
+        "num": pd.array([ 1.5, 2.5, None ], dtype="Float64"),
+        "bool": pd.array([ True, None, False ], dtype="boolean"),
+        "str": pd.array([ "A", None, "NA" ], dtype="string"),
+        "obj": np.array([ "B", None, "C" ], dtype=object),
+        "cat": pd.Categorical([ "a", None, "b" ]),
+    }, index=[ "x", "y", "z" ])
+    df.attrs["foo"] = "bar"
+
+    dir = os.path.join(mkdtemp(), "temp")
+    dl.save_object(df, dir, data_frame_statistics=True)
+    dl.validate_object(dir)
+
+    roundtrip = dl.read_object(dir, data_frame_represent_numeric_column_as_1darray=False)
+    assert list(roundtrip.get_row_names()) == [ "x", "y", "z" ]
+    assert roundtrip.get_column("int").as_list() == [ 1, None, 3 ]
+    assert roundtrip.get_column("num").as_list() == [ 1.5, 2.5, None ]
+    assert roundtrip.get_column("bool").as_list() == [ True, None, False ]
+    assert roundtrip.get_column("str").as_list() == [ "A", None, "NA" ]
+    assert roundtrip.get_column("obj").as_list() == [ "B", None, "C" ]
+    assert list(roundtrip.get_column("cat")) == [ "a", None, "b" ]
+    assert roundtrip.get_metadata()["foo"] == "bar"
+
+    statistics = dl.read_statistics(dir)
+    assert statistics.get_column("null_count") == [ 1 ] * 6
+
+    roundtrip = dl.read_object(dir, data_frame_as_pandas=True)
+    assert list(roundtrip.index) == [ "x", "y", "z" ]
+    assert roundtrip["int"].dtype == "Int32"
+    assert roundtrip["int"].isna().tolist() == [ False, True, False ]
+    assert roundtrip["num"].dtype == "Float64"
+    assert roundtrip["bool"].dtype == "boolean"
+    assert roundtrip["str"].isna().tolist() == [ False, True, False ]
+    assert list(roundtrip["str"].dropna()) == [ "A", "NA" ]
+    assert list(roundtrip["cat"].cat.codes) == [ 0, -1, 1 ]
+    assert roundtrip.attrs["foo"] == "bar"
+
+    # Other options are respected.
+    roundtrip = dl.read_object(dir, data_frame_as_pandas=True, data_frame_columns=[ "num", "cat" ], data_frame_rows=[ 2, 0 ])
+    assert list(roundtrip.columns) == [ "num", "cat" ]
+    assert list(roundtrip.index) == [ "z", "x" ]
+    assert roundtrip["num"].isna().tolist() == [ True, False ]
+
+
+def test_data_frame_pandas_other():
+    # Mixed object columns are saved as external lists.
+    df = pd.DataFrame({ "mixed": pd.Series([ 1, "a", None ], dtype=object), "x": [ 1.0, 2.0, 3.0 ] })
+    dir = os.path.join(mkdtemp(), "temp")
+    dl.save_object(df, dir, data_frame_num_threads=2)
+    assert os.path.exists(os.path.join(dir, "other_columns", "0"))
+    roundtrip = dl.read_object(dir)
+    assert roundtrip.get_column("mixed").as_list() == [ 1, "a", None ]
+
+    roundtrip = dl.read_object(dir, data_frame_as_pandas=True)
+    assert list(roundtrip["mixed"]) == [ 1, "a", None ]
+    assert roundtrip["x"].dtype == np.float64
+
+
+def test_data_frame_pandas_nested():
+    from biocframe import BiocFrame
+
+    df = BiocFrame({ "x": [ 1, 2 ], "nested": BiocFrame({ "z": [ 0, 1 ] }) })
+    dir = os.path.join(mkdtemp(), "temp")
+    dl.save_object(df, dir)
+
+    with pytest.raises(ValueError, match="column 'nested' of type 'BiocFrame' cannot be represented"):
+        dl.read_object(dir, data_frame_as_pandas=True)
+
+    # Skipping the nested column is fine.
+    roundtrip = dl.read_object(dir, data_frame_as_pandas=True, data_frame_columns=[ "x" ])
+    assert list(roundtrip["x"]) == [ 1, 2 ]
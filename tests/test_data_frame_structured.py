@@ -0,0 +1,93 @@
+import dolomite_base as dl
+import numpy as np
+import h5py
+import os
+from tempfile import mkdtemp
+import pytest
+
+
+def _make_records(n):
+    x = np.empty(n, dtype=[ ("akari", "i4"), ("aika", "f8"), ("alice", "?"), ("ai", "U10"), ("aria", "S5") ])
+    x["akari"] = np.arange(n)
+    x["aika"] = np.arange(n) * 0.5
+    x["alice"] = np.arange(n) % 3 == 0
+    x["ai"] = [ "é" * (i % 4) + str(i) for i in range(n) ]
+    x["aria"] = [ b"x" * (i % 5) for i in range(n) ]
+    return x
+
+
+def test_data_frame_structured_basic():
+    x = _make_records(50)
+    for y in [ x, x.view(np.recarray) ]:
+        dir = os.path.join(mkdtemp(), "temp")
+        dl.save_object(y, dir)
+        dl.validate_object(dir)
+
+        roundtrip = dl.read_object(dir)
+        assert list(roundtrip.get_column_names()) == [ "akari", "aika", "alice", "ai", "aria" ]
+        assert roundtrip.get_row_names() is None
+        assert (roundtrip.get_column("akari") == x["akari"]).all()
+        assert (roundtrip.get_column("aika") == x["aika"]).all()
+        assert (roundtrip.get_column("alice") == x["alice"]).all()
+        assert roundtrip.get_column("ai").as_list() == x["ai"].tolist()
+        assert roundtrip.get_column("aria").as_list() == [ y.decode() for y in x["aria"] ]
+
+    # Works with the other options.
+    dir = os.path.join(mkdtemp(), "temp")
+    dl.save_object(x, dir, data_frame_string_list_vls=True, data_frame_statistics=True, data_frame_num_threads=2)
+    dl.validate_object(dir)
+    with h5py.File(os.path.join(dir, "basic_columns.h5"), "r") as handle:
+        assert handle["data_frame/data/3"].attrs["type"] == "vls"
+    roundtrip = dl.read_object(dir)
+    assert roundtrip.get_column("ai").as_list() == x["ai"].tolist()
+    statistics = dl.read_statistics(dir)
+    assert statistics.get_column("max")[3] == max(x["ai"].tolist())
+    assert statistics.get_column("min")[4] == ""
+
+    dir = os.path.join(mkdtemp(), "temp")
+    dl.save_object(x, dir, data_frame_dictionary_encode=0.2)
+    dl.validate_object(dir)
+    roundtrip = dl.read_object(dir, data_frame_decode_dictionary=True)
+    assert roundtrip.get_column("aria").as_list() == [ y.decode() for y in x["aria"] ]
+
+
+def test_data_frame_structured_masked():
+    x = np.ma.array(_make_records(5))
+    x["akari"][1] = np.ma.masked
+    x["ai"][2] = np.ma.masked
+    x["aria"][[0, 3]] = np.ma.masked
+
+    dir = os.path.join(mkdtemp(), "temp")
+    dl.save_object(x, dir)
+    dl.validate_object(dir)
+    roundtrip = dl.read_object(dir, data_frame_represent_numeric_column_as_1darray=False)
+    assert roundtrip.get_column("akari").as_list() == [ 0, None, 2, 3, 4 ]
+    assert roundtrip.get_column("ai").as_list() == [ "0", "é1", None, "ééé3", "4" ]
+    assert roundtrip.get_column("aria").as_list() == [ None, "x", "xx", None, "xxxx" ]
+
+
+def test_data_frame_structured_other():
+    # Nested structured fields are saved as nested data frames.
+    x = np.zeros(3, dtype=[ ("a", "i4"), ("b", [ ("c", "f8"), ("d", "U2") ]) ])
+    x["b"]["d"] = [ "A", "B", "C" ]
+    dir = os.path.join(mkdtemp(), "temp")
+    dl.save_object(x, dir)
+    dl.validate_object(dir)
+    roundtrip = dl.read_object(dir)
+    assert roundtrip.get_column("b").get_column("d").as_list() == [ "A", "B", "C" ]
+
+    with pytest.raises(ValueError, match="1-dimensional"):
+        dl.save_data_frame_from_structured_array(np.zeros((2, 2), dtype=[ ("a", "i4") ]), os.path.join(mkdtemp(), "temp"))
+    with pytest.raises(ValueError, match="structured"):
+        dl.save_data_frame_from_structured_array(np.zeros(2), os.path.join(mkdtemp(), "temp"))
+
+
+def test_data_frame_structured_dispatch():
+    # Plain arrays are still sent to dolomite_matrix.
+    try:
+        import dolomite_matrix
+    except ImportError:
+        with pytest.raises(ModuleNotFoundError, match="dolomite_matrix"):
+            dl.save_object(np.zeros(2), os.path.join(mkdtemp(), "temp"))
+    else:
+        pytest.skip("dolomite_matrix is installed")
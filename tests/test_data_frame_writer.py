@@ -0,0 +1,207 @@
+from biocframe import BiocFrame
+from biocutils import Factor, StringList, IntegerList, combine_rows
+import dolomite_base as dl
+import numpy as np
+import os
+import h5py
+from tempfile import mkdtemp
+import pytest
+
+
+def _make_batch(start, n):
+    ids = np.arange(start, start + n)
+    return BiocFrame({
+        "akari": ids.astype(np.int32),
+        "aika": [ "x" * (i % 7) + str(i) for i in ids ],
+        "alice": (ids % 3 == 0),
+        "ai": ids * 0.5,
+        "aria": Factor.from_sequence([ ["sun", "moon", "star"][i % 3] for i in ids ]),
+    }, row_names=[ "row" + str(i) for i in ids ])
+
+
+def test_data_frame_writer_basic():
+    dir = os.path.join(mkdtemp(), "temp")
+    batches = [ _make_batch(0, 100), _make_batch(100, 57), _make_batch(157, 0), _make_batch(157, 250) ]
+    with dl.DataFrameWriter(dir, chunk_size=64) as writer:
+        for b in batches:
+            writer.append(b)
+    dl.validate_object(dir)
+    assert dl.read_object_file(dir)["data_frame"]["version"] == "1.1"
+
+    roundtrip = dl.read_object(dir)
+    assert roundtrip.shape == (407, 5)
+    assert list(roundtrip.get_column_names()) == [ "akari", "aika", "alice", "ai", "aria" ]
+    assert list(roundtrip.get_row_names()) == [ "row" + str(i) for i in range(407) ]
+    assert sorted(os.listdir(dir)) == [ "OBJECT", "basic_columns.h5" ]
+    with h5py.File(os.path.join(dir, "basic_columns.h5"), "r") as handle:
+        assert handle["data_frame"]["row_names"].dtype == np.dtype("S6")
+    assert (roundtrip.get_column("akari") == np.arange(407)).all()
+    assert roundtrip.get_column("aika").as_list() == [ "x" * (i % 7) + str(i) for i in range(407) ]
+    assert (roundtrip.get_column("alice") == (np.arange(407) % 3 == 0)).all()
+    assert (roundtrip.get_column("ai") == np.arange(407) * 0.5).all()
+    assert list(roundtrip.get_column("aria")) == [ ["sun", "moon", "star"][i % 3] for i in range(407) ]
+
+    # Same as saving everything at once.
+    full = combine_rows(*batches)
+    dir2 = os.path.join(mkdtemp(), "temp")
+    dl.save_object(full, dir2)
+    expected = dl.read_object(dir2)
+    assert roundtrip.get_column("aika").as_list() == expected.get_column("aika").as_list()
+    assert list(roundtrip.get_column("aria")) == list(expected.get_column("aria"))
+
+
+def test_data_frame_writer_missing():
+    dir = os.path.join(mkdtemp(), "temp")
+    with dl.DataFrameWriter(dir) as writer:
+        writer.append(BiocFrame({
+            "int": [ 1, None, 3 ],
+            "num": [ 1.5, 2, None ],
+            "bool": [ True, None, False ],
+            "str": [ "A", None, "NA_" ],
+            "fac": Factor([0, -1, 1], ["a", "b"]),
+        }))
+
+        # Strings that clash with the placeholder are handled correctly,
+        # and factor levels are accumulated across batches.
+        writer.append(BiocFrame({
+            "int": IntegerList([ None, 5 ]),
+            "num": np.ma.array([ 1.0, 2.0 ], mask=[True, False]),
+            "bool": [ None, True ],
+            "str": StringList([ "NA", None ]),
+            "fac": Factor([1, 0], ["c", "b"]),
+        }))
+    dl.validate_object(dir)
+
+    roundtrip = dl.read_object(dir, data_frame_represent_numeric_column_as_1darray=False)
+    assert roundtrip.get_column("int").as_list() == [ 1, None, 3, None, 5 ]
+    assert roundtrip.get_column("num").as_list() == [ 1.5, 2, None, None, 2 ]
+    assert roundtrip.get_column("bool").as_list() == [ True, None, False, None, True ]
+    assert roundtrip.get_column("str").as_list() == [ "A", None, "NA_", "NA", None ]
+    fac = roundtrip.get_column("fac")
+    assert list(fac.get_levels()) == [ "a", "b", "c" ]
+    assert list(fac) == [ "a", None, "b", "b", "c" ]
+
+
+
+def _get_placeholder(dir, index):
+    with h5py.File(os.path.join(dir, "basic_columns.h5"), "r") as handle:
+        dhandle = handle["data_frame"]["data"][str(index)]
+        return dhandle.dtype, dhandle.attrs["type"], dhandle.attrs.get("missing-value-placeholder")
+
+
+def test_data_frame_writer_integer_placeholder():
+    imin = np.iinfo(np.int32).min
+    imax = np.iinfo(np.int32).max
+
+    # Placeholder is chosen to avoid the values in the same batch.
+    dir = os.path.join(mkdtemp(), "temp")
+    with dl.DataFrameWriter(dir) as writer:
+        writer.append(BiocFrame({ "A": [ imin, None, 5 ] }))
+        writer.append(BiocFrame({ "A": [ None, 6 ] }))
+    dl.validate_object(dir)
+    assert _get_placeholder(dir, 0)[2] == imax
+    roundtrip = dl.read_object(dir, data_frame_represent_numeric_column_as_1darray=False)
+    assert roundtrip.get_column("A").as_list() == [ imin, None, 5, None, 6 ]
+
+    # Placeholder is replaced if a later batch contains it.
+    dir = os.path.join(mkdtemp(), "temp")
+    with dl.DataFrameWriter(dir, chunk_size=2) as writer:
+        writer.append(BiocFrame({ "A": [ 1, None, 2, None, 3 ] }))
+        writer.append(BiocFrame({ "A": [ imin, None ] }))
+        writer.append(BiocFrame({ "A": [ imax, None ] }))
+    dl.validate_object(dir)
+    dtype, type, placeholder = _get_placeholder(dir, 0)
+    assert dtype == np.int32
+    assert type == "integer"
+    assert placeholder == 0
+    roundtrip = dl.read_object(dir, data_frame_represent_numeric_column_as_1darray=False)
+    assert roundtrip.get_column("A").as_list() == [ 1, None, 2, None, 3, imin, None, imax, None ]
+
+
+def test_data_frame_writer_integer_promotion():
+    # Values outside the 32-bit range promote the column to floats.
+    dir = os.path.join(mkdtemp(), "temp")
+    with dl.DataFrameWriter(dir, chunk_size=2) as writer:
+        writer.append(BiocFrame({ "A": [ 1, None, 3 ] }))
+        writer.append(BiocFrame({ "A": np.array([ 2**40, 4 ]) }))
+        writer.append(BiocFrame({ "A": [ None, 2**70 ] }))
+        writer.append(BiocFrame({ "A": IntegerList([ 5, None ]) }))
+    dl.validate_object(dir)
+    dtype, type, placeholder = _get_placeholder(dir, 0)
+    assert dtype == np.float64
+    assert type == "number"
+    assert np.isnan(placeholder)
+    roundtrip = dl.read_object(dir, data_frame_represent_numeric_column_as_1darray=False)
+    assert roundtrip.get_column("A").as_list() == [ 1, None, 3, 2**40, 4, None, 2**70, 5, None ]
+
+    # Same as saving everything at once.
+    full = BiocFrame({ "A": [ 1, None, 3, 2**40, 4, None, 2**70, 5, None ] })
+    dir2 = os.path.join(mkdtemp(), "temp")
+    dl.save_object(full, dir2)
+    assert _get_placeholder(dir2, 0)[1] == "number"
+
+    # Without any missing values.
+    dir = os.path.join(mkdtemp(), "temp")
+    with dl.DataFrameWriter(dir) as writer:
+        writer.append(BiocFrame({ "A": [ 1, 2 ] }))
+        writer.append(BiocFrame({ "A": [ -2**40 ] }))
+    dl.validate_object(dir)
+    assert _get_placeholder(dir, 0)[2] is None
+    assert list(dl.read_object(dir).get_column("A")) == [ 1, 2, -2**40 ]
+
+
+def test_data_frame_writer_float_placeholder():
+    # NaNs and missing values in the same batch.
+    dir = os.path.join(mkdtemp(), "temp")
+    with dl.DataFrameWriter(dir) as writer:
+        writer.append(BiocFrame({ "A": [ 1.5, np.nan, None ] }))
+        writer.append(BiocFrame({ "A": [ None, 2.5 ] }))
+    dl.validate_object(dir)
+    assert _get_placeholder(dir, 0)[2] == np.inf
+    roundtrip = dl.read_object(dir, data_frame_represent_numeric_column_as_1darray=False).get_column("A").as_list()
+    assert roundtrip[0] == 1.5
+    assert np.isnan(roundtrip[1])
+    assert roundtrip[2:] == [ None, None, 2.5 ]
+
+    # NaNs and the placeholder in later batches.
+    dir = os.path.join(mkdtemp(), "temp")
+    with dl.DataFrameWriter(dir, chunk_size=2) as writer:
+        writer.append(BiocFrame({ "A": [ 1.0, None, 2.0, None, 3.0 ] }))
+        writer.append(BiocFrame({ "A": np.array([ np.nan, 4.0 ]) }))
+        writer.append(BiocFrame({ "A": [ np.inf, None ] }))
+    dl.validate_object(dir)
+    assert _get_placeholder(dir, 0)[2] == -np.inf
+    roundtrip = dl.read_object(dir, data_frame_represent_numeric_column_as_1darray=False).get_column("A").as_list()
+    assert roundtrip[:5] == [ 1.0, None, 2.0, None, 3.0 ]
+    assert np.isnan(roundtrip[5])
+    assert roundtrip[6:] == [ 4.0, np.inf, None ]
+
+def test_data_frame_writer_errors():
+    dir = os.path.join(mkdtemp(), "temp")
+    writer = dl.DataFrameWriter(dir)
+    writer.append(BiocFrame({ "A": [ 1, 2, 3 ], "B": [ "a", "b", "c" ] }))
+
+    with pytest.raises(ValueError, match="column names"):
+        writer.append(BiocFrame({ "B": [ "a" ], "A": [ 1 ] }))
+    with pytest.raises(ValueError, match="expected an integer"):
+        writer.append(BiocFrame({ "A": [ 1.5 ], "B": [ "a" ] }))
+    with pytest.raises(ValueError, match="row names"):
+        writer.append(BiocFrame({ "A": [ 1 ], "B": [ "a" ] }, row_names=[ "x" ]))
+
+    # Failed appends do not modify the output.
+    writer.append(BiocFrame({ "A": [ 4 ], "B": [ "d" ] }))
+    writer.close()
+    with pytest.raises(ValueError, match="closed"):
+        writer.append(BiocFrame({ "A": [ 4 ], "B": [ "d" ] }))
+
+    roundtrip = dl.read_object(dir)
+    assert list(roundtrip.get_column("A")) == [ 1, 2, 3, 4 ]
+    assert roundtrip.get_column("B").as_list() == [ "a", "b", "c", "d" ]
+
+    # Aborted writes do not create an OBJECT file.
+    dir = os.path.join(mkdtemp(), "temp")
+    with pytest.raises(RuntimeError):
+        with dl.DataFrameWriter(dir) as writer:
+            writer.append(BiocFrame({ "A": [ 1, 2, 3 ] }))
+            raise RuntimeError("oops")
+    assert not os.path.exists(os.path.join(dir, "OBJECT"))
@@ -0,0 +1,178 @@
+from biocframe import BiocFrame
+from biocutils import Factor, StringList
+import dolomite_base as dl
+import numpy as np
+import os
+from tempfile import mkdtemp
+import pytest
+
+
+def _save_example():
+    df = BiocFrame({
+        "akari": [ 1, 2, 3 ],
+        "aika": BiocFrame({ "x": [ "a", "b", "c" ] }),
+        "alice": Factor([ 0, 1, 0 ], [ "sun", "moon" ]),
+        "ai": [ 2.3, 1.2, 5.2 ],
+    })
+    df = df.set_column_data(BiocFrame({ "foo": np.array([ 1, 2, 3, 4 ]), "bar": [ "A", "B", "C", "D" ] }))
+    dir = os.path.join(mkdtemp(), "temp")
+    dl.save_object(df, dir)
+    return dir
+
+
+def test_set_data_frame_column_replace():
+    dir = _save_example()
+
+    # Replacing a basic column with another basic column.
+    dl.set_data_frame_column(dir, "akari", [ "x", "y", "z" ])
+    dl.validate_object(dir)
+    roundtrip = dl.read_object(dir)
+    assert roundtrip.get_column("akari").as_list() == [ "x", "y", "z" ]
+    assert roundtrip.get_column("ai").tolist() == [ 2.3, 1.2, 5.2 ]
+
+    # Replacing an other column with a basic column.
+    dl.set_data_frame_column(dir, 1, np.array([ 5, 6, 7 ]))
+    dl.validate_object(dir)
+    assert not os.path.exists(os.path.join(dir, "other_columns"))
+    roundtrip = dl.read_object(dir)
+    assert roundtrip.get_column("aika").tolist() == [ 5, 6, 7 ]
+
+    # Replacing a basic column with an other column.
+    dl.set_data_frame_column(dir, "ai", BiocFrame({ "y": [ 1.5, 2.5, 3.5 ] }))
+    dl.validate_object(dir)
+    assert os.path.exists(os.path.join(dir, "other_columns", "3"))
+    roundtrip = dl.read_object(dir)
+    assert roundtrip.get_column("ai").get_column("y").tolist() == [ 1.5, 2.5, 3.5 ]
+    assert list(roundtrip.get_column_names()) == [ "akari", "aika", "alice", "ai" ]
+    assert list(roundtrip.get_column_data().get_column("bar")) == [ "A", "B", "C", "D" ]
+
+    # VLS columns upgrade the version.
+    dl.set_data_frame_column(dir, "akari", StringList([ "x" * 100, "y", None ]), data_frame_string_list_vls=True)
+    dl.validate_object(dir)
+    assert dl.read_object_file(dir)["data_frame"]["version"] == "1.1"
+    roundtrip = dl.read_object(dir)
+    assert roundtrip.get_column("akari").as_list() == [ "x" * 100, "y", None ]
+
+    with pytest.raises(ValueError, match="length"):
+        dl.set_data_frame_column(dir, "akari", [ 1, 2 ])
+    with pytest.raises(IndexError, match="out of range"):
+        dl.set_data_frame_column(dir, 10, [ 1, 2, 3 ])
+
+
+def test_set_data_frame_column_add():
+    dir = _save_example()
+    dl.set_data_frame_column(dir, "aria", [ True, False, None ])
+    dl.set_data_frame_column(dir, "alicia", BiocFrame({ "z": [ 1, 2, 3 ] }))
+    dl.validate_object(dir)
+
+    roundtrip = dl.read_object(dir)
+    assert list(roundtrip.get_column_names()) == [ "akari", "aika", "alice", "ai", "aria", "alicia" ]
+    assert roundtrip.get_column("aria").tolist() == [ True, False, None ]
+    assert roundtrip.get_column("alicia").get_column("z").tolist() == [ 1, 2, 3 ]
+    assert list(roundtrip.get_column("alice")) == [ "sun", "moon", "sun" ]
+
+    mcols = roundtrip.get_column_data()
+    assert mcols.shape[0] == 6
+    assert list(mcols.get_column("bar")) == [ "A", "B", "C", "D", None, None ]
+    assert mcols.get_column("foo").mask.tolist() == [ False, False, False, False, True, True ]
+
+
+def _check_unchanged(dir, before):
+    dl.validate_object(dir)
+    assert sorted(os.listdir(dir)) == before
+    assert dl.read_object_file(dir)["data_frame"]["version"] == "1.0"
+    roundtrip = dl.read_object(dir)
+    assert list(roundtrip.get_column_names()) == [ "akari", "aika", "alice", "ai" ]
+    assert roundtrip.get_column("akari").tolist() == [ 1, 2, 3 ]
+    assert roundtrip.get_column("aika").get_column("x").as_list() == [ "a", "b", "c" ]
+    assert list(roundtrip.get_column("alice")) == [ "sun", "moon", "sun" ]
+    assert roundtrip.get_column("ai").tolist() == [ 2.3, 1.2, 5.2 ]
+    assert list(roundtrip.get_column_data().get_column("bar")) == [ "A", "B", "C", "D" ]
+
+
+def test_set_data_frame_column_revert(monkeypatch):
+    dir = _save_example()
+    before = sorted(os.listdir(dir))
+
+    # Lengths are checked for all kinds of columns.
+    with pytest.raises(ValueError, match="length"):
+        dl.set_data_frame_column(dir, "aika", BiocFrame({ "x": [ 1, 2 ] }))
+    with pytest.raises(ValueError, match="length"):
+        dl.set_data_frame_column(dir, "alice", Factor([ 0, 1 ], [ "a", "b" ]))
+
+    # Only the new column is validated, not the entire data frame.
+    validated = []
+    original = dl.edit_data_frame.validate_object
+    def tracker(path):
+        validated.append(path)
+        original(path)
+    with monkeypatch.context() as m:
+        m.setattr(dl.edit_data_frame, "validate_object", tracker)
+        dl.set_data_frame_column(dir, "aria", [ 4, 5, 6 ])
+        dl.set_data_frame_column(dir, "aria", BiocFrame({ "y": [ 1, 2, 3 ] }))
+    assert len(validated) == 2
+    assert dir not in validated
+    assert validated[1] == os.path.join(dir, "other_columns", "4.tmp")
+    dl.remove_data_frame_column(dir, "aria")
+    _check_unchanged(dir, before)
+
+    # Nothing is modified if the new column fails validation.
+    def failing(path):
+        raise ValueError("failed validation")
+    with monkeypatch.context() as m:
+        m.setattr(dl.edit_data_frame, "validate_object", failing)
+        for column, value in [ ("akari", [ 4, 5, 6 ]), ("ai", BiocFrame({ "y": [ 1, 2, 3 ] })) ]:
+            with pytest.raises(ValueError, match="failed validation"):
+                dl.set_data_frame_column(dir, column, value)
+    _check_unchanged(dir, before)
+
+    # Edits are reverted if a later step fails.
+    def failing_layout(*args):
+        raise ValueError("failed layout")
+    with monkeypatch.context() as m:
+        m.setattr(dl.edit_data_frame, "_check_data_frame_layout", failing_layout)
+        for column, value in [
+            ("akari", StringList([ "x" * 100, "y", None ])),
+            ("aika", [ 4, 5, 6 ]),
+            ("ai", BiocFrame({ "y": [ 1, 2, 3 ] })),
+            ("aria", [ True, False, None ]),
+        ]:
+            with pytest.raises(ValueError, match="failed layout"):
+                dl.set_data_frame_column(dir, column, value, data_frame_string_list_vls=True)
+    _check_unchanged(dir, before)
+
+
+def test_remove_data_frame_column_revert(monkeypatch):
+    dir = _save_example()
+    before = sorted(os.listdir(dir))
+
+    def failing(*args, **kwargs):
+        raise ValueError("failed annotations")
+    with monkeypatch.context() as m:
+        m.setattr(dl.edit_data_frame, "alt_save_object", failing)
+        for column in [ "akari", "aika", "ai" ]:
+            with pytest.raises(ValueError, match="failed annotations"):
+                dl.remove_data_frame_column(dir, column)
+    _check_unchanged(dir, before)
+
+
+def test_remove_data_frame_column():
+    dir = _save_example()
+    dl.remove_data_frame_column(dir, "akari")
+    dl.validate_object(dir)
+
+    roundtrip = dl.read_object(dir)
+    assert list(roundtrip.get_column_names()) == [ "aika", "alice", "ai" ]
+    assert roundtrip.get_column("aika").get_column("x").as_list() == [ "a", "b", "c" ]
+    assert list(roundtrip.get_column("alice")) == [ "sun", "moon", "sun" ]
+    assert list(roundtrip.get_column_data().get_column("bar")) == [ "B", "C", "D" ]
+
+    dl.remove_data_frame_column(dir, 0)
+    dl.validate_object(dir)
+    assert not os.path.exists(os.path.join(dir, "other_columns"))
+    roundtrip = dl.read_object(dir)
+    assert list(roundtrip.get_column_names()) == [ "alice", "ai" ]
+    assert roundtrip.get_column("ai").tolist() == [ 2.3, 1.2, 5.2 ]
+
+    with pytest.raises(KeyError, match="no column"):
+        dl.remove_data_frame_column(dir, "akari")
@@ -4,6 +4,7 @@ import h5py
 import numpy
 import os
 import biocutils
+import pytest
 
 
 def test_load_vector_from_hdf5_strings():
@@ -140,3 +141,80 @@ def test_load_vector_from_hdf5_booleans():
         assert isinstance(foo2, numpy.ndarray)
         assert list(foo2.data) == [True, True, True, False]
         assert list(foo2.mask) == [False, False, True, False]
+
+
+def test_load_vector_from_hdf5_rows():
+    path = os.path.join(mkdtemp(), "foo.h5")
+    values = numpy.arange(10000, dtype=numpy.int32)
+    with h5py.File(path, "w") as handle:
+        ghandle = handle.create_group("yourmom")
+        ghandle.create_dataset("FOO1", data=values, chunks=(100,), compression="gzip")
+        ghandle.create_dataset("FOO2", data=values) # contiguous.
+        dl.write_integer_vector_to_hdf5(ghandle, "FOO3", [1, 2, None, 4, 5])
+        dl.write_string_vector_to_hdf5(ghandle, "FOO4", ["A", "B", None, "D", "E"])
+
+    with h5py.File(path, "r") as handle:
+        ghandle = handle["yourmom"]
+        for name in ["FOO1", "FOO2"]:
+            sub = dl.load_vector_from_hdf5(ghandle[name], int, report_1darray=True, rows=slice(10, 5000, 7))
+            assert (sub == values[10:5000:7]).all()
+
+            sub = dl.load_vector_from_hdf5(ghandle[name], int, report_1darray=True, rows=slice(None, None, -3))
+            assert (sub == values[::-3]).all()
+
+            idx = [0, 5, 99, 100, 101, 5000, 9999]
+            sub = dl.load_vector_from_hdf5(ghandle[name], int, report_1darray=True, rows=idx)
+            assert (sub == values[idx]).all()
+
+            idx = [9999, 5, 5, 0] # unsorted and duplicated indices.
+            sub = dl.load_vector_from_hdf5(ghandle[name], int, report_1darray=True, rows=idx)
+            assert (sub == values[idx]).all()
+
+            mask = values % 997 == 0
+            sub = dl.load_vector_from_hdf5(ghandle[name], int, report_1darray=False, rows=mask)
+            assert isinstance(sub, biocutils.IntegerList)
+            assert sub.as_list() == list(values[mask])
+
+            sub = dl.load_vector_from_hdf5(ghandle[name], int, report_1darray=True, rows=[])
+            assert len(sub) == 0
+
+        foo3 = dl.load_vector_from_hdf5(ghandle["FOO3"], int, report_1darray=False, rows=[1, 2, 4])
+        assert foo3.as_list() == [2, None, 5]
+        foo3 = dl.load_vector_from_hdf5(ghandle["FOO3"], int, report_1darray=True, rows=slice(1, 3))
+        assert list(foo3.mask) == [False, True]
+
+        foo4 = dl.load_vector_from_hdf5(ghandle["FOO4"], str, report_1darray=False, rows=[4, 2, 0])
+        assert foo4.as_list() == ["E", None, "A"]
+
+        with pytest.raises(IndexError, match="out-of-range"):
+            dl.load_vector_from_hdf5(ghandle["FOO3"], int, report_1darray=False, rows=[10])
+        with pytest.raises(ValueError, match="boolean"):
+            dl.load_vector_from_hdf5(ghandle["FOO3"], int, report_1darray=False, rows=[True, False])
+
+
+def test_load_vector_from_hdf5_memmap():
+    path = os.path.join(mkdtemp(), "foo.h5")
+    with h5py.File(path, "w") as handle:
+        ghandle = handle.create_group("yourmom")
+        dl.write_integer_vector_to_hdf5(ghandle, "FOO1", [1, 2, 3, 4], contiguous=True)
+        dl.write_float_vector_to_hdf5(ghandle, "FOO2", [1.5, None, 3.5, 4.5], contiguous=True)
+        dl.write_integer_vector_to_hdf5(ghandle, "FOO3", [1, 2, 3, 4])
+        assert ghandle["FOO1"].chunks is None
+        assert ghandle["FOO1"].compression is None
+
+    with h5py.File(path, "r") as handle:
+        ghandle = handle["yourmom"]
+        foo1 = dl.load_vector_from_hdf5(ghandle["FOO1"], int, report_1darray=True, memmap=True)
+        foo2 = dl.load_vector_from_hdf5(ghandle["FOO2"], float, report_1darray=True, memmap=True)
+        foo3 = dl.load_vector_from_hdf5(ghandle["FOO3"], int, report_1darray=True, memmap=True)
+        sub = dl.load_vector_from_hdf5(ghandle["FOO1"], int, report_1darray=True, memmap=True, rows=slice(1, 3))
+
+    assert isinstance(foo1, numpy.memmap)
+    assert not foo1.flags.writeable
+    assert list(foo1) == [1, 2, 3, 4]
+    assert isinstance(foo2.data, numpy.memmap)
+    assert list(foo2.mask) == [False, True, False, False]
+    assert not isinstance(foo3, numpy.memmap) # falls back for chunked datasets.
+    assert list(foo3) == [1, 2, 3, 4]
+    assert isinstance(sub, numpy.memmap)
+    assert list(sub) == [2, 3]
@@ -0,0 +1,70 @@
+from biocframe import BiocFrame
+from biocutils import Factor, StringList, IntegerList, FloatList, BooleanList
+import dolomite_base as dl
+import numpy as np
+import os
+from tempfile import mkdtemp
+import pytest
+
+
+def test_read_statistics_data_frame():
+    df = BiocFrame({
+        "akari": [ 5, None, 3, 3, -1 ],
+        "aika": StringList([ "sydney", "melbourne", None, "perth", "perth" ]),
+        "alice": [ True, False, None, True, True ],
+        "ai": np.array([ 2.3, np.nan, 5.2, 3.1, -1.2 ]),
+        "alicia": Factor([ 0, 2, -1, 0, 0 ], [ "A", "B", "C" ]),
+        "aria": BiocFrame({ "x": [ 1, 2, 3, 4, 5 ] }),
+    })
+
+    for threads in [ 1, 2 ]:
+        dir = os.path.join(mkdtemp(), "temp")
+        dl.save_object(df, dir, data_frame_statistics=True, data_frame_num_threads=threads)
+        dl.validate_object(dir)
+
+        out = dl.read_statistics(dir)
+        assert list(out.get_row_names()) == [ "akari", "aika", "alice", "ai", "alicia", "aria" ]
+        assert out.get_column("type") == [ "integer", "string", "boolean", "number", "factor", "data_frame" ]
+        assert out.get_column("null_count") == [ 1, 1, 1, 0, 1, None ]
+        assert out.get_column("min") == [ -1, "melbourne", False, -1.2, None, None ]
+        assert out.get_column("max") == [ 5, "sydney", True, 5.2, None, None ]
+        assert out.get_column("distinct") == [ 3, 3, 2, 5, 2, None ] # NaN is a distinct value
+        assert all(b > 0 for b in out.get_column("bytes"))
+
+    # Statistics are not available by default.
+    dir = os.path.join(mkdtemp(), "temp")
+    dl.save_object(df, dir)
+    out = dl.read_statistics(dir)
+    assert out.get_column("null_count") == [ None ] * 6
+    assert out.get_column("type")[0] == "integer"
+
+
+def test_read_statistics_atomic_vector():
+    for x, expected in [
+        (IntegerList([ 1, 2, None, 2 ], names=[ "a", "b", "c", "d" ]), (1, 1, 2, 2)),
+        (FloatList([ 1.5, None, -2.5 ]), (1, -2.5, 1.5, 2)),
+        (BooleanList([ True, True ]), (0, True, True, 1)),
+        (StringList([ "B", "A", None ]), (1, "A", "B", 2)),
+    ]:
+        dir = os.path.join(mkdtemp(), "temp")
+        dl.save_object(x, dir, atomic_vector_statistics=True)
+        out = dl.read_statistics(dir)
+        assert out.shape[0] == 1
+        assert (out.get_column("null_count")[0], out.get_column("min")[0], out.get_column("max")[0], out.get_column("distinct")[0]) == expected
+
+    with pytest.raises(NotImplementedError):
+        dir = os.path.join(mkdtemp(), "temp")
+        dl.save_object({ "a": 1 }, dir)
+        dl.read_statistics(dir)
+
+
+def test_read_statistics_distinct_estimate():
+    df = BiocFrame({
+        "exact": np.arange(100000) % 1000,
+        "estimated": np.arange(100000) // 2,
+    })
+    dir = os.path.join(mkdtemp(), "temp")
+    dl.save_object(df, dir, data_frame_statistics=True)
+    out = dl.read_statistics(dir)
+    assert out.get_column("distinct")[0] == 1000
+    assert abs(out.get_column("distinct")[1] - 50000) < 50000 * 0.15
@@ -4,6 +4,10 @@ from tempfile import mkdtemp
 from biocframe import BiocFrame
 from biocutils import Factor, StringList, NamedList, FloatList, IntegerList, BooleanList
 import os
+import gzip
+import json
+import pytest
+import h5py
 
 
 def test_simple_list_basic():
@@ -242,6 +246,66 @@ def test_simple_list_external():
     assert roundtrip["b"].shape[0] == 10
 
 
+
+def test_simple_list_lazy_externals():
+    everything = {
+        "a": BiocFrame({ "a_1": [ 1, 2, 3 ], "a_2": [ "A", "B", "C" ] }),
+        "b": [ 1, 2, 3 ],
+    }
+
+    for mode in [ "hdf5", "json" ]:
+        dir = os.path.join(mkdtemp(), mode)
+        dl.save_object(everything, dir, simple_list_mode=mode)
+        roundtrip = dl.read_object(dir, simple_list_lazy_externals=True, data_frame_columns=[ "a_2" ])
+
+        deferred = roundtrip["a"]
+        assert isinstance(deferred, dl.DeferredObject)
+        assert not deferred.is_loaded()
+        assert deferred.get_type() == "data_frame"
+        assert "deferred" in repr(deferred)
+
+        loaded = deferred.load()
+        assert deferred.is_loaded()
+        assert deferred.load() is loaded
+        assert loaded.get_column_names().as_list() == [ "a_2" ]
+        assert roundtrip["b"].as_list() == [ 1, 2, 3 ]
+
+        # Reader options are also passed to children when loading eagerly.
+        eager = dl.read_object(dir, data_frame_columns=[ "a_1" ])
+        assert eager["a"].get_column_names().as_list() == [ "a_1" ]
+
+
+def test_simple_list_select():
+    everything = {
+        "a": [ 1, { "x": "foo", "y": [ 1.5, 2.5 ] }, 3 ],
+        "b": BiocFrame({ "b_1": [ 1, 2, 3 ] }),
+        "c": [ BiocFrame({ "c_1": [ "A", "B" ] }) ],
+    }
+
+    for mode in [ "hdf5", "json" ]:
+        dir = os.path.join(mkdtemp(), mode)
+        dl.save_object(everything, dir, simple_list_mode=mode)
+
+        assert dl.read_object(dir, simple_list_select=[ "a", 1, "x" ]) == "foo"
+        assert dl.read_object(dir, simple_list_select=[ "a", 1, "y" ]).as_list() == [ 1.5, 2.5 ]
+        sub = dl.read_object(dir, simple_list_select=[ "a", 1 ])
+        assert sub.get_names().as_list() == [ "x", "y" ]
+        assert dl.read_object(dir, simple_list_select=[ 0, 2 ]) == 3
+
+        frame = dl.read_object(dir, simple_list_select=[ "c", 0 ])
+        assert frame.get_column_names().as_list() == [ "c_1" ]
+        nested = dl.read_object(dir, simple_list_select=[ "c" ])
+        assert nested[0].get_column_names().as_list() == [ "c_1" ]
+        lazy = dl.read_object(dir, simple_list_select=[ "b" ], simple_list_lazy_externals=True)
+        assert isinstance(lazy, dl.DeferredObject)
+
+        with pytest.raises(KeyError, match="no element named"):
+            dl.read_object(dir, simple_list_select=[ "missing" ])
+        with pytest.raises(IndexError, match="out of range"):
+            dl.read_object(dir, simple_list_select=[ "a", 10 ])
+        with pytest.raises(ValueError, match="non-list"):
+            dl.read_object(dir, simple_list_select=[ "a", 0, 0 ])
+
 def test_simple_list_factor():
     everything = {
         "regular": Factor.from_sequence([ "sydney", "brisbane", "sydney", "melbourne"]),
@@ -276,6 +340,12 @@ def test_simple_list_factor():
     assert list(roundtrip["ordered"]) == list(everything["ordered"])
     assert roundtrip["ordered"].get_ordered()
 
+    # Codes are saved with the smallest unsigned type.
+    with h5py.File(os.path.join(dir, "list_contents.h5"), "r") as handle:
+        codes = handle["simple_list/data/1/data"]
+        assert codes.dtype == np.uint8
+        assert codes.attrs["missing-value-placeholder"] == 1
+
 
 def test_simple_list_named():
     everything = {
@@ -341,3 +411,201 @@ def test_simple_list_vls():
     meta = dl.save_object(everything, dir, simple_list_mode="hdf5", simple_list_string_list_vls=True)
     roundtrip = dl.read_object(dir)
     assert everything["alpha"][0]["bravo"] == roundtrip["alpha"][0]["bravo"]
+
+
+def test_simple_list_json_writer():
+    everything = {
+        "strings": StringList([ "a\"b", "back\\slash", "new\nline\ttab", "\x01ctrl", "日本語", None ]),
+        "numbers": FloatList([ 1.0, -0.1, 1e300, 5e-324, float("nan"), float("inf"), float("-inf"), None ]),
+        "big": 2**40,
+        "huge": 2**70,
+        "npint": np.int64(5),
+        "nested": [ { "x": [ True, None ] }, [] ],
+        "chunk": IntegerList(list(range(300000))),
+    }
+
+    expected = None
+    for level, threaded in [ (6, True), (1, False), (9, True) ]:
+        dir = os.path.join(mkdtemp(), "json")
+        dl.save_object(everything, dir, simple_list_compression_level=level, simple_list_compression_thread=threaded)
+        with gzip.open(os.path.join(dir, "list_contents.json.gz"), "rt") as handle:
+            parsed = json.load(handle)
+        if expected is None:
+            expected = parsed
+        assert parsed == expected
+
+    values = [ v["values"] for v in expected["values"] ]
+    assert values[0] == everything["strings"].as_list()
+    assert values[1] == [ 1.0, -0.1, 1e300, 5e-324, "NaN", "Inf", "-Inf", None ]
+    assert values[2] == 2**40
+    assert values[3] == 2**70
+    assert values[6] == list(range(300000))
+
+    roundtrip = dl.read_object(dir)
+    assert roundtrip["strings"] == everything["strings"]
+    assert roundtrip["chunk"] == everything["chunk"]
+
+    with pytest.raises(Exception, match="compression level"):
+        dl.save_object(everything, os.path.join(mkdtemp(), "json"), simple_list_compression_level=10)
+
+
+def test_simple_list_json_sanitization():
+    everything = {
+        "float": FloatList([ 1.5, None, np.nan, np.inf, -np.inf, 2 ]),
+        "int": IntegerList([ -2**31, None, 2**31 - 1 ]),
+        "promoted": IntegerList([ None, 2**31 ]),
+        "empty": IntegerList([ None, None ]),
+    }
+
+    dir = os.path.join(mkdtemp(), "json")
+    dl.save_object(everything, dir, simple_list_mode="json")
+    with gzip.open(os.path.join(dir, "list_contents.json.gz"), "rt") as handle:
+        parsed = json.load(handle)
+
+    entries = parsed["values"]
+    assert entries[0]["values"] == [ 1.5, None, "NaN", "Inf", "-Inf", 2.0 ]
+    assert entries[1]["type"] == "integer"
+    assert entries[2]["type"] == "number"
+    assert entries[3]["type"] == "integer"
+
+    roundtrip = dl.read_object(dir)
+    assert roundtrip["float"].as_list()[:2] == [ 1.5, None ]
+    assert roundtrip["int"].as_list() == everything["int"].as_list()
+    assert roundtrip["promoted"].as_list() == [ None, 2**31 ]
+
+
+def test_simple_list_int32_check():
+    from dolomite_base._utils_misc import sequence_exceeds_int32
+    assert not sequence_exceeds_int32(IntegerList([ -2**31, None, 2**31 - 1 ]))
+    assert sequence_exceeds_int32(IntegerList([ None, 2**31 ]))
+    assert not sequence_exceeds_int32(np.array([ 1, 2 ], dtype=np.int64))
+    assert sequence_exceeds_int32(np.array([ 1, -2**40 ], dtype=np.int64))
+    assert not sequence_exceeds_int32(np.ma.array([ 1, 2**40 ], mask=[ False, True ]))
+    assert not sequence_exceeds_int32([ 1, None, 2 ])
+
+    # Non-numeric inputs are not coerced.
+    with pytest.raises(TypeError):
+        sequence_exceeds_int32([ "1", "2" ])
+
+
+def test_simple_list_pack_scalars():
+    everything = {
+        "ints": list(range(1000)),
+        "floats": { "a": 1.5, "b": None, "c": 2 },
+        "strings": NamedList([ "x", None, "z" ], names=[ "A", "B", "C" ]),
+        "bools": [ True, False, None ],
+        "mixed": [ 1, "a", None ],
+        "empty": [],
+        "nested": [ { "x": 1, "y": 2 }, { "x": 3, "y": 4 } ],
+    }
+
+    for mode in [ "hdf5", "json" ]:
+        dir = os.path.join(mkdtemp(), mode)
+        dl.save_object(everything, dir, simple_list_mode=mode, simple_list_pack_scalars=True)
+        roundtrip = dl.read_object(dir)
+
+        assert isinstance(roundtrip["ints"], IntegerList)
+        assert roundtrip["ints"].as_list() == everything["ints"]
+        assert isinstance(roundtrip["floats"], FloatList)
+        assert roundtrip["floats"].as_list() == [ 1.5, None, 2 ]
+        assert roundtrip["floats"].get_names().as_list() == [ "a", "b", "c" ]
+        assert isinstance(roundtrip["strings"], StringList)
+        assert roundtrip["strings"].get_names().as_list() == [ "A", "B", "C" ]
+        assert roundtrip["bools"].as_list() == [ True, False, None ]
+        assert isinstance(roundtrip["mixed"], NamedList)
+        assert roundtrip["mixed"].as_list() == [ 1, "a", None ]
+        assert len(roundtrip["empty"]) == 0
+        assert roundtrip["nested"][1]["y"] == 4
+
+    # One HDF5 object per vector rather than per scalar.
+    dir = os.path.join(mkdtemp(), "hdf5")
+    dl.save_object(everything, dir, simple_list_mode="hdf5", simple_list_pack_scalars=True)
+    counter = []
+    with h5py.File(os.path.join(dir, "list_contents.h5"), "r") as handle:
+        handle.visit(counter.append)
+    assert len(counter) < 60
+
+    # Nested lists are only packed once when the mode is chosen automatically.
+    dir = os.path.join(mkdtemp(), "auto")
+    with pytest.warns(UserWarning) as record:
+        dl.save_object({ "keys": { 1: 1.5, 2: 2.5 } }, dir, simple_list_mode="auto", simple_list_pack_scalars=True)
+    assert len(record) == 2
+    assert dl.read_object(dir)["keys"].get_names().as_list() == [ "1", "2" ]
+
+
+def test_simple_list_numpy_vectors():
+    everything = {
+        "ints": IntegerList([ 1, 2, None, 4 ]),
+        "floats": FloatList([ 1.5, 2.5, 3.5 ]),
+        "bools": BooleanList([ True, None, False ]),
+        "named": IntegerList([ 1, None ], names=[ "A", "B" ]),
+        "scalar": 5,
+        "strings": StringList([ "a", "b" ]),
+    }
+
+    for mode in [ "hdf5", "json" ]:
+        dir = os.path.join(mkdtemp(), mode)
+        dl.save_object(everything, dir, simple_list_mode=mode)
+        roundtrip = dl.read_object(dir, simple_list_numpy_vectors=True)
+
+        assert isinstance(roundtrip["ints"], np.ma.MaskedArray)
+        assert roundtrip["ints"].dtype == np.int32
+        assert roundtrip["ints"].tolist() == [ 1, 2, None, 4 ]
+        assert type(roundtrip["floats"]) is np.ndarray
+        assert roundtrip["floats"].dtype == np.float64
+        assert roundtrip["floats"].tolist() == [ 1.5, 2.5, 3.5 ]
+        assert roundtrip["bools"].dtype == np.bool_
+        assert roundtrip["bools"].tolist() == [ True, None, False ]
+
+        assert isinstance(roundtrip["named"], IntegerList)
+        assert roundtrip["named"].as_list() == [ 1, None ]
+        assert roundtrip["named"].get_names().as_list() == [ "A", "B" ]
+        assert roundtrip["scalar"] == 5
+        assert isinstance(roundtrip["strings"], StringList)
+
+        # Default behavior is unchanged.
+        default = dl.read_object(dir)
+        assert isinstance(default["ints"], IntegerList)
+        assert default["ints"].as_list() == [ 1, 2, None, 4 ]
+
+
+def test_simple_list_auto_mode():
+    many_scalars = { "x" + str(i): i for i in range(200) }
+    dir = os.path.join(mkdtemp(), "scalars")
+    dl.save_object(many_scalars, dir, simple_list_mode="auto")
+    assert dl.read_object_file(dir)["simple_list"]["format"] == "json.gz"
+    assert dl.read_object(dir)["x10"] == 10
+
+    long_vector = { "x": FloatList(np.random.rand(100000).tolist()), "y": "foo" }
+    dir = os.path.join(mkdtemp(), "vector")
+    dl.save_object(long_vector, dir, simple_list_mode="auto")
+    assert dl.read_object_file(dir)["simple_list"]["format"] == "hdf5"
+    roundtrip = dl.read_object(dir)
+    assert roundtrip["x"].as_list() == long_vector["x"].as_list()
+    assert roundtrip["y"] == "foo"
+
+
+def test_simple_list_threaded_loads():
+    from concurrent.futures import ThreadPoolExecutor
+
+    everything = {
+        "a": IntegerList(list(range(1000))),
+        "b": [ "foo", FloatList([ 1.5, None ]), Factor([ 0, 1, -1 ], [ "x", "y" ]) ],
+        "c": BiocFrame({ "c_1": [ 1, 2, 3 ] }),
+    }
+
+    dirs = []
+    for mode in [ "hdf5", "json" ]:
+        dir = os.path.join(mkdtemp(), mode)
+        dl.save_object(everything, dir, simple_list_mode=mode)
+        dirs.append(dir)
+
+    with ThreadPoolExecutor(4) as executor:
+        results = list(executor.map(dl.read_object, dirs * 10))
+
+    for res in results:
+        assert res["a"].as_list() == everything["a"].as_list()
+        assert res["b"][0] == "foo"
+        assert res["b"][1].as_list() == [ 1.5, None ]
+        assert list(res["b"][2].get_codes()) == [ 0, 1, -1 ]
+        assert res["c"].get_column_names().as_list() == [ "c_1" ]
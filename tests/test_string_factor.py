@@ -54,3 +54,40 @@ def test_string_factor_named():
 
     assert isinstance(roundtrip, Factor)
     assert roundtrip.get_names() == named.get_names()
+
+
+def test_string_factor_rows():
+    regular = Factor.from_sequence([ "sydney", None, "brisbane", "perth", "adelaide" ], names=["A", "B", "C", "D", "E"])
+
+    dir = os.path.join(mkdtemp(), "temp")
+    dl.save_object(regular, dir)
+    roundtrip = dl.read_object(dir, string_factor_rows=[4, 1, 0])
+
+    assert list(roundtrip) == [ "adelaide", None, "sydney" ]
+    assert roundtrip.get_names().as_list() == [ "E", "B", "A" ]
+    assert roundtrip.get_levels() == regular.get_levels()
+
+
+def test_string_factor_code_width():
+    import h5py
+
+    # The placeholder requires an extra code, so 256 levels with missing values need 16 bits.
+    for nlevels, missing, expected in [ (0, True, "u1"), (10, False, "u1"), (256, False, "u1"), (255, True, "u1"), (256, True, "u2"), (70000, False, "u4") ]:
+        levels = [ "L" + str(i) for i in range(nlevels) ]
+        codes = numpy.arange(nlevels, dtype=numpy.int32)
+        if missing:
+            codes = numpy.append(codes, -1).astype(numpy.int32)
+        original = Factor(codes, levels)
+
+        dir = os.path.join(mkdtemp(), "temp")
+        dl.save_object(original, dir)
+        with h5py.File(os.path.join(dir, "contents.h5"), "r") as handle:
+            assert handle["string_factor/codes"].dtype == numpy.dtype(expected)
+
+        roundtrip = dl.read_object(dir)
+        assert roundtrip.get_codes().dtype == numpy.int32
+        assert (roundtrip.get_codes() == original.get_codes()).all()
+        assert roundtrip.get_levels() == original.get_levels()
+
+        subset = dl.read_object(dir, string_factor_rows=[ len(codes) - 1 ])
+        assert list(subset.get_codes()) == [ codes[-1] ]